@@ -0,0 +1,44 @@
+"""Composite indexes for keyset pagination of listings.
+
+Revision ID: 002
+Revises: 001
+Create Date: 2024-06-01 00:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ('ix_documents_agency_created', 'documents', ['agency_id', 'created_at', 'id']),
+    ('ix_documents_agency_status_created', 'documents', ['agency_id', 'status', 'created_at', 'id']),
+    ('ix_documents_client_created', 'documents', ['client_id', 'created_at', 'id']),
+    ('ix_clients_agency_created', 'clients', ['agency_id', 'created_at', 'id']),
+    ('ix_scheduled_content_client_date', 'scheduled_content', ['client_id', 'scheduled_date', 'id']),
+]
+
+
+def upgrade() -> None:
+    # Built concurrently so large tables stay writable; this cannot run
+    # inside a transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name, table, columns,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(
+                name, table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -9,17 +9,15 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
 from app.models import User
 from app.services.auth_service import AuthService
+from app.services.principal_cache import Principal, PrincipalCache
 from app.services.user_service import UserService
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login/form")
 oauth2_scheme_optional = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login/form", auto_error=False)
 
 
-async def get_current_user(
-    token: Annotated[str, Depends(oauth2_scheme)],
-    db: Annotated[AsyncSession, Depends(get_db)],
-) -> User:
-    """Get the current authenticated user."""
+def _user_id_from_token(token: str) -> str:
+    """Validate an access token and return its user ID."""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -40,14 +38,56 @@ async def get_current_user(
     if not user_id:
         raise credentials_exception
 
+    return user_id
+
+
+async def get_current_user(
+    token: Annotated[str, Depends(oauth2_scheme)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> User:
+    """Get the current authenticated user, loaded from the database."""
+    user_id = _user_id_from_token(token)
+
     # Get user from database
     user = await UserService.get_by_id(db, user_id)
     if not user:
-        raise credentials_exception
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
 
     return user
 
 
+async def get_current_principal(
+    token: Annotated[str, Depends(oauth2_scheme)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> Principal:
+    """
+    Get the current authenticated principal.
+
+    Served from the principal cache, so authorization usually costs no
+    database query. Use `get_current_user` when the full user row is needed.
+    """
+    user_id = _user_id_from_token(token)
+
+    principal = await PrincipalCache.get(user_id)
+    if principal is None:
+        version = await PrincipalCache.version(user_id)
+        user = await UserService.get_by_id(db, user_id)
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Could not validate credentials",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        principal = Principal.from_user(user)
+        await PrincipalCache.set(principal, version)
+
+    return principal
+
+
 async def get_current_user_optional(
     token: Annotated[Optional[str], Depends(oauth2_scheme_optional)],
     db: Annotated[AsyncSession, Depends(get_db)],
@@ -63,8 +103,8 @@ async def get_current_user_optional(
 
 
 async def get_current_active_user(
-    current_user: Annotated[User, Depends(get_current_user)],
-) -> User:
+    current_user: Annotated[Principal, Depends(get_current_principal)],
+) -> Principal:
     """Get the current active user."""
     if not current_user.is_active:
         raise HTTPException(
@@ -75,8 +115,8 @@ async def get_current_active_user(
 
 
 async def get_current_admin_user(
-    current_user: Annotated[User, Depends(get_current_active_user)],
-) -> User:
+    current_user: Annotated[Principal, Depends(get_current_active_user)],
+) -> Principal:
     """Get the current admin user."""
     if current_user.role not in ("super_admin", "agency_admin"):
         raise HTTPException(
@@ -87,8 +127,8 @@ async def get_current_admin_user(
 
 
 async def get_current_super_admin(
-    current_user: Annotated[User, Depends(get_current_active_user)],
-) -> User:
+    current_user: Annotated[Principal, Depends(get_current_active_user)],
+) -> Principal:
     """Get the current super admin user."""
     if current_user.role != "super_admin":
         raise HTTPException(
@@ -9,7 +9,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
 from app.api.deps import get_current_active_user, get_current_admin_user
-from app.models import User, Agency, Client, Document, ScheduledContent
+from app.services.principal_cache import Principal
+from app.models import Agency, Client, Document, ScheduledContent
 from app.services.agency_service import AgencyService
 from app.schemas.agency import AgencyResponse, AgencyUpdate
 
@@ -18,7 +19,7 @@ router = APIRouter()
 
 @router.get("/me", response_model=AgencyResponse)
 async def get_current_agency(
-    current_user: Annotated[User, Depends(get_current_active_user)],
+    current_user: Annotated[Principal, Depends(get_current_active_user)],
     db: AsyncSession = Depends(get_db),
 ):
     """Get current user's agency."""
@@ -40,7 +41,7 @@ async def get_current_agency(
 @router.patch("/me", response_model=AgencyResponse)
 async def update_current_agency(
     update_data: AgencyUpdate,
-    current_user: Annotated[User, Depends(get_current_admin_user)],
+    current_user: Annotated[Principal, Depends(get_current_admin_user)],
     db: AsyncSession = Depends(get_db),
 ):
     """Update current user's agency."""
@@ -64,7 +65,7 @@ async def update_current_agency(
 
 @router.get("/me/stats")
 async def get_agency_stats(
-    current_user: Annotated[User, Depends(get_current_active_user)],
+    current_user: Annotated[Principal, Depends(get_current_active_user)],
     db: AsyncSession = Depends(get_db),
 ):
     """Get agency statistics."""
@@ -16,7 +16,7 @@ from app.schemas.auth import (
     PasswordResetConfirm,
     UserResponse,
 )
-from app.api.deps import get_current_active_user
+from app.api.deps import get_current_user
 from app.models import User
 
 router = APIRouter()
@@ -155,9 +155,14 @@ async def refresh_token(
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(
-    current_user: User = Depends(get_current_active_user),
+    current_user: User = Depends(get_current_user),
 ):
     """Get current user information."""
+    if not current_user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Inactive user",
+        )
     return current_user
 
 
@@ -1,26 +1,33 @@
 """Client endpoints."""
 
 from typing import Annotated
-import math
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
 from app.api.deps import get_current_active_user
-from app.models import User
+from app.services.principal_cache import Principal
+from app.models import Client
 from app.services.client_service import ClientService
-from app.schemas.client import ClientCreate, ClientUpdate, ClientResponse
+from app.schemas.client import ClientCreate, ClientUpdate, ClientResponse, ClientSummary
+from app.utils.fields import FieldSet
+from app.utils.pagination import page_response
 
 router = APIRouter()
 
+client_fields = FieldSet(Client, ClientResponse)
+
 
 @router.get("")
 async def list_clients(
-    current_user: Annotated[User, Depends(get_current_active_user)],
+    current_user: Annotated[Principal, Depends(get_current_active_user)],
     db: AsyncSession = Depends(get_db),
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
+    cursor: str = Query(None),
+    count: str = Query("cached", pattern="^(exact|cached|none)$"),
+    fields: str = Query(None, description="Comma-separated fields to return"),
     search: str = Query(None),
 ):
     """List all clients for the current agency."""
@@ -30,27 +37,29 @@ async def list_clients(
             detail="User is not associated with an agency",
         )
 
-    clients, total = await ClientService.list_by_agency(
-        db=db,
-        agency_id=current_user.agency_id,
-        page=page,
-        per_page=per_page,
-        search=search,
-    )
+    try:
+        selected = client_fields.parse(fields, default=ClientSummary)
+        result = await ClientService.list_by_agency(
+            db=db,
+            agency_id=current_user.agency_id,
+            page=page,
+            per_page=per_page,
+            search=search,
+            cursor=cursor,
+            count=count,
+            columns=client_fields.columns(selected),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
-    return {
-        "items": clients,
-        "total": total,
-        "page": page,
-        "per_page": per_page,
-        "pages": math.ceil(total / per_page) if total > 0 else 0,
-    }
+    result.items = [client_fields.serialize(item, selected) for item in result.items]
+    return page_response(result, page, per_page)
 
 
 @router.post("", response_model=ClientResponse, status_code=status.HTTP_201_CREATED)
 async def create_client(
     client_data: ClientCreate,
-    current_user: Annotated[User, Depends(get_current_active_user)],
+    current_user: Annotated[Principal, Depends(get_current_active_user)],
     db: AsyncSession = Depends(get_db),
 ):
     """Create a new client."""
@@ -75,11 +84,12 @@ async def create_client(
     return client
 
 
-@router.get("/{client_id}", response_model=ClientResponse)
+@router.get("/{client_id}", responses={200: {"model": ClientResponse}})
 async def get_client(
     client_id: str,
-    current_user: Annotated[User, Depends(get_current_active_user)],
+    current_user: Annotated[Principal, Depends(get_current_active_user)],
     db: AsyncSession = Depends(get_db),
+    fields: str = Query(None, description="Comma-separated fields to return"),
 ):
     """Get a specific client."""
     if not current_user.agency_id:
@@ -88,20 +98,27 @@ async def get_client(
             detail="User is not associated with an agency",
         )
 
-    client = await ClientService.get_by_id(db, client_id, current_user.agency_id)
+    try:
+        selected = client_fields.parse(fields, default=ClientResponse)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    client = await ClientService.get_by_id(
+        db, client_id, current_user.agency_id, columns=client_fields.columns(selected)
+    )
     if not client:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Client not found",
         )
-    return client
+    return client_fields.serialize(client, selected)
 
 
 @router.patch("/{client_id}", response_model=ClientResponse)
 async def update_client(
     client_id: str,
     update_data: ClientUpdate,
-    current_user: Annotated[User, Depends(get_current_active_user)],
+    current_user: Annotated[Principal, Depends(get_current_active_user)],
     db: AsyncSession = Depends(get_db),
 ):
     """Update a client."""
@@ -126,7 +143,7 @@ async def update_client(
 @router.delete("/{client_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_client(
     client_id: str,
-    current_user: Annotated[User, Depends(get_current_active_user)],
+    current_user: Annotated[Principal, Depends(get_current_active_user)],
     db: AsyncSession = Depends(get_db),
 ):
     """Delete a client."""
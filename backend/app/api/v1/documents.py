@@ -1,29 +1,56 @@
 """Document endpoints."""
 
 from typing import Annotated
-import math
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from fastapi.responses import FileResponse, StreamingResponse
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
+from fastapi.responses import (
+    HTMLResponse,
+    JSONResponse,
+    RedirectResponse,
+    Response,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
 from app.database import get_db
 from app.api.deps import get_current_active_user
-from app.models import User
+from app.services.principal_cache import Principal
+from app.models import Document
 from app.services.document_service import DocumentService
+from app.services.signed_url_service import SignedURLService
 from app.services.storage_service import StorageService
-from app.schemas.document import DocumentResponse, DocumentUpdate
+from app.services.thumbnail_service import ThumbnailService
+from app.schemas.document import (
+    DocumentDetail,
+    DocumentResponse,
+    DocumentSummary,
+    DocumentUpdate,
+)
+from app.utils.fields import FieldSet
+from app.utils.pagination import page_response
+from app.utils.ranges import range_response
 
 router = APIRouter()
-storage_service = StorageService()
+
+PREVIEW_CSP = (
+    "default-src 'none'; img-src 'self' https: data:; style-src 'unsafe-inline'; "
+    "font-src 'self' data:; base-uri 'none'; form-action 'none'; frame-ancestors 'self'"
+)
+
+document_fields = FieldSet(
+    Document, DocumentDetail, depends={"thumbnail_url": ("id", "cover_image_url")}
+)
 
 
 @router.get("")
 async def list_documents(
-    current_user: Annotated[User, Depends(get_current_active_user)],
+    current_user: Annotated[Principal, Depends(get_current_active_user)],
     db: AsyncSession = Depends(get_db),
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
+    cursor: str = Query(None),
+    count: str = Query("cached", pattern="^(exact|cached|none)$"),
+    fields: str = Query(None, description="Comma-separated fields to return"),
     client_id: str = Query(None),
     doc_status: str = Query(None, alias="status"),
 ):
@@ -34,29 +61,32 @@ async def list_documents(
             detail="User is not associated with an agency",
         )
 
-    documents, total = await DocumentService.list_by_agency(
-        db=db,
-        agency_id=current_user.agency_id,
-        page=page,
-        per_page=per_page,
-        client_id=client_id,
-        status=doc_status,
-    )
+    try:
+        selected = document_fields.parse(fields, default=DocumentSummary)
+        result = await DocumentService.list_by_agency(
+            db=db,
+            agency_id=current_user.agency_id,
+            page=page,
+            per_page=per_page,
+            client_id=client_id,
+            status=doc_status,
+            cursor=cursor,
+            count=count,
+            columns=document_fields.columns(selected),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
-    return {
-        "items": documents,
-        "total": total,
-        "page": page,
-        "per_page": per_page,
-        "pages": math.ceil(total / per_page) if total > 0 else 0,
-    }
+    result.items = [document_fields.serialize(item, selected) for item in result.items]
+    return page_response(result, page, per_page)
 
 
-@router.get("/{document_id}", response_model=DocumentResponse)
+@router.get("/{document_id}", responses={200: {"model": DocumentDetail}})
 async def get_document(
     document_id: str,
-    current_user: Annotated[User, Depends(get_current_active_user)],
+    current_user: Annotated[Principal, Depends(get_current_active_user)],
     db: AsyncSession = Depends(get_db),
+    fields: str = Query(None, description="Comma-separated fields to return"),
 ):
     """Get a specific document."""
     if not current_user.agency_id:
@@ -65,20 +95,27 @@ async def get_document(
             detail="User is not associated with an agency",
         )
 
-    document = await DocumentService.get_by_id(db, document_id, current_user.agency_id)
+    try:
+        selected = document_fields.parse(fields, default=DocumentResponse)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    document = await DocumentService.get_by_id(
+        db, document_id, current_user.agency_id, columns=document_fields.columns(selected)
+    )
     if not document:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Document not found",
         )
-    return document
+    return document_fields.serialize(document, selected)
 
 
 @router.patch("/{document_id}", response_model=DocumentResponse)
 async def update_document(
     document_id: str,
     update_data: DocumentUpdate,
-    current_user: Annotated[User, Depends(get_current_active_user)],
+    current_user: Annotated[Principal, Depends(get_current_active_user)],
     db: AsyncSession = Depends(get_db),
 ):
     """Update a document."""
@@ -103,7 +140,7 @@ async def update_document(
 @router.delete("/{document_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_document(
     document_id: str,
-    current_user: Annotated[User, Depends(get_current_active_user)],
+    current_user: Annotated[Principal, Depends(get_current_active_user)],
     db: AsyncSession = Depends(get_db),
 ):
     """Delete a document."""
@@ -126,10 +163,16 @@ async def delete_document(
 @router.get("/{document_id}/download")
 async def download_document(
     document_id: str,
-    current_user: Annotated[User, Depends(get_current_active_user)],
+    request: Request,
+    current_user: Annotated[Principal, Depends(get_current_active_user)],
     db: AsyncSession = Depends(get_db),
 ):
-    """Download document PDF."""
+    """
+    Download document PDF.
+
+    The file is streamed from storage in chunks and supports Range /
+    If-Range requests, so PDF viewers can fetch pages on demand.
+    """
     if not current_user.agency_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -144,22 +187,213 @@ async def download_document(
         )
 
     if not document.pdf_url:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="PDF not available for this document",
-        )
+        if not document.content_json:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="PDF not available for this document",
+            )
+        # PDF rendering is deferred until first download
+        return await _queue_pdf_render(document)
+
+    pdf_url, filename = document.pdf_url, f"{document.slug}.pdf"
+    # Return the connection to the pool before streaming
+    await db.close()
 
-    # Get file from storage
-    pdf_content = await storage_service.get_file(document.pdf_url)
-    if not pdf_content:
+    if settings.SIGNED_URLS_ENABLED:
+        signed = SignedURLService.sign(pdf_url, filename, "application/pdf")
+        return RedirectResponse(signed.url, status_code=status.HTTP_307_TEMPORARY_REDIRECT)
+
+    storage = StorageService()
+    stat = await storage.stat_file(pdf_url)
+    if not stat:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="PDF file not found",
         )
 
-    filename = f"{document.slug}.pdf"
-    return StreamingResponse(
-        iter([pdf_content]),
+    return range_response(
+        request,
+        size=stat.size,
+        open_range=lambda start, end: storage.iter_file(pdf_url, start, end),
         media_type="application/pdf",
+        etag=stat.etag,
+        last_modified=stat.last_modified,
         headers={"Content-Disposition": f"attachment; filename={filename}"},
     )
+
+
+@router.get("/{document_id}/download-url")
+async def get_download_url(
+    document_id: str,
+    current_user: Annotated[Principal, Depends(get_current_active_user)],
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Get a short-lived signed URL to download the document PDF directly.
+
+    Answers 202 while the PDF is being rendered, like the download endpoint.
+    """
+    if not current_user.agency_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="User is not associated with an agency",
+        )
+
+    document = await DocumentService.get_by_id(
+        db,
+        document_id,
+        current_user.agency_id,
+        columns=["id", "slug", "pdf_url"],
+    )
+    if not document:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Document not found",
+        )
+
+    if not document.pdf_url:
+        await db.refresh(document, ["content_json"])
+        if not document.content_json:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="PDF not available for this document",
+            )
+        return await _queue_pdf_render(document)
+
+    signed = SignedURLService.sign(document.pdf_url, f"{document.slug}.pdf", "application/pdf")
+    return {"url": signed.url, "expires_at": signed.expires_at}
+
+
+@router.get("/{document_id}/thumbnails/{filename}")
+async def get_document_thumbnail(
+    document_id: str,
+    filename: str,
+    current_user: Annotated[Principal, Depends(get_current_active_user)],
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Get a first-page thumbnail of a document.
+
+    Thumbnail filenames carry the render fingerprint, so responses are
+    immutable and cached for a year.
+    """
+    if not current_user.agency_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="User is not associated with an agency",
+        )
+
+    document = await DocumentService.get_by_id(db, document_id, current_user.agency_id)
+    if not document:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Document not found",
+        )
+
+    paths = ThumbnailService.paths_for(document.cover_image_url) if document.cover_image_url else {}
+    path = next((p for p in paths.values() if p.rsplit("/", 1)[-1] == filename), None)
+    image = await StorageService().get_file(path) if path else None
+    if not image:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Thumbnail not found",
+        )
+
+    extension = filename.rsplit(".", 1)[-1]
+    return Response(
+        content=image,
+        media_type=ThumbnailService.MIME_TYPES.get(extension, "application/octet-stream"),
+        headers={"Cache-Control": "private, max-age=31536000, immutable"},
+    )
+
+
+@router.get("/{document_id}/preview", response_class=HTMLResponse)
+async def preview_document(
+    document_id: str,
+    request: Request,
+    current_user: Annotated[Principal, Depends(get_current_active_user)],
+    db: AsyncSession = Depends(get_db),
+):
+    """Render a fast HTML preview of a document without generating a PDF."""
+    if not current_user.agency_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="User is not associated with an agency",
+        )
+
+    document = await DocumentService.get_by_id(db, document_id, current_user.agency_id)
+    if not document:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Document not found",
+        )
+
+    if not document.content_json:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Content not available for this document",
+        )
+
+    branding = await DocumentService.get_branding(db, document)
+    from app.services.preview_service import PreviewService
+
+    html, fingerprint = await PreviewService().render(document, branding)
+
+    etag = f'"{fingerprint}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "private, no-cache",
+        # Previews hold user content and are served from the API origin:
+        # no scripts, and nothing loaded but images, inline styles and fonts
+        "Content-Security-Policy": PREVIEW_CSP,
+        "X-Content-Type-Options": "nosniff",
+    }
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return HTMLResponse(content=html, headers=headers)
+
+
+@router.post("/{document_id}/render", status_code=status.HTTP_202_ACCEPTED)
+async def render_document(
+    document_id: str,
+    current_user: Annotated[Principal, Depends(get_current_active_user)],
+    db: AsyncSession = Depends(get_db),
+):
+    """Finalize a document by rendering its PDF."""
+    if not current_user.agency_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="User is not associated with an agency",
+        )
+
+    document = await DocumentService.get_by_id(db, document_id, current_user.agency_id)
+    if not document:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Document not found",
+        )
+
+    if not document.content_json:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Document has no content to render",
+        )
+
+    return await _queue_pdf_render(document)
+
+
+async def _queue_pdf_render(document: Document) -> JSONResponse:
+    """Queue a PDF render, unless one is already queued, and tell the client to retry shortly."""
+    # Import here to avoid circular imports
+    from app.workers.generation_tasks import claim_pdf_render, render_pdf_task
+
+    # Clients poll this while the render runs; only the first poll queues it
+    if await claim_pdf_render(document.id):
+        render_pdf_task.delay(document.id)
+
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content={"message": "PDF rendering started", "document_id": document.id},
+        headers={"Retry-After": "5"},
+    )
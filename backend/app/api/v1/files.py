@@ -0,0 +1,54 @@
+"""Signed file download endpoints."""
+
+import mimetypes
+import time
+
+from fastapi import APIRouter, HTTPException, Request, status
+
+from app.services.signed_url_service import SignedURLService
+from app.services.storage_service import StorageService
+from app.utils.ranges import range_response
+
+router = APIRouter()
+
+
+@router.get("/{token}")
+async def get_signed_file(token: str, request: Request):
+    """
+    Serve a stored file by signed URL.
+
+    The token is the authorization: no user or database lookup is made.
+    """
+    try:
+        signed = SignedURLService.verify(token)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid or expired link",
+        )
+
+    storage = StorageService()
+    stat = await storage.stat_file(signed.path)
+    if not stat:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="File not found",
+        )
+
+    headers = {"Cache-Control": f"private, max-age={max(int(signed.expires_at - time.time()), 0)}"}
+    if signed.filename:
+        headers["Content-Disposition"] = f"attachment; filename={signed.filename}"
+
+    return range_response(
+        request,
+        size=stat.size,
+        open_range=lambda start, end: storage.iter_file(signed.path, start, end),
+        media_type=(
+            signed.media_type
+            or mimetypes.guess_type(signed.path)[0]
+            or "application/octet-stream"
+        ),
+        etag=stat.etag,
+        last_modified=stat.last_modified,
+        headers=headers,
+    )
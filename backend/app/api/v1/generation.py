@@ -7,7 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
 from app.api.deps import get_current_active_user
-from app.models import User
+from app.services.principal_cache import Principal
 from app.schemas.generation import GenerationRequest, GenerationStatus, GenerationJobResponse
 from app.services.client_service import ClientService
 from app.services.document_service import DocumentService
@@ -19,7 +19,7 @@ router = APIRouter()
 @router.post("/generate", response_model=GenerationStatus, status_code=status.HTTP_202_ACCEPTED)
 async def start_generation(
     request: GenerationRequest,
-    current_user: Annotated[User, Depends(get_current_active_user)],
+    current_user: Annotated[Principal, Depends(get_current_active_user)],
     db: AsyncSession = Depends(get_db),
 ):
     """Start content generation for a topic."""
@@ -84,7 +84,7 @@ async def start_generation(
 @router.get("/jobs/{job_id}", response_model=GenerationJobResponse)
 async def get_generation_job(
     job_id: str,
-    current_user: Annotated[User, Depends(get_current_active_user)],
+    current_user: Annotated[Principal, Depends(get_current_active_user)],
     db: AsyncSession = Depends(get_db),
 ):
     """Get generation job status."""
@@ -106,7 +106,7 @@ async def get_generation_job(
 @router.post("/jobs/{job_id}/cancel")
 async def cancel_generation_job(
     job_id: str,
-    current_user: Annotated[User, Depends(get_current_active_user)],
+    current_user: Annotated[Principal, Depends(get_current_active_user)],
     db: AsyncSession = Depends(get_db),
 ):
     """Cancel a running generation job."""
@@ -143,7 +143,7 @@ async def cancel_generation_job(
 @router.post("/jobs/{job_id}/retry")
 async def retry_generation_job(
     job_id: str,
-    current_user: Annotated[User, Depends(get_current_active_user)],
+    current_user: Annotated[Principal, Depends(get_current_active_user)],
     db: AsyncSession = Depends(get_db),
 ):
     """Retry a failed generation job."""
@@ -2,7 +2,6 @@
 
 from typing import Annotated
 from datetime import datetime
-import math
 import csv
 import io
 
@@ -12,24 +11,34 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
 from app.api.deps import get_current_active_user
-from app.models import User
+from app.services.principal_cache import Principal
+from app.models import ScheduledContent
 from app.schemas.schedule import (
     ScheduledContentCreate,
     ScheduledContentUpdate,
     ScheduledContentResponse,
+    ScheduledContentSummary,
+    ScheduledContentDetail,
 )
 from app.services.schedule_service import ScheduleService
 from app.services.client_service import ClientService
+from app.utils.fields import FieldSet
+from app.utils.pagination import page_response
 
 router = APIRouter()
 
+schedule_fields = FieldSet(ScheduledContent, ScheduledContentDetail)
+
 
 @router.get("")
 async def list_scheduled_content(
-    current_user: Annotated[User, Depends(get_current_active_user)],
+    current_user: Annotated[Principal, Depends(get_current_active_user)],
     db: AsyncSession = Depends(get_db),
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
+    cursor: str = Query(None),
+    count: str = Query("cached", pattern="^(exact|cached|none)$"),
+    fields: str = Query(None, description="Comma-separated fields to return"),
     client_id: str = Query(None),
     start_date: datetime = Query(None),
     end_date: datetime = Query(None),
@@ -41,29 +50,31 @@ async def list_scheduled_content(
             detail="User is not associated with an agency",
         )
 
-    items, total = await ScheduleService.list_by_agency(
-        db=db,
-        agency_id=current_user.agency_id,
-        page=page,
-        per_page=per_page,
-        client_id=client_id,
-        start_date=start_date,
-        end_date=end_date,
-    )
+    try:
+        selected = schedule_fields.parse(fields, default=ScheduledContentSummary)
+        result = await ScheduleService.list_by_agency(
+            db=db,
+            agency_id=current_user.agency_id,
+            page=page,
+            per_page=per_page,
+            client_id=client_id,
+            start_date=start_date,
+            end_date=end_date,
+            cursor=cursor,
+            count=count,
+            columns=schedule_fields.columns(selected),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
-    return {
-        "items": items,
-        "total": total,
-        "page": page,
-        "per_page": per_page,
-        "pages": math.ceil(total / per_page) if total > 0 else 0,
-    }
+    result.items = [schedule_fields.serialize(item, selected) for item in result.items]
+    return page_response(result, page, per_page)
 
 
 @router.post("", response_model=ScheduledContentResponse, status_code=status.HTTP_201_CREATED)
 async def create_scheduled_content(
     schedule_data: ScheduledContentCreate,
-    current_user: Annotated[User, Depends(get_current_active_user)],
+    current_user: Annotated[Principal, Depends(get_current_active_user)],
     db: AsyncSession = Depends(get_db),
 ):
     """Create scheduled content."""
@@ -97,11 +108,12 @@ async def create_scheduled_content(
     return scheduled
 
 
-@router.get("/{schedule_id}", response_model=ScheduledContentResponse)
+@router.get("/{schedule_id}", responses={200: {"model": ScheduledContentDetail}})
 async def get_scheduled_content(
     schedule_id: str,
-    current_user: Annotated[User, Depends(get_current_active_user)],
+    current_user: Annotated[Principal, Depends(get_current_active_user)],
     db: AsyncSession = Depends(get_db),
+    fields: str = Query(None, description="Comma-separated fields to return"),
 ):
     """Get a specific scheduled content item."""
     if not current_user.agency_id:
@@ -110,20 +122,27 @@ async def get_scheduled_content(
             detail="User is not associated with an agency",
         )
 
-    scheduled = await ScheduleService.get_by_id(db, schedule_id, current_user.agency_id)
+    try:
+        selected = schedule_fields.parse(fields, default=ScheduledContentResponse)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    scheduled = await ScheduleService.get_by_id(
+        db, schedule_id, current_user.agency_id, columns=schedule_fields.columns(selected)
+    )
     if not scheduled:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Scheduled content not found",
         )
-    return scheduled
+    return schedule_fields.serialize(scheduled, selected)
 
 
 @router.patch("/{schedule_id}", response_model=ScheduledContentResponse)
 async def update_scheduled_content(
     schedule_id: str,
     update_data: ScheduledContentUpdate,
-    current_user: Annotated[User, Depends(get_current_active_user)],
+    current_user: Annotated[Principal, Depends(get_current_active_user)],
     db: AsyncSession = Depends(get_db),
 ):
     """Update scheduled content."""
@@ -154,7 +173,7 @@ async def update_scheduled_content(
 @router.delete("/{schedule_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_scheduled_content(
     schedule_id: str,
-    current_user: Annotated[User, Depends(get_current_active_user)],
+    current_user: Annotated[Principal, Depends(get_current_active_user)],
     db: AsyncSession = Depends(get_db),
 ):
     """Delete scheduled content."""
@@ -183,7 +202,7 @@ async def delete_scheduled_content(
 @router.post("/import-csv")
 async def import_schedule_csv(
     file: UploadFile = File(...),
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Import scheduled content from CSV."""
@@ -248,7 +267,7 @@ async def import_schedule_csv(
 
 @router.get("/template/download")
 async def download_csv_template(
-    current_user: Annotated[User, Depends(get_current_active_user)],
+    current_user: Annotated[Principal, Depends(get_current_active_user)],
 ):
     """Download CSV template for schedule import."""
     # Create CSV template
@@ -8,7 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
 from app.api.deps import get_current_active_user
-from app.models import User
+from app.services.principal_cache import Principal
 from app.schemas.template import TemplateResponse
 from app.services.template_service import TemplateService
 from app.services.agency_service import AgencyService
@@ -18,7 +18,7 @@ router = APIRouter()
 
 @router.get("", response_model=List[TemplateResponse])
 async def list_templates(
-    current_user: Annotated[User, Depends(get_current_active_user)],
+    current_user: Annotated[Principal, Depends(get_current_active_user)],
     db: AsyncSession = Depends(get_db),
 ):
     """List available templates for the current agency."""
@@ -43,7 +43,7 @@ async def list_templates(
 @router.get("/{template_id}", response_model=TemplateResponse)
 async def get_template(
     template_id: str,
-    current_user: Annotated[User, Depends(get_current_active_user)],
+    current_user: Annotated[Principal, Depends(get_current_active_user)],
     db: AsyncSession = Depends(get_db),
 ):
     """Get a specific template."""
@@ -75,7 +75,7 @@ async def get_template(
 @router.get("/{template_id}/preview")
 async def get_template_preview(
     template_id: str,
-    current_user: Annotated[User, Depends(get_current_active_user)],
+    current_user: Annotated[Principal, Depends(get_current_active_user)],
     db: AsyncSession = Depends(get_db),
 ):
     """Get template preview image."""
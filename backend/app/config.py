@@ -1,6 +1,6 @@
 """Application configuration and settings."""
 
-from typing import List
+from typing import Dict, List
 from pydantic_settings import BaseSettings
 
 
@@ -19,6 +19,7 @@ class Settings(BaseSettings):
 
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
+    REDIS_SOCKET_TIMEOUT: float = 0.5
 
     # Celery
     CELERY_BROKER_URL: str = "redis://localhost:6379/0"
@@ -30,6 +31,23 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
 
+    # Password hashing
+    BCRYPT_ROUNDS: int = 12  # Existing hashes are upgraded on next login when raised
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 32  # Further logins get 503 until the queue drains
+
+    # Authenticated principal cache
+    PRINCIPAL_CACHE_TTL: int = 60  # Redis tier, shared by API processes
+    PRINCIPAL_LOCAL_TTL: int = 5  # In-process tier
+    PRINCIPAL_CACHE_SIZE: int = 10000
+
+    # White-label routing
+    APP_BASE_DOMAIN: str = "paper.aiconnected.com"  # Agencies are served at <subdomain>.APP_BASE_DOMAIN
+    AGENCY_HOST_CACHE_TTL: int = 300  # Redis tier
+    AGENCY_HOST_NEGATIVE_TTL: int = 60  # Unknown hosts
+    AGENCY_HOST_LOCAL_TTL: int = 30  # In-process tier
+    AGENCY_HOST_CACHE_SIZE: int = 10000
+
     # CORS
     CORS_ORIGINS: List[str] = ["http://localhost:3000"]
 
@@ -39,18 +57,95 @@ class Settings(BaseSettings):
     OPENROUTER_MODEL: str = "anthropic/claude-sonnet-4"
     FREEPIK_API_KEY: str = ""
 
+    # LLM clients
+    LLM_CLIENT_POOL_SIZE: int = 64
+    LLM_PLATFORM_CONCURRENCY: int = 8  # In-flight requests per process on the platform key
+    LLM_BYOK_CONCURRENCY: int = 4  # In-flight requests per process on each agency key
+    LLM_REQUEST_TIMEOUT: float = 120.0
+    ANTHROPIC_MODEL: str = ""  # Anthropic model ID for BYOK Anthropic keys; mapped from OPENROUTER_MODEL if empty
+
     # File Storage
     STORAGE_TYPE: str = "local"
     STORAGE_LOCAL_PATH: str = "./storage"
+    STORAGE_CHUNK_SIZE: int = 256 * 1024  # Bytes per chunk when streaming downloads
+    AWS_S3_BUCKET: str = ""
+    AWS_S3_REGION: str = ""
+    AWS_S3_ENDPOINT_URL: str = ""  # For S3-compatible services (MinIO, LocalStack)
+    STORAGE_S3_MAX_CONNECTIONS: int = 32  # Pooled connections and transfer threads per process
+    STORAGE_MULTIPART_THRESHOLD: int = 8 * 1024 * 1024
+    STORAGE_MULTIPART_CHUNK_SIZE: int = 8 * 1024 * 1024
+    STORAGE_MULTIPART_CONCURRENCY: int = 4  # Parts uploaded in parallel
+    STORAGE_CACHE_PATH: str = "./storage/cache/files"  # Local disk cache in front of S3
+    STORAGE_CACHE_MAX_BYTES: int = 1024 * 1024 * 1024  # 0 disables the cache
+    STORAGE_CACHE_REVALIDATE_TTL: int = 30  # Seconds a cached entry is served before re-checking its ETag
+    STORAGE_CACHE_SCAN_INTERVAL: int = 60  # Max seconds between size scans of the shared cache directory
+
+    # Signed URLs
+    SIGNED_URLS_ENABLED: bool = False  # Redirect downloads and sign thumbnail URLs
+    SIGNED_URL_TTL: int = 300  # Downloads
+    SIGNED_THUMBNAIL_TTL: int = 86400  # Thumbnails; long, so their URLs stay cacheable
+
+    # Pagination
+    COUNT_CACHE_TTL: int = 60  # Seconds a listing total is reused in "cached" count mode
+
+    # PDF Output
+    PDF_OPTIMIZE_ENABLED: bool = True
+    PDF_IMAGE_DPI: int = 150
+    PDF_JPEG_QUALITY: int = 85
+    PDF_RENDER_ON_GENERATE: bool = False  # Otherwise rendered on finalize/download
+    PDF_RENDER_LOCK_TTL: int = 300  # Seconds a queued render blocks queueing another
+
+    # Charts
+    CHART_RENDER_EXECUTOR: str = "thread"  # thread or process
+    CHART_RENDER_WORKERS: int = 4
+    MAX_CHARTS_PER_DOCUMENT: int = 6
+    CHART_CACHE_SIZE: int = 256
+    CHART_CACHE_PATH: str = "./storage/cache/charts"
+    CHART_CACHE_MAX_BYTES: int = 256 * 1024 * 1024  # 0 disables the disk tier
+
+    # Render assets
+    ASSET_CACHE_PATH: str = "./storage/cache/assets"
+    ASSET_FETCH_TIMEOUT: float = 5.0
+    ASSET_MAX_WIDTH: int = 800
+    ASSET_NEGATIVE_TTL: int = 600
+    ASSET_CACHE_TTL: int = 86400  # Seconds before a cached asset is revalidated with its origin
+    ASSET_CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # 0 disables the size limit
+
+    # HTML Preview
+    PREVIEW_CACHE_SIZE: int = 256
+    PREVIEW_CACHE_TTL: int = 3600
+
+    # Thumbnails
+    THUMBNAIL_FORMAT: str = "webp"  # webp or png
+
+    # Encryption
+    ENCRYPTION_PREVIOUS_KEYS: List[str] = []  # Retired SECRET_KEY values, still accepted for decryption
+    ENCRYPTION_KDF_ITERATIONS: int = 100000
+    SECRET_CACHE_SIZE: int = 1024
+    SECRET_CACHE_TTL: int = 300
+
+    # Workers
+    WORKER_WARMUP_ENABLED: bool = True
 
     # Logging
     LOG_LEVEL: str = "INFO"
     LOG_FORMAT: str = "json"
+    LOG_QUEUE_SIZE: int = 10000  # Records buffered for the writer thread; extra records are dropped
+    LOG_SAMPLE_RATES: Dict[str, float] = {"/health": 0.01}  # Path prefix -> fraction of requests logged
+    METRICS_LOG_INTERVAL: int = 300  # Seconds between in-process metrics log lines; 0 disables
 
     # Rate Limiting
     RATE_LIMIT_ENABLED: bool = True
     RATE_LIMIT_REQUESTS: int = 100
     RATE_LIMIT_WINDOW: int = 60
+    RATE_LIMIT_PLANS: Dict[str, int] = {}  # Plan slug -> requests per window
+    RATE_LIMIT_ROUTES: Dict[str, int] = {  # Path prefix -> requests per window
+        "/api/v1/auth/": 20,
+        "/api/v1/generation/": 30,
+    }
+    RATE_LIMIT_LOCAL_SIZE: int = 10000
+    RATE_LIMIT_PLAN_CACHE_TTL: int = 300
+    TRUSTED_PROXIES: List[str] = []  # IPs/CIDRs whose X-Forwarded-For is honoured
 
     class Config:
         env_file = ".env"
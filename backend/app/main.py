@@ -1,12 +1,20 @@
 """FastAPI application entry point."""
 
-import structlog
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 from app.config import settings
 from app.api.v1.router import api_router
-from app.middleware import RequestLoggingMiddleware
+from app.logging_config import configure_logging, stop_logging
+from app.middleware import (
+    AgencyResolverMiddleware,
+    RateLimiterMiddleware,
+    RequestLoggingMiddleware,
+)
+from app.redis import close_redis
+from app.utils import metrics
+from app.utils.exceptions import ServiceBusyError
 
 app = FastAPI(
     title=settings.APP_NAME,
@@ -16,7 +24,16 @@ app = FastAPI(
     redoc_url="/api/redoc" if settings.DEBUG else None,
 )
 
-# Add request logging middleware (must be added before other middleware)
+# Middleware added last runs first
+
+# White-label agency resolution
+app.add_middleware(AgencyResolverMiddleware)
+
+# Rate limiting (inside CORS, so 429 responses carry CORS headers)
+app.add_middleware(RateLimiterMiddleware)
+
+# Request logging, outside the rate limiter and agency resolution so
+# responses they short-circuit (e.g. 429s) are logged too
 app.add_middleware(RequestLoggingMiddleware)
 
 # CORS middleware
@@ -32,34 +49,41 @@ app.add_middleware(
 app.include_router(api_router, prefix="/api/v1")
 
 
+@app.exception_handler(ServiceBusyError)
+async def service_busy_handler(request: Request, exc: ServiceBusyError):
+    """Shed load with a retryable 503."""
+    retry_after = exc.details.get("retry_after", 1)
+    return JSONResponse(
+        status_code=503,
+        content={"error": {"code": exc.code, "message": exc.message}},
+        headers={"Retry-After": str(retry_after)},
+    )
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
     return {"status": "healthy", "version": "1.0.0"}
 
 
+if settings.DEBUG:
+
+    @app.get("/metrics")
+    async def get_metrics():
+        """In-process metrics (debug only)."""
+        return metrics.snapshot()
+
+
 @app.on_event("startup")
 async def startup_event():
     """Application startup tasks."""
-    # Configure structured logging
-    structlog.configure(
-        processors=[
-            structlog.stdlib.filter_by_level,
-            structlog.stdlib.add_logger_name,
-            structlog.stdlib.add_log_level,
-            structlog.processors.TimeStamper(fmt="iso"),
-            structlog.processors.StackInfoRenderer(),
-            structlog.processors.format_exc_info,
-            structlog.processors.JSONRenderer(),
-        ],
-        wrapper_class=structlog.stdlib.BoundLogger,
-        context_class=dict,
-        logger_factory=structlog.stdlib.LoggerFactory(),
-        cache_logger_on_first_use=True,
-    )
+    configure_logging()
+    metrics.start_reporting(settings.METRICS_LOG_INTERVAL)
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Application shutdown tasks."""
-    pass
+    await close_redis()
+    metrics.stop_reporting()
+    stop_logging()
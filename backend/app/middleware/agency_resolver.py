@@ -1,41 +1,35 @@
 """Agency resolver middleware for white-label domain routing."""
 
-from typing import Optional
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
+from app.services.agency_host_cache import AgencyHostCache
 
 
-class AgencyResolverMiddleware(BaseHTTPMiddleware):
-    """Middleware to resolve agency from request domain."""
+class AgencyResolverMiddleware:
+    """
+    Resolve the agency from the request's subdomain or custom domain.
 
-    async def dispatch(self, request: Request, call_next):
-        """Resolve agency from subdomain or custom domain."""
-        # Extract host from request
-        host = request.headers.get("host", "").split(":")[0].lower()
+    Sets `request.state.agency_id` and `request.state.agency_subdomain`
+    (None when the host belongs to no agency). Resolutions are cached by
+    `AgencyHostCache`.
+    """
 
-        # Resolve agency
-        agency_info = await self._resolve_agency(host)
+    def __init__(self, app: ASGIApp):
+        self.app = app
 
-        # Store in request state
-        request.state.agency_id = agency_info.get("id") if agency_info else None
-        request.state.agency_subdomain = agency_info.get("subdomain") if agency_info else None
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
 
-        response = await call_next(request)
-        return response
+        host = Headers(scope=scope).get("host", "")
+        if not host.startswith("["):
+            host = host.split(":")[0]
+        route = await AgencyHostCache.resolve(host)
 
-    async def _resolve_agency(self, host: str) -> Optional[dict]:
-        """
-        Resolve agency from host.
+        state = scope.setdefault("state", {})
+        state["agency_id"] = route.id if route else None
+        state["agency_subdomain"] = route.subdomain if route else None
 
-        Args:
-            host: The request host.
-
-        Returns:
-            Agency info dict or None.
-        """
-        # TODO: Implement agency resolution
-        # 1. Check if it's a custom domain
-        # 2. Extract subdomain from host
-        # 3. Query database for matching agency
-        return None
+        await self.app(scope, receive, send)
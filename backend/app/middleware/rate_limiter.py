@@ -1,37 +1,274 @@
 """Rate limiting middleware."""
 
+import ipaddress
+import math
 import time
-from typing import Dict, Tuple
+from functools import lru_cache
+from typing import List, NamedTuple, Optional, Sequence, Tuple, Union
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
+import structlog
+from sqlalchemy import select
+from starlette.datastructures import Headers, MutableHeaders
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models import Agency, Plan
+from app.redis import get_redis, mark_unavailable
+from app.services.auth_service import AuthService
+from app.utils.cache import LRUCache
 
+logger = structlog.get_logger()
 
-class RateLimiterMiddleware(BaseHTTPMiddleware):
-    """Simple in-memory rate limiter middleware."""
+# Paths that are never limited
+EXEMPT_PATHS = frozenset({"/health", "/metrics"})
 
-    def __init__(self, app):
-        super().__init__(app)
-        self.requests: Dict[str, list] = {}
-        self.limit = settings.RATE_LIMIT_REQUESTS
-        self.window = settings.RATE_LIMIT_WINDOW
+# GCRA over several keys at once. Nothing is recorded unless every key
+# allows the request. TATs are stored in milliseconds of Redis server time,
+# so all API processes agree on the clock.
+#   KEYS: one per limit
+#   ARGV: emission interval and window (ms) for each key, in order
+# Returns the allowed flag, then remaining, retry after and reset after (ms)
+# for each key.
+GCRA_SCRIPT = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local tats = redis.call('MGET', unpack(KEYS))
+local allowed = 1
+local result = {}
+local new_tats = {}
+for i = 1, #KEYS do
+    local interval = tonumber(ARGV[2 * i - 1])
+    local window = tonumber(ARGV[2 * i])
+    local tat = math.max(tonumber(tats[i]) or now, now)
+    local new_tat = tat + interval
+    local allow_at = new_tat - window
+    if now < allow_at then
+        allowed = 0
+        table.insert(result, 0)
+        table.insert(result, math.ceil(allow_at - now))
+        table.insert(result, math.ceil(tat - now))
+    else
+        new_tats[i] = math.ceil(new_tat)
+        table.insert(result, math.floor((window - (new_tat - now)) / interval))
+        table.insert(result, 0)
+        table.insert(result, math.ceil(new_tat - now))
+    end
+end
+if allowed == 1 then
+    for i = 1, #KEYS do
+        redis.call('SET', KEYS[i], string.format('%d', new_tats[i]), 'PX', math.max(new_tats[i] - now, 1))
+    end
+end
+table.insert(result, 1, allowed)
+return result
+"""
 
-    async def dispatch(self, request: Request, call_next):
-        """Check rate limit before processing request."""
-        if not settings.RATE_LIMIT_ENABLED:
-            return await call_next(request)
 
-        # Get client identifier
-        client_id = self._get_client_id(request)
+class RateLimit(NamedTuple):
+    """A limit of `limit` requests per `window` seconds on one key."""
 
-        # Check rate limit
-        allowed, remaining, reset_at = self._check_rate_limit(client_id)
+    key: str
+    limit: int
+    window: int
 
-        if not allowed:
-            return JSONResponse(
+    @property
+    def interval(self) -> float:
+        """Seconds between requests at the sustained rate."""
+        return self.window / self.limit
+
+
+class RateLimitResult(NamedTuple):
+    """Outcome of a request against its most restrictive limit."""
+
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float
+    reset_after: float
+
+
+def gcra(
+    tat: Optional[float], now: float, limit: RateLimit
+) -> Tuple[Optional[float], int, float, float]:
+    """
+    Apply the generic cell rate algorithm to one key.
+
+    Each key holds only its theoretical arrival time (TAT): when the bucket
+    would be empty again at the sustained rate. A request is allowed while
+    the TAT is at most one window ahead of now.
+
+    Args:
+        tat: Stored TAT, or None for a new key.
+        now: Current time in seconds.
+        limit: The limit.
+
+    Returns:
+        Tuple of (new TAT or None if denied, remaining, retry_after, reset_after).
+    """
+    tat = max(tat if tat is not None else now, now)
+    new_tat = tat + limit.interval
+    allow_at = new_tat - limit.window
+    if now < allow_at:
+        return None, 0, allow_at - now, tat - now
+    remaining = int((limit.window - (new_tat - now)) / limit.interval)
+    return new_tat, remaining, 0.0, new_tat - now
+
+
+class RateLimiter:
+    """
+    GCRA rate limiter shared by all API processes through Redis.
+
+    Every key costs one Redis string that expires once its bucket is full
+    again, and all limits of a request are checked and recorded in one
+    atomic script call. When Redis is unavailable each process falls back
+    to a bounded local LRU, so limits still hold per process.
+    """
+
+    def __init__(self, local_size: int = None):
+        self._local = LRUCache(maxsize=local_size or settings.RATE_LIMIT_LOCAL_SIZE)
+        self._script = None
+        self._script_client = None
+
+    async def hit(self, limits: Sequence[RateLimit]) -> RateLimitResult:
+        """
+        Count a request against its limits.
+
+        Args:
+            limits: Limits that apply to the request.
+
+        Returns:
+            The result for the most restrictive limit.
+        """
+        redis = get_redis()
+        if redis is not None:
+            try:
+                return await self._hit_redis(redis, limits)
+            except Exception as e:
+                logger.warning("rate_limiter_unavailable", error=str(e))
+                mark_unavailable()
+        return self.hit_local(limits)
+
+    async def _hit_redis(self, redis, limits: Sequence[RateLimit]) -> RateLimitResult:
+        if self._script_client is not redis:
+            self._script = redis.register_script(GCRA_SCRIPT)
+            self._script_client = redis
+
+        args: List[float] = []
+        for limit in limits:
+            args.extend((limit.interval * 1000, limit.window * 1000))
+        raw = await self._script(keys=[f"ratelimit:{limit.key}" for limit in limits], args=args)
+
+        outcomes = [
+            (int(raw[i]), int(raw[i + 1]) / 1000, int(raw[i + 2]) / 1000)
+            for i in range(1, len(raw), 3)
+        ]
+        return _combine(bool(int(raw[0])), limits, outcomes)
+
+    def hit_local(self, limits: Sequence[RateLimit], now: float = None) -> RateLimitResult:
+        """Count a request against per-process state only."""
+        now = time.monotonic() if now is None else now
+        results = [gcra(self._local.get(limit.key), now, limit) for limit in limits]
+        allowed = all(new_tat is not None for new_tat, *_ in results)
+        if allowed:
+            for limit, (new_tat, *_) in zip(limits, results):
+                self._local.set(limit.key, new_tat, ttl=new_tat - now)
+        return _combine(allowed, limits, [outcome for _, *outcome in results])
+
+
+def _combine(
+    allowed: bool,
+    limits: Sequence[RateLimit],
+    outcomes: Sequence[Tuple[int, float, float]],
+) -> RateLimitResult:
+    """Reduce per-limit outcomes to the one reported in headers."""
+    if allowed:
+        index = min(range(len(limits)), key=lambda i: outcomes[i][0])
+    else:
+        index = max(range(len(limits)), key=lambda i: outcomes[i][1])
+    remaining, retry_after, reset_after = outcomes[index]
+    return RateLimitResult(allowed, limits[index].limit, remaining, retry_after, reset_after)
+
+
+Network = Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+
+
+@lru_cache(maxsize=4)
+def _trusted_networks(proxies: Tuple[str, ...]) -> Tuple[Network, ...]:
+    return tuple(ipaddress.ip_network(proxy, strict=False) for proxy in proxies)
+
+
+def _is_trusted(host: str, networks: Tuple[Network, ...]) -> bool:
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return any(address in network for network in networks)
+
+
+def client_ip(scope: Scope) -> Optional[str]:
+    """
+    IP address of the client that sent a request.
+
+    X-Forwarded-For is only honoured on connections from TRUSTED_PROXIES,
+    and then only its rightmost hop that is not a trusted proxy is used:
+    every hop to its right was appended by a proxy we trust, while anything
+    to its left was sent by the client and can be forged.
+    """
+    client = scope.get("client")
+    peer = client[0] if client else None
+    networks = _trusted_networks(tuple(settings.TRUSTED_PROXIES))
+    if peer is None or not _is_trusted(peer, networks):
+        return peer
+
+    forwarded = Headers(scope=scope).getlist("x-forwarded-for")
+    hops = [hop.strip() for value in forwarded for hop in value.split(",") if hop.strip()]
+    for hop in reversed(hops):
+        if not _is_trusted(hop, networks):
+            return hop
+    # Only proxies in the chain: the leftmost is as close to the client as we get
+    return hops[0] if hops else peer
+
+
+class RateLimiterMiddleware:
+    """
+    Per-client rate limiting as raw ASGI middleware.
+
+    Clients are identified by the user of a valid bearer token, otherwise by
+    IP. Each client has a default limit of RATE_LIMIT_REQUESTS per
+    RATE_LIMIT_WINDOW, replaced by its agency plan's limit from
+    RATE_LIMIT_PLANS, plus a separate limit for every RATE_LIMIT_ROUTES
+    prefix the path starts with.
+    """
+
+    _plans = LRUCache(maxsize=4096, ttl=settings.RATE_LIMIT_PLAN_CACHE_TTL)
+
+    def __init__(self, app: ASGIApp, limiter: Optional[RateLimiter] = None):
+        self.app = app
+        self.limiter = limiter or RateLimiter()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or not settings.RATE_LIMIT_ENABLED
+            or scope["method"] == "OPTIONS"
+            or scope["path"] in EXEMPT_PATHS
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        limits = await self.limits_for(scope)
+        result = await self.limiter.hit(limits)
+        reset_at = int(time.time() + result.reset_after)
+        rate_headers = {
+            "X-RateLimit-Limit": str(result.limit),
+            "X-RateLimit-Remaining": str(result.remaining),
+            "X-RateLimit-Reset": str(reset_at),
+        }
+
+        if not result.allowed:
+            response = JSONResponse(
                 status_code=429,
                 content={
                     "error": {
@@ -40,63 +277,72 @@ class RateLimiterMiddleware(BaseHTTPMiddleware):
                         "details": {"reset_at": reset_at},
                     }
                 },
-                headers={
-                    "X-RateLimit-Limit": str(self.limit),
-                    "X-RateLimit-Remaining": "0",
-                    "X-RateLimit-Reset": str(reset_at),
-                    "Retry-After": str(int(reset_at - time.time())),
-                },
+                headers={**rate_headers, "Retry-After": str(math.ceil(result.retry_after))},
             )
+            await response(scope, receive, send)
+            return
 
-        response = await call_next(request)
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).update(rate_headers)
+            await send(message)
 
-        # Add rate limit headers
-        response.headers["X-RateLimit-Limit"] = str(self.limit)
-        response.headers["X-RateLimit-Remaining"] = str(remaining)
-        response.headers["X-RateLimit-Reset"] = str(reset_at)
+        await self.app(scope, receive, send_with_headers)
 
-        return response
+    async def limits_for(self, scope: Scope) -> List[RateLimit]:
+        """
+        Limits that apply to a request.
 
-    def _get_client_id(self, request: Request) -> str:
-        """Get client identifier for rate limiting."""
-        # Use user ID if authenticated, otherwise IP
-        if hasattr(request.state, "user_id") and request.state.user_id:
-            return f"user:{request.state.user_id}"
+        Args:
+            scope: ASGI HTTP scope.
 
-        forwarded = request.headers.get("X-Forwarded-For")
-        if forwarded:
-            return f"ip:{forwarded.split(',')[0].strip()}"
+        Returns:
+            The client's default or plan limit, then any route limits.
+        """
+        client_id, agency_id = self._identify(scope)
+        window = settings.RATE_LIMIT_WINDOW
 
-        return f"ip:{request.client.host}" if request.client else "ip:unknown"
+        limit = settings.RATE_LIMIT_REQUESTS
+        if agency_id and settings.RATE_LIMIT_PLANS:
+            plan = await self._plan_slug(agency_id)
+            limit = settings.RATE_LIMIT_PLANS.get(plan, limit)
 
-    def _check_rate_limit(self, client_id: str) -> Tuple[bool, int, int]:
-        """
-        Check if client is within rate limit.
+        limits = [RateLimit(client_id, limit, window)]
+        path = scope["path"]
+        for prefix, route_limit in settings.RATE_LIMIT_ROUTES.items():
+            if path.startswith(prefix):
+                limits.append(RateLimit(f"{client_id}:{prefix}", route_limit, window))
+        return limits
 
-        Returns:
-            Tuple of (allowed, remaining, reset_at)
-        """
-        now = time.time()
-        window_start = now - self.window
-
-        # Clean old requests
-        if client_id in self.requests:
-            self.requests[client_id] = [
-                ts for ts in self.requests[client_id] if ts > window_start
-            ]
-        else:
-            self.requests[client_id] = []
-
-        # Check limit
-        current_count = len(self.requests[client_id])
-        if current_count >= self.limit:
-            oldest = min(self.requests[client_id]) if self.requests[client_id] else now
-            reset_at = int(oldest + self.window)
-            return False, 0, reset_at
-
-        # Record request
-        self.requests[client_id].append(now)
-        remaining = self.limit - current_count - 1
-        reset_at = int(now + self.window)
-
-        return True, remaining, reset_at
+    @staticmethod
+    def _identify(scope: Scope) -> Tuple[str, Optional[str]]:
+        """Client identifier and agency ID of a request."""
+        headers = Headers(scope=scope)
+
+        authorization = headers.get("authorization", "")
+        scheme, _, token = authorization.partition(" ")
+        if scheme.lower() == "bearer" and token:
+            payload = AuthService.decode_token(token)
+            if payload and payload.get("type") == "access" and payload.get("sub"):
+                return f"user:{payload['sub']}", payload.get("agency_id")
+
+        return f"ip:{client_ip(scope) or 'unknown'}", None
+
+    @classmethod
+    async def _plan_slug(cls, agency_id: str) -> str:
+        """Plan slug of an agency, cached for RATE_LIMIT_PLAN_CACHE_TTL seconds."""
+        slug = cls._plans.get(agency_id)
+        if slug is None:
+            try:
+                async with AsyncSessionLocal() as db:
+                    slug = await db.scalar(
+                        select(Plan.slug)
+                        .join(Agency, Agency.plan_id == Plan.id)
+                        .where(Agency.id == agency_id)
+                    ) or ""
+            except Exception as e:
+                # Fall back to the default limit rather than failing the request
+                logger.warning("rate_limit_plan_lookup_failed", agency_id=agency_id, error=str(e))
+                return ""
+            cls._plans.set(agency_id, slug)
+        return slug
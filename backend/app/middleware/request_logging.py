@@ -1,64 +1,86 @@
 """Request logging middleware."""
 
+import random
 import time
 import uuid
-from typing import Callable
+from typing import Optional
 
 import structlog
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
 
 logger = structlog.get_logger()
 
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware for structured request logging."""
+class RequestLoggingMiddleware:
+    """
+    Structured request logging as raw ASGI middleware.
 
-    async def dispatch(self, request: Request, call_next):
-        """Log request details."""
-        # Generate request ID
-        request_id = str(uuid.uuid4())
-        request.state.request_id = request_id
+    Logs one `request` line per request once the response has started (or
+    failed), and sets `request.state.request_id` and the X-Request-ID
+    response header. Paths matching a LOG_SAMPLE_RATES prefix are logged
+    only for that fraction of requests; server errors are always logged.
+    """
 
-        # Start timing
-        start_time = time.time()
+    def __init__(self, app: ASGIApp):
+        self.app = app
 
-        # Log request
-        logger.info(
-            "request_started",
-            request_id=request_id,
-            method=request.method,
-            path=request.url.path,
-            query=str(request.query_params),
-            client_ip=request.client.host if request.client else None,
-        )
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = str(uuid.uuid4())
+        scope.setdefault("state", {})["request_id"] = request_id
+        start_time = time.perf_counter()
+        status_code = 500
+
+        async def send_with_request_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message)["X-Request-ID"] = request_id
+            await send(message)
 
-        # Process request
         try:
-            response = await call_next(request)
+            await self.app(scope, receive, send_with_request_id)
         except Exception as e:
-            # Log error
-            duration = time.time() - start_time
             logger.error(
                 "request_error",
                 request_id=request_id,
-                duration=duration,
+                method=scope["method"],
+                path=scope["path"],
+                duration_ms=round((time.perf_counter() - start_time) * 1000, 2),
                 error=str(e),
             )
             raise
 
-        # Calculate duration
-        duration = time.time() - start_time
+        if status_code < 500 and not _sampled(scope["path"]):
+            return
 
-        # Log response
+        client = scope.get("client")
         logger.info(
-            "request_completed",
+            "request",
             request_id=request_id,
-            status_code=response.status_code,
-            duration=duration,
+            method=scope["method"],
+            path=scope["path"],
+            status_code=status_code,
+            duration_ms=round((time.perf_counter() - start_time) * 1000, 2),
+            client_ip=client[0] if client else None,
         )
 
-        # Add request ID to response headers
-        response.headers["X-Request-ID"] = request_id
 
-        return response
+def _sample_rate(path: str) -> Optional[float]:
+    """Sampling rate configured for a path, if any."""
+    for prefix, rate in settings.LOG_SAMPLE_RATES.items():
+        if path.startswith(prefix):
+            return rate
+    return None
+
+
+def _sampled(path: str) -> bool:
+    """Whether a request to `path` should be logged."""
+    rate = _sample_rate(path)
+    return rate is None or random.random() < rate
@@ -1,6 +1,6 @@
 """Client model."""
 
-from sqlalchemy import Boolean, ForeignKey, String, Text
+from sqlalchemy import Boolean, ForeignKey, Index, String, Text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -11,6 +11,10 @@ class Client(BaseModel):
     """Client model representing an agency's customer (seat)."""
 
     __tablename__ = "clients"
+    __table_args__ = (
+        # Keyset pagination of agency listings, newest first
+        Index("ix_clients_agency_created", "agency_id", "created_at", "id"),
+    )
 
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     slug: Mapped[str] = mapped_column(String(100), index=True, nullable=False)
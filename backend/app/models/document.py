@@ -2,7 +2,7 @@
 
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -13,6 +13,12 @@ class Document(BaseModel):
     """Document model for generated content."""
 
     __tablename__ = "documents"
+    __table_args__ = (
+        # Keyset pagination of agency listings, newest first
+        Index("ix_documents_agency_created", "agency_id", "created_at", "id"),
+        Index("ix_documents_agency_status_created", "agency_id", "status", "created_at", "id"),
+        Index("ix_documents_client_created", "client_id", "created_at", "id"),
+    )
 
     title: Mapped[str] = mapped_column(String(500), nullable=False)
     slug: Mapped[str] = mapped_column(String(200), index=True, nullable=False)
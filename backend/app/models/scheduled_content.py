@@ -2,7 +2,7 @@
 
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, String, Text
+from sqlalchemy import DateTime, ForeignKey, Index, String, Text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -13,6 +13,10 @@ class ScheduledContent(BaseModel):
     """Scheduled content model for future generations."""
 
     __tablename__ = "scheduled_content"
+    __table_args__ = (
+        # Keyset pagination of schedules, soonest first
+        Index("ix_scheduled_content_client_date", "client_id", "scheduled_date", "id"),
+    )
 
     topic: Mapped[str] = mapped_column(Text, nullable=False)
     scheduled_date: Mapped[datetime] = mapped_column(
@@ -0,0 +1,55 @@
+"""Redis connection management."""
+
+import time
+from typing import Optional
+
+from app.config import settings
+
+# Seconds to bypass Redis after a connection failure
+RETRY_AFTER = 5.0
+
+_client = None
+_unavailable_until = 0.0
+
+
+def get_redis() -> Optional["redis.asyncio.Redis"]:  # noqa: F821
+    """
+    Get the shared async Redis client, created on first use.
+
+    Returns:
+        The client, or None if no REDIS_URL is configured or Redis recently
+        failed (see `mark_unavailable`).
+    """
+    global _client
+    if time.monotonic() < _unavailable_until:
+        return None
+    if _client is None and settings.REDIS_URL:
+        import redis.asyncio as redis
+
+        _client = redis.from_url(
+            settings.REDIS_URL,
+            decode_responses=True,
+            socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            health_check_interval=30,
+        )
+    return _client
+
+
+def mark_unavailable() -> None:
+    """
+    Report a Redis failure.
+
+    Callers fall back to their local behaviour for RETRY_AFTER seconds
+    instead of waiting on a connect timeout in every request.
+    """
+    global _unavailable_until
+    _unavailable_until = time.monotonic() + RETRY_AFTER
+
+
+async def close_redis() -> None:
+    """Close the shared client and its connection pool."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
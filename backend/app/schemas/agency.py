@@ -3,7 +3,7 @@
 from typing import Optional, Dict, Any
 from datetime import datetime
 
-from pydantic import BaseModel, HttpUrl
+from pydantic import BaseModel, Field, HttpUrl
 
 
 class AgencyBase(BaseModel):
@@ -25,8 +25,8 @@ class AgencyUpdate(BaseModel):
     name: Optional[str] = None
     website: Optional[str] = None
     logo_url: Optional[str] = None
-    primary_color: Optional[str] = None
-    secondary_color: Optional[str] = None
+    primary_color: Optional[str] = Field(None, pattern=r"^#[0-9a-fA-F]{6}$")
+    secondary_color: Optional[str] = Field(None, pattern=r"^#[0-9a-fA-F]{6}$")
     settings: Optional[Dict[str, Any]] = None
 
 
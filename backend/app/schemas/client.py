@@ -38,6 +38,20 @@ class ClientUpdate(BaseModel):
     tone: Optional[str] = None
 
 
+class ClientSummary(ClientBase):
+    """Client list item schema."""
+
+    id: str
+    slug: str
+    logo_url: Optional[str] = None
+    tone: str
+    is_active: bool
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
 class ClientResponse(ClientBase):
     """Client response schema."""
 
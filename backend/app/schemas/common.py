@@ -19,10 +19,11 @@ class PaginatedResponse(BaseModel, Generic[T]):
     """Paginated response wrapper."""
 
     items: List[T]
-    total: int
+    total: Optional[int] = None  # None when listed with count=none
     page: int
     per_page: int
-    pages: int
+    pages: Optional[int] = None
+    next_cursor: Optional[str] = None
 
 
 class ErrorResponse(BaseModel):
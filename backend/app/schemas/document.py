@@ -2,8 +2,11 @@
 
 from typing import Optional, Dict, Any
 from datetime import datetime
+from pathlib import PurePosixPath
 
-from pydantic import BaseModel
+from pydantic import BaseModel, computed_field
+
+from app.config import settings
 
 
 class DocumentBase(BaseModel):
@@ -28,8 +31,8 @@ class DocumentUpdate(BaseModel):
     status: Optional[str] = None
 
 
-class DocumentResponse(DocumentBase):
-    """Document response schema."""
+class DocumentSummary(DocumentBase):
+    """Document list item schema."""
 
     id: str
     slug: str
@@ -41,12 +44,40 @@ class DocumentResponse(DocumentBase):
     statistics_count: Optional[int] = None
     sources_count: Optional[int] = None
     template_id: Optional[str] = None
-    agency_id: str
     client_id: str
-    created_by_id: Optional[str] = None
-    expires_at: Optional[datetime] = None
     created_at: datetime
     updated_at: datetime
 
+    @computed_field
+    @property
+    def thumbnail_url(self) -> Optional[str]:
+        """Long-cacheable URL of the card-size first-page thumbnail."""
+        if not self.cover_image_url:
+            return None
+        if settings.SIGNED_URLS_ENABLED:
+            from app.services.signed_url_service import SignedURLService
+
+            return SignedURLService.sign(
+                self.cover_image_url, ttl=settings.SIGNED_THUMBNAIL_TTL
+            ).url
+        filename = PurePosixPath(self.cover_image_url).name
+        return f"/api/v1/documents/{self.id}/thumbnails/{filename}"
+
     class Config:
         from_attributes = True
+
+
+class DocumentResponse(DocumentSummary):
+    """Document response schema."""
+
+    agency_id: str
+    created_by_id: Optional[str] = None
+    expires_at: Optional[datetime] = None
+
+
+class DocumentDetail(DocumentResponse):
+    """Document schema including generated content, returned only on request."""
+
+    content_json: Optional[Dict[str, Any]] = None
+    generation_options: Optional[Dict[str, Any]] = None
+    distribution_status: Optional[Dict[str, Any]] = None
@@ -31,6 +31,23 @@ class ScheduledContentUpdate(BaseModel):
     status: Optional[str] = None
 
 
+class ScheduledContentSummary(ScheduledContentBase):
+    """Scheduled content list item schema."""
+
+    id: str
+    status: str
+    template_id: Optional[str] = None
+    auto_distribute: bool
+    document_id: Optional[str] = None
+    error_message: Optional[str] = None
+    client_id: str
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
 class ScheduledContentResponse(ScheduledContentBase):
     """Scheduled content response schema."""
 
@@ -48,3 +65,9 @@ class ScheduledContentResponse(ScheduledContentBase):
 
     class Config:
         from_attributes = True
+
+
+class ScheduledContentDetail(ScheduledContentResponse):
+    """Scheduled content schema including generation options, returned only on request."""
+
+    generation_options: Optional[Dict[str, Any]] = None
@@ -1,27 +1,34 @@
-"""Business logic services."""
+"""Business logic services.
 
-from app.services.auth_service import AuthService
-from app.services.user_service import UserService
-from app.services.agency_service import AgencyService
-from app.services.client_service import ClientService
-from app.services.document_service import DocumentService
-from app.services.pdf_service import PDFService
-from app.services.storage_service import StorageService
-from app.services.encryption_service import EncryptionService
-from app.services.schedule_service import ScheduleService
-from app.services.template_service import TemplateService
-from app.services.generation_service import GenerationService
+Services are loaded on first attribute access, so importing this package (or
+any one service module) does not pull in the heavy dependencies of the others
+(boto3, WeasyPrint, matplotlib, ...).
+"""
 
-__all__ = [
-    "AuthService",
-    "UserService",
-    "AgencyService",
-    "ClientService",
-    "DocumentService",
-    "PDFService",
-    "StorageService",
-    "EncryptionService",
-    "ScheduleService",
-    "TemplateService",
-    "GenerationService",
-]
+import importlib
+
+_SERVICES = {
+    "AuthService": "app.services.auth_service",
+    "UserService": "app.services.user_service",
+    "AgencyService": "app.services.agency_service",
+    "ClientService": "app.services.client_service",
+    "DocumentService": "app.services.document_service",
+    "PDFService": "app.services.pdf_service",
+    "StorageService": "app.services.storage_service",
+    "EncryptionService": "app.services.encryption_service",
+    "APIKeyService": "app.services.api_key_service",
+    "ScheduleService": "app.services.schedule_service",
+    "TemplateService": "app.services.template_service",
+    "GenerationService": "app.services.generation_service",
+}
+
+__all__ = list(_SERVICES)
+
+
+def __getattr__(name: str):
+    module = _SERVICES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,185 @@
+"""Cache of request host to agency resolution."""
+
+import json
+from dataclasses import asdict, dataclass
+from typing import Iterable, Optional, Tuple
+
+import structlog
+from sqlalchemy import select
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models import Agency
+from app.redis import get_redis, mark_unavailable
+from app.utils.cache import LRUCache
+
+logger = structlog.get_logger()
+
+
+@dataclass(frozen=True)
+class AgencyRoute:
+    """The agency a request host belongs to."""
+
+    id: str
+    subdomain: str
+
+
+def lookup_key(host: str) -> Optional[str]:
+    """
+    Cache key for a request host.
+
+    Hosts under APP_BASE_DOMAIN map to the agency subdomain, any other host
+    to a custom domain.
+
+    Args:
+        host: Request host, without port.
+
+    Returns:
+        `sub:<subdomain>` or `domain:<host>`, or None for hosts that never
+        belong to an agency (the base domain itself, localhost, IPs).
+    """
+    host = host.lower().rstrip(".")
+    base = settings.APP_BASE_DOMAIN.lower()
+    if (
+        not host
+        or host == base
+        or host == "localhost"
+        or host.startswith("[")
+        or host.replace(".", "").isdigit()
+    ):
+        return None
+    if base and host.endswith("." + base):
+        return f"sub:{host[: -len(base) - 1]}"
+    return f"domain:{host}"
+
+
+def agency_keys(subdomain: Optional[str], custom_domain: Optional[str]) -> Tuple[str, ...]:
+    """Cache keys an agency with these hosts can be resolved under."""
+    keys = []
+    if subdomain:
+        keys.append(f"sub:{subdomain.lower()}")
+    if custom_domain:
+        keys.append(f"domain:{custom_domain.lower().rstrip('.')}")
+    return tuple(keys)
+
+
+class AgencyHostCache:
+    """
+    Two-tier cache of host to agency resolution.
+
+    Results, including "no agency" for unknown hosts, live in Redis for
+    AGENCY_HOST_CACHE_TTL seconds (AGENCY_HOST_NEGATIVE_TTL for unknown
+    hosts) and in a per-process LRU for AGENCY_HOST_LOCAL_TTL seconds, so a
+    hot host costs one dictionary lookup per request. `invalidate` drops the
+    Redis entries and this process's entries when an agency's subdomain,
+    custom domain or status changes; other processes follow once their
+    local entry expires.
+    """
+
+    _local = LRUCache(maxsize=settings.AGENCY_HOST_CACHE_SIZE, ttl=settings.AGENCY_HOST_LOCAL_TTL)
+
+    @classmethod
+    async def resolve(cls, host: str) -> Optional[AgencyRoute]:
+        """
+        Resolve a request host to its agency.
+
+        Args:
+            host: Request host, without port.
+
+        Returns:
+            The active agency serving the host, or None.
+        """
+        key = lookup_key(host)
+        if key is None:
+            return None
+
+        # False marks a cached miss
+        cached = cls._local.get(key)
+        if cached is not None:
+            return cached or None
+
+        found, route = await cls._get_redis(key)
+        if not found:
+            try:
+                route = await cls._load(key)
+            except Exception as e:
+                logger.warning("agency_resolution_failed", host=host, error=str(e))
+                return None
+            await cls._set_redis(key, route)
+
+        cls._local.set(
+            key,
+            route or False,
+            ttl=None if route else min(settings.AGENCY_HOST_LOCAL_TTL, settings.AGENCY_HOST_NEGATIVE_TTL),
+        )
+        return route
+
+    @classmethod
+    async def invalidate(cls, keys: Iterable[str]) -> None:
+        """
+        Drop cached resolutions, e.g. after an agency's hosts change.
+
+        Args:
+            keys: Keys from `agency_keys`, for both the old and new hosts.
+        """
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return
+        for key in keys:
+            cls._local.delete(key)
+
+        redis = get_redis()
+        if redis is None:
+            return
+        try:
+            await redis.delete(*(f"agency_host:{key}" for key in keys))
+        except Exception as e:
+            logger.warning("agency_host_invalidate_failed", keys=keys, error=str(e))
+            mark_unavailable()
+
+    @staticmethod
+    async def _load(key: str) -> Optional[AgencyRoute]:
+        """Look up the agency for a cache key in the database."""
+        kind, _, value = key.partition(":")
+        column = Agency.subdomain if kind == "sub" else Agency.custom_domain
+        async with AsyncSessionLocal() as db:
+            row = (
+                await db.execute(
+                    select(Agency.id, Agency.subdomain).where(
+                        column == value, Agency.is_active.is_(True)
+                    )
+                )
+            ).first()
+        return AgencyRoute(id=row.id, subdomain=row.subdomain) if row else None
+
+    @staticmethod
+    async def _get_redis(key: str) -> Tuple[bool, Optional[AgencyRoute]]:
+        """Read the shared tier. Returns (found, route)."""
+        redis = get_redis()
+        if redis is None:
+            return False, None
+        try:
+            data = await redis.get(f"agency_host:{key}")
+        except Exception as e:
+            logger.warning("agency_host_cache_unavailable", error=str(e))
+            mark_unavailable()
+            return False, None
+        if data is None:
+            return False, None
+        return True, AgencyRoute(**json.loads(data)) if data else None
+
+    @staticmethod
+    async def _set_redis(key: str, route: Optional[AgencyRoute]) -> None:
+        """Write the shared tier; misses are stored as an empty string."""
+        redis = get_redis()
+        if redis is None:
+            return
+        try:
+            await redis.set(
+                f"agency_host:{key}",
+                json.dumps(asdict(route)) if route else "",
+                ex=settings.AGENCY_HOST_CACHE_TTL if route else settings.AGENCY_HOST_NEGATIVE_TTL,
+            )
+        except Exception as e:
+            logger.warning("agency_host_cache_unavailable", error=str(e))
+            mark_unavailable()
@@ -7,6 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from slugify import slugify
 
 from app.models import Agency
+from app.services.agency_host_cache import AgencyHostCache, agency_keys
 
 
 class AgencyService:
@@ -42,14 +43,24 @@ class AgencyService:
         db.add(agency)
         await db.commit()
         await db.refresh(agency)
+
+        # The new hosts may be cached as unknown
+        await AgencyHostCache.invalidate(agency_keys(agency.subdomain, agency.custom_domain))
         return agency
 
     @staticmethod
     async def update(db: AsyncSession, agency: Agency, **kwargs) -> Agency:
         """Update an agency."""
+        old_keys = agency_keys(agency.subdomain, agency.custom_domain)
+        was_active = agency.is_active
+
         for key, value in kwargs.items():
             if hasattr(agency, key) and value is not None:
                 setattr(agency, key, value)
         await db.commit()
         await db.refresh(agency)
+
+        new_keys = agency_keys(agency.subdomain, agency.custom_domain)
+        if new_keys != old_keys or agency.is_active != was_active:
+            await AgencyHostCache.invalidate(old_keys + new_keys)
         return agency
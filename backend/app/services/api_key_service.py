@@ -0,0 +1,159 @@
+"""API key service."""
+
+from typing import Dict, List, NamedTuple, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models import APIKey
+from app.services.encryption_service import EncryptionService
+from app.utils.cache import LRUCache
+
+
+class Credential(NamedTuple):
+    """A decrypted API key."""
+
+    id: str
+    service: str
+    secret: str
+
+
+class APIKeyService:
+    """
+    Service for per-agency external service credentials.
+
+    Decrypted secrets are cached per agency for SECRET_CACHE_TTL seconds, so
+    resolving a key during a generation job is a dictionary lookup. Writes
+    through this service invalidate the cache of the current process; other
+    processes pick up the change once the TTL expires.
+    """
+
+    _secrets = LRUCache(maxsize=settings.SECRET_CACHE_SIZE, ttl=settings.SECRET_CACHE_TTL)
+    _encryption: Optional[EncryptionService] = None
+
+    @classmethod
+    def encryption(cls) -> EncryptionService:
+        """The shared encryption service."""
+        if cls._encryption is None:
+            cls._encryption = EncryptionService()
+        return cls._encryption
+
+    @classmethod
+    async def get_credentials(
+        cls, db: AsyncSession, agency_id: str
+    ) -> Dict[str, Credential]:
+        """
+        Get all decrypted credentials of an agency.
+
+        Args:
+            db: Database session.
+            agency_id: Agency ID.
+
+        Returns:
+            Mapping of service name to credential.
+        """
+        credentials = cls._secrets.get(agency_id)
+        if credentials is not None:
+            return credentials
+
+        result = await db.execute(select(APIKey).where(APIKey.agency_id == agency_id))
+        encryption = cls.encryption()
+        credentials = {
+            api_key.service: Credential(
+                id=api_key.id,
+                service=api_key.service,
+                secret=encryption.decrypt(api_key.encrypted_key),
+            )
+            for api_key in result.scalars().all()
+        }
+        cls._secrets.set(agency_id, credentials)
+        return credentials
+
+    @classmethod
+    async def get_secret(
+        cls, db: AsyncSession, agency_id: str, service: str
+    ) -> Optional[str]:
+        """Get the decrypted key of an agency for a service, if configured."""
+        credential = (await cls.get_credentials(db, agency_id)).get(service)
+        return credential.secret if credential else None
+
+    @staticmethod
+    async def list_by_agency(db: AsyncSession, agency_id: str) -> List[APIKey]:
+        """List the API keys of an agency (still encrypted)."""
+        result = await db.execute(
+            select(APIKey).where(APIKey.agency_id == agency_id).order_by(APIKey.service)
+        )
+        return list(result.scalars().all())
+
+    @classmethod
+    async def set_key(
+        cls,
+        db: AsyncSession,
+        agency_id: str,
+        service: str,
+        plaintext: str,
+        label: Optional[str] = None,
+    ) -> APIKey:
+        """Create or replace the key of an agency for a service."""
+        result = await db.execute(
+            select(APIKey).where(APIKey.agency_id == agency_id, APIKey.service == service)
+        )
+        api_key = result.scalar_one_or_none()
+        encrypted = cls.encryption().encrypt(plaintext)
+
+        if api_key is None:
+            api_key = APIKey(
+                agency_id=agency_id, service=service, encrypted_key=encrypted, label=label
+            )
+            db.add(api_key)
+        else:
+            api_key.encrypted_key = encrypted
+            if label is not None:
+                api_key.label = label
+
+        await db.commit()
+        await db.refresh(api_key)
+        cls.invalidate(agency_id)
+        return api_key
+
+    @classmethod
+    async def delete(cls, db: AsyncSession, agency_id: str, service: str) -> bool:
+        """Delete the key of an agency for a service. Returns whether it existed."""
+        result = await db.execute(
+            select(APIKey).where(APIKey.agency_id == agency_id, APIKey.service == service)
+        )
+        api_key = result.scalar_one_or_none()
+        if api_key is None:
+            return False
+
+        await db.delete(api_key)
+        await db.commit()
+        cls.invalidate(agency_id)
+        return True
+
+    @classmethod
+    async def rotate_all(cls, db: AsyncSession) -> int:
+        """
+        Re-encrypt every stored key under the current SECRET_KEY.
+
+        Run after rotating the secret, before dropping the old one from
+        ENCRYPTION_PREVIOUS_KEYS.
+
+        Returns:
+            Number of keys re-encrypted.
+        """
+        result = await db.execute(select(APIKey))
+        api_keys = result.scalars().all()
+        encryption = cls.encryption()
+        for api_key in api_keys:
+            api_key.encrypted_key = encryption.rotate(api_key.encrypted_key)
+
+        await db.commit()
+        cls._secrets.clear()
+        return len(api_keys)
+
+    @classmethod
+    def invalidate(cls, agency_id: str) -> None:
+        """Drop the cached secrets of an agency."""
+        cls._secrets.delete(agency_id)
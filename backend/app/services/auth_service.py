@@ -1,7 +1,10 @@
 """Authentication service."""
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from functools import lru_cache
+from typing import Optional, Tuple
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
@@ -10,8 +13,54 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
 from app.models import User
+from app.utils.exceptions import ServiceBusyError
+from app.utils.metrics import histogram
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS,
+)
+
+_hash_latency = histogram("password_hash_seconds")
+_executor: Optional[ThreadPoolExecutor] = None
+_pending: Optional[asyncio.Semaphore] = None
+
+
+@lru_cache(maxsize=1)
+def _dummy_hash() -> str:
+    """Hash checked when the email is unknown, so timing does not reveal which accounts exist."""
+    return pwd_context.hash("dummy-password-for-timing")
+
+
+def _verify_dummy(password: str) -> bool:
+    return pwd_context.verify(password, _dummy_hash())
+
+
+async def _run_hasher(func, *args):
+    """
+    Run a bcrypt operation on the bounded hashing pool.
+
+    bcrypt releases the GIL, so the threads hash in parallel while the event
+    loop keeps serving other requests. At most PASSWORD_HASH_MAX_PENDING
+    operations may be queued or running; beyond that requests are refused
+    instead of piling up behind a login flood.
+    """
+    global _executor, _pending
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+        )
+    if _pending is None:
+        _pending = asyncio.Semaphore(settings.PASSWORD_HASH_MAX_PENDING)
+
+    if _pending.locked():
+        raise ServiceBusyError("Too many concurrent logins, retry later")
+
+    async with _pending:
+        loop = asyncio.get_running_loop()
+        with _hash_latency.time():
+            return await loop.run_in_executor(_executor, func, *args)
 
 
 class AuthService:
@@ -27,6 +76,24 @@ class AuthService:
         """Hash a password."""
         return pwd_context.hash(password)
 
+    @staticmethod
+    async def hash_password_async(password: str) -> str:
+        """Hash a password without blocking the event loop."""
+        return await _run_hasher(pwd_context.hash, password)
+
+    @staticmethod
+    async def verify_and_update(
+        plain_password: str, hashed_password: str
+    ) -> Tuple[bool, Optional[str]]:
+        """
+        Verify a password without blocking the event loop.
+
+        Returns:
+            Whether the password matches, and a new hash to store if the
+            existing one uses outdated parameters (e.g. fewer rounds).
+        """
+        return await _run_hasher(pwd_context.verify_and_update, plain_password, hashed_password)
+
     @staticmethod
     def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
         """Create a JWT access token."""
@@ -57,12 +124,25 @@ class AuthService:
     async def authenticate_user(
         db: AsyncSession, email: str, password: str
     ) -> Optional[User]:
-        """Authenticate a user by email and password."""
+        """
+        Authenticate a user by email and password.
+
+        Hashes using outdated parameters are upgraded on successful login.
+        """
         result = await db.execute(select(User).where(User.email == email))
         user = result.scalar_one_or_none()
-        if user and AuthService.verify_password(password, user.hashed_password):
-            return user
-        return None
+        if not user:
+            await _run_hasher(_verify_dummy, password)
+            return None
+
+        valid, new_hash = await AuthService.verify_and_update(password, user.hashed_password)
+        if not valid:
+            return None
+
+        if new_hash:
+            user.hashed_password = new_hash
+            await db.commit()
+        return user
 
     @staticmethod
     async def get_user_by_id(db: AsyncSession, user_id: str) -> Optional[User]:
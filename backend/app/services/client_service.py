@@ -1,12 +1,14 @@
 """Client service."""
 
-from typing import List, Optional, Tuple
+from typing import Optional, Sequence
 
-from sqlalchemy import func, select
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from slugify import slugify
 
 from app.models import Client
+from app.utils.fields import load_columns
+from app.utils.pagination import Page, paginate
 
 
 class ClientService:
@@ -14,12 +16,16 @@ class ClientService:
 
     @staticmethod
     async def get_by_id(
-        db: AsyncSession, client_id: str, agency_id: str
+        db: AsyncSession,
+        client_id: str,
+        agency_id: str,
+        columns: Optional[Sequence[str]] = None,
     ) -> Optional[Client]:
-        """Get a client by ID within an agency."""
-        result = await db.execute(
-            select(Client).where(Client.id == client_id, Client.agency_id == agency_id)
-        )
+        """Get a client by ID within an agency, optionally only some columns."""
+        query = select(Client).where(Client.id == client_id, Client.agency_id == agency_id)
+        if columns:
+            query = query.options(load_columns(Client, columns))
+        result = await db.execute(query)
         return result.scalar_one_or_none()
 
     @staticmethod
@@ -29,24 +35,28 @@ class ClientService:
         page: int = 1,
         per_page: int = 20,
         search: Optional[str] = None,
-    ) -> Tuple[List[Client], int]:
-        """List clients for an agency with pagination."""
+        cursor: Optional[str] = None,
+        count: str = "cached",
+        columns: Optional[Sequence[str]] = None,
+    ) -> Page[Client]:
+        """List clients for an agency, newest first, by cursor or page."""
         query = select(Client).where(Client.agency_id == agency_id)
-        count_query = select(func.count(Client.id)).where(Client.agency_id == agency_id)
+        if columns:
+            query = query.options(load_columns(Client, [*columns, "created_at", "id"]))
 
         if search:
             query = query.where(Client.name.ilike(f"%{search}%"))
-            count_query = count_query.where(Client.name.ilike(f"%{search}%"))
 
-        # Get total count
-        total = await db.scalar(count_query)
-
-        # Get paginated results
-        query = query.offset((page - 1) * per_page).limit(per_page)
-        result = await db.execute(query)
-        clients = result.scalars().all()
-
-        return list(clients), total or 0
+        return await paginate(
+            db,
+            query,
+            order_by=[(Client.created_at, True), (Client.id, True)],
+            limit=per_page,
+            cursor=cursor,
+            page=page,
+            count=count,
+            count_key=("clients", agency_id, search),
+        )
 
     @staticmethod
     async def create(
@@ -1,12 +1,16 @@
 """Document service."""
 
-from typing import List, Optional, Tuple
+from typing import Optional, Sequence
 
-from sqlalchemy import func, select
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from slugify import slugify
 
 from app.models import Document
+from app.services.agency_service import AgencyService
+from app.services.client_service import ClientService
+from app.utils.fields import load_columns
+from app.utils.pagination import Page, paginate
 
 
 class DocumentService:
@@ -14,16 +18,37 @@ class DocumentService:
 
     @staticmethod
     async def get_by_id(
-        db: AsyncSession, document_id: str, agency_id: str
+        db: AsyncSession,
+        document_id: str,
+        agency_id: str,
+        columns: Optional[Sequence[str]] = None,
     ) -> Optional[Document]:
-        """Get a document by ID within an agency."""
-        result = await db.execute(
-            select(Document).where(
-                Document.id == document_id, Document.agency_id == agency_id
-            )
+        """Get a document by ID within an agency, optionally only some columns."""
+        query = select(Document).where(
+            Document.id == document_id, Document.agency_id == agency_id
         )
+        if columns:
+            query = query.options(load_columns(Document, columns))
+        result = await db.execute(query)
         return result.scalar_one_or_none()
 
+    @staticmethod
+    async def get_branding(db: AsyncSession, document: Document) -> dict:
+        """Resolve the branding a document renders with (preview and PDF alike)."""
+        branding = {}
+        agency = await AgencyService.get_by_id(db, document.agency_id)
+        if agency:
+            branding = {
+                "primary_color": agency.primary_color,
+                "secondary_color": agency.secondary_color,
+                "logo_url": agency.logo_url,
+            }
+        client = await ClientService.get_by_id(db, document.client_id, document.agency_id)
+        if client and client.logo_url:
+            branding["client_logo_url"] = client.logo_url
+        options = document.generation_options or {}
+        return {**branding, **(options.get("branding") or {})}
+
     @staticmethod
     async def list_by_agency(
         db: AsyncSession,
@@ -32,31 +57,31 @@ class DocumentService:
         per_page: int = 20,
         client_id: Optional[str] = None,
         status: Optional[str] = None,
-    ) -> Tuple[List[Document], int]:
-        """List documents for an agency with pagination."""
+        cursor: Optional[str] = None,
+        count: str = "cached",
+        columns: Optional[Sequence[str]] = None,
+    ) -> Page[Document]:
+        """List documents for an agency, newest first, by cursor or page."""
         query = select(Document).where(Document.agency_id == agency_id)
-        count_query = select(func.count(Document.id)).where(
-            Document.agency_id == agency_id
-        )
+        if columns:
+            query = query.options(load_columns(Document, [*columns, "created_at", "id"]))
 
         if client_id:
             query = query.where(Document.client_id == client_id)
-            count_query = count_query.where(Document.client_id == client_id)
 
         if status:
             query = query.where(Document.status == status)
-            count_query = count_query.where(Document.status == status)
-
-        # Get total count
-        total = await db.scalar(count_query)
 
-        # Get paginated results
-        query = query.order_by(Document.created_at.desc())
-        query = query.offset((page - 1) * per_page).limit(per_page)
-        result = await db.execute(query)
-        documents = result.scalars().all()
-
-        return list(documents), total or 0
+        return await paginate(
+            db,
+            query,
+            order_by=[(Document.created_at, True), (Document.id, True)],
+            limit=per_page,
+            cursor=cursor,
+            page=page,
+            count=count,
+            count_key=("documents", agency_id, client_id, status),
+        )
 
     @staticmethod
     async def create(
@@ -1,32 +1,64 @@
 """Encryption service for API keys."""
 
 import base64
-import os
+from functools import cached_property, lru_cache
+from typing import List
 
-from cryptography.fernet import Fernet
+from cryptography.fernet import Fernet, MultiFernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 
 from app.config import settings
 
+KDF_SALT = b"content_strategist_salt"  # In production, use a proper salt
+
+
+@lru_cache(maxsize=8)
+def derive_key(secret: str, iterations: int) -> bytes:
+    """
+    Derive a Fernet key from a secret.
+
+    PBKDF2 is deliberately slow, so each secret is derived once per process.
+
+    Args:
+        secret: Secret to derive from.
+        iterations: PBKDF2 iteration count.
+
+    Returns:
+        URL-safe base64-encoded 32-byte key.
+    """
+    kdf = PBKDF2HMAC(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=KDF_SALT,
+        iterations=iterations,
+    )
+    return base64.urlsafe_b64encode(kdf.derive(secret.encode()))
+
 
 class EncryptionService:
-    """Service for encrypting/decrypting sensitive data."""
-
-    def __init__(self):
-        self._fernet = self._create_fernet()
-
-    def _create_fernet(self) -> Fernet:
-        """Create a Fernet instance from the secret key."""
-        # Derive a key from the secret
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=b"content_strategist_salt",  # In production, use a proper salt
-            iterations=100000,
+    """
+    Service for encrypting/decrypting sensitive data.
+
+    Values are encrypted with the key derived from SECRET_KEY. Keys derived
+    from ENCRYPTION_PREVIOUS_KEYS are still accepted for decryption, so the
+    secret can be rotated and stored values re-encrypted with `rotate` over
+    time. Keys are derived on first use, not on construction.
+    """
+
+    def __init__(self, secret: str = None, previous: List[str] = None):
+        self.secret = secret or settings.SECRET_KEY
+        self.previous = list(
+            previous if previous is not None else settings.ENCRYPTION_PREVIOUS_KEYS
+        )
+
+    @cached_property
+    def _fernet(self) -> MultiFernet:
+        """Fernet for the current key, followed by the previous ones."""
+        iterations = settings.ENCRYPTION_KDF_ITERATIONS
+        return MultiFernet(
+            [Fernet(derive_key(secret, iterations)) for secret in [self.secret, *self.previous]]
         )
-        key = base64.urlsafe_b64encode(kdf.derive(settings.SECRET_KEY.encode()))
-        return Fernet(key)
 
     def encrypt(self, plaintext: str) -> str:
         """Encrypt a string."""
@@ -36,6 +68,19 @@ class EncryptionService:
         """Decrypt a string."""
         return self._fernet.decrypt(ciphertext.encode()).decode()
 
+    def rotate(self, ciphertext: str) -> str:
+        """Re-encrypt a value under the current key."""
+        return self._fernet.rotate(ciphertext.encode()).decode()
+
+
+_encryption_service = None
+
 
-# Singleton instance
-encryption_service = EncryptionService()
+def __getattr__(name: str):
+    # The singleton derives its key on first use rather than at import time
+    global _encryption_service
+    if name == "encryption_service":
+        if _encryption_service is None:
+            _encryption_service = EncryptionService()
+        return _encryption_service
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
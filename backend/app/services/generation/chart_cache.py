@@ -0,0 +1,153 @@
+"""Content-addressed cache for rendered chart images."""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import matplotlib
+
+from app.config import settings
+from app.utils.cache import LRUCache
+
+
+class ChartCache:
+    """
+    Two-tier cache of rendered charts keyed by what they look like.
+
+    The key is a hash of the chart type, data, fully resolved style and
+    output format, so a re-render after a text-only edit finds every chart
+    already drawn. Hot entries live in an in-process LRU; all entries are
+    also written to ``CHART_CACHE_PATH``, which is trimmed back to
+    ``CHART_CACHE_MAX_BYTES`` by evicting the least recently used files.
+    """
+
+    # Bump when chart drawing code changes so old images are not reused
+    RENDER_VERSION = 2
+
+    def __init__(
+        self,
+        maxsize: Optional[int] = None,
+        path: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+    ):
+        self.memory = LRUCache(maxsize=maxsize or settings.CHART_CACHE_SIZE)
+        self.path = Path(path or settings.CHART_CACHE_PATH)
+        self.max_bytes = settings.CHART_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self._disk_bytes: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def key(
+        cls,
+        chart_type: str,
+        data: Dict[str, Any],
+        style: Dict[str, Any],
+        output_format: str,
+    ) -> str:
+        """Canonical hash of everything that affects a chart image."""
+        payload = json.dumps(
+            {
+                "type": chart_type,
+                "data": data,
+                "style": style,
+                "format": output_format,
+                "version": cls.RENDER_VERSION,
+                "matplotlib": matplotlib.__version__,
+            },
+            sort_keys=True,
+            default=str,
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Look a chart up in memory, then on disk."""
+        image = self.memory.get(key)
+        if image is not None:
+            return image
+
+        path = self._file(key)
+        try:
+            image = path.read_bytes()
+        except OSError:
+            return None
+
+        # Touch so eviction sees it as recently used
+        os.utime(path)
+        self.memory.set(key, image)
+        return image
+
+    def set(self, key: str, image: bytes) -> None:
+        """Store a chart in both tiers."""
+        self.memory.set(key, image)
+        if self.max_bytes <= 0:
+            return
+
+        path = self._file(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(image)
+            os.replace(tmp_path, path)
+        except OSError:
+            # The disk tier is best-effort; the memory tier still has it
+            return
+
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = self._scan_size()
+            else:
+                self._disk_bytes += len(image)
+            if self._disk_bytes > self.max_bytes:
+                self._evict()
+
+    def clear(self) -> None:
+        """Drop every cached chart."""
+        self.memory.clear()
+        with self._lock:
+            for path in self._files():
+                path.unlink(missing_ok=True)
+            self._disk_bytes = 0
+
+    def _evict(self) -> None:
+        """Delete least recently used files until usage is down to 90% of the budget."""
+        target = int(self.max_bytes * 0.9)
+        entries = []
+        for path in self._files():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+            if total <= target:
+                break
+            path.unlink(missing_ok=True)
+            self.memory.delete(path.stem)
+            total -= size
+        self._disk_bytes = total
+
+    def _scan_size(self) -> int:
+        """Total size of the disk tier."""
+        total = 0
+        for path in self._files():
+            try:
+                total += path.stat().st_size
+            except OSError:
+                continue
+        return total
+
+    def _files(self):
+        """Cached chart files on disk."""
+        if not self.path.is_dir():
+            return []
+        return [path for path in self.path.glob("*/*") if path.suffix == ".chart"]
+
+    def _file(self, key: str) -> Path:
+        """Disk path for a key, fanned out by prefix."""
+        return self.path / key[:2] / f"{key}.chart"
@@ -0,0 +1,368 @@
+"""Chart spec validation and the chart renderer registry."""
+
+import math
+import textwrap
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Tuple
+from xml.sax.saxutils import escape, quoteattr
+
+import numpy as np
+from matplotlib.patches import Circle
+
+from app.services.generation.chart_theme import ChartTheme
+
+
+@dataclass(frozen=True)
+class ChartRenderer:
+    """A registered chart type."""
+
+    name: str
+    draw: Callable
+    engine: str  # "matplotlib": draw(fig, ax, data, style, theme); "svg": draw(data, style, theme) -> str
+    layout: str  # Key into chart_theme.LAYOUTS
+    style_axes: bool
+    required: Tuple[str, ...]
+
+
+RENDERERS: Dict[str, ChartRenderer] = {}
+
+
+def chart_renderer(
+    name: str,
+    engine: str = "matplotlib",
+    layout: str = "bar",
+    style_axes: bool = True,
+    required: Tuple[str, ...] = ("labels", "values"),
+):
+    """
+    Register a chart renderer.
+
+    Args:
+        name: Chart type name used in specs.
+        engine: 'matplotlib' to draw on a themed figure, or 'svg' to return
+            SVG markup directly (for lightweight visuals).
+        layout: Fixed axes layout to draw into (matplotlib only).
+        style_axes: Whether to apply the theme's axes styling afterwards.
+        required: Data keys a spec must provide.
+    """
+    def decorator(draw: Callable) -> Callable:
+        RENDERERS[name] = ChartRenderer(name, draw, engine, layout, style_axes, required)
+        return draw
+    return decorator
+
+
+def get_renderer(chart_type: str) -> ChartRenderer:
+    """Get the renderer for a chart type, defaulting to a bar chart."""
+    return RENDERERS.get(chart_type, RENDERERS["bar"])
+
+
+def validate_spec(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Validate a declarative chart spec and return it in canonical form.
+
+    A spec is plain JSON, so it can be stored in ``content_json["charts"]``
+    and re-rendered later::
+
+        {"type": "grouped_bar", "title": "...",
+         "data": {"labels": [...], "series": [{"name": "...", "values": [...]}]},
+         "style": {"y_label": "..."}}
+
+    Raises:
+        ValueError: If the type is unknown, required data is missing or
+            empty, or values are not finite numbers.
+    """
+    chart_type = spec.get("type")
+    if chart_type not in RENDERERS:
+        raise ValueError(f"Unknown chart type: {chart_type}")
+
+    data = spec.get("data") or {}
+    style = spec.get("style") or {}
+    if not isinstance(data, dict) or not isinstance(style, dict):
+        raise ValueError(f"Chart '{chart_type}' data and style must be objects")
+    missing = [key for key in RENDERERS[chart_type].required if data.get(key) in (None, "", [])]
+    if missing:
+        raise ValueError(f"Chart '{chart_type}' is missing data: {', '.join(missing)}")
+
+    labels = data.get("labels")
+    if labels is not None and not isinstance(labels, list):
+        raise ValueError(f"Chart '{chart_type}' labels must be a list")
+    if "values" in data:
+        _check_numbers(chart_type, "values", data["values"], labels)
+    if "series" in data:
+        if not isinstance(data["series"], list) or not data["series"]:
+            raise ValueError(f"Chart '{chart_type}' series must be a non-empty list")
+        for series in data["series"]:
+            if not isinstance(series, dict):
+                raise ValueError(f"Chart '{chart_type}' series must be objects")
+            _check_numbers(chart_type, "series values", series.get("values"), labels)
+    if chart_type == "line" and "values" not in data and "series" not in data:
+        raise ValueError(f"Chart '{chart_type}' is missing data: values or series")
+    for key in ("width", "height"):
+        if key in style:
+            _check_numbers(chart_type, key, [style[key]])
+
+    return {
+        "type": chart_type,
+        "title": spec.get("title", ""),
+        "data": data,
+        "style": style,
+    }
+
+
+def _check_numbers(chart_type: str, key: str, values: Any, labels: Any = None) -> None:
+    """Check that values are a non-empty list of finite numbers, one per label."""
+    if not isinstance(values, list) or not values:
+        raise ValueError(f"Chart '{chart_type}' {key} must be a non-empty list")
+    for value in values:
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            number = math.nan
+        if isinstance(value, bool) or not math.isfinite(number):
+            raise ValueError(f"Chart '{chart_type}' {key} must be finite numbers, got {value!r}")
+    if labels is not None and len(values) != len(labels):
+        raise ValueError(f"Chart '{chart_type}' has {len(labels)} labels but {len(values)} {key}")
+
+
+def has_data(chart_type: str, data: Dict[str, Any]) -> bool:
+    """Whether chart data is non-empty enough to draw."""
+    if get_renderer(chart_type).engine == "svg":
+        return all(data.get(key) not in (None, "", []) for key in get_renderer(chart_type).required)
+    return bool(data.get("labels")) and bool(data.get("values") or data.get("series"))
+
+
+def _series(data: Dict[str, Any]) -> List[Tuple[str, List[float]]]:
+    """Series of a multi-series chart; plain 'values' is one unnamed series."""
+    if data.get("series"):
+        return [(s.get("name", ""), s.get("values", [])) for s in data["series"]]
+    return [("", data.get("values", []))]
+
+
+def _annotate_bars(ax, bars, labels, theme: ChartTheme, horizontal: bool = False) -> None:
+    """Write a value label at the end of each bar."""
+    for bar, label in zip(bars, labels):
+        if horizontal:
+            xy = (bar.get_x() + bar.get_width(), bar.get_y() + bar.get_height() / 2)
+            offset, ha, va = (3, 0), "left", "center"
+        else:
+            xy = (bar.get_x() + bar.get_width() / 2, bar.get_y() + bar.get_height())
+            offset, ha, va = (0, 3), "center", "bottom"
+        ax.annotate(
+            f"{label}",
+            xy=xy,
+            xytext=offset,
+            textcoords="offset points",
+            ha=ha,
+            va=va,
+            fontproperties=theme.annotation_font,
+            color=theme.text_color,
+        )
+
+
+def _legend(ax, theme: ChartTheme) -> None:
+    ax.legend(frameon=False, prop=theme.annotation_font, labelcolor=theme.text_color)
+
+
+# Matplotlib renderers
+
+
+@chart_renderer("bar")
+def draw_bar(fig, ax, data, style, theme: ChartTheme) -> None:
+    values = data["values"]
+    bars = ax.bar(data["labels"], values, color=theme.colors[:len(values)])
+    ax.set_ylabel(style.get("y_label", "Value"), fontproperties=theme.label_font)
+    _annotate_bars(ax, bars, data.get("display_values") or values, theme)
+
+
+@chart_renderer("horizontal_bar", layout="horizontal_bar")
+def draw_horizontal_bar(fig, ax, data, style, theme: ChartTheme) -> None:
+    values = data["values"]
+    y_pos = np.arange(len(data["labels"]))
+    bars = ax.barh(y_pos, values, color=theme.colors[:len(values)])
+    ax.set_yticks(y_pos)
+    ax.set_yticklabels(data["labels"])
+    ax.set_xlabel(style.get("x_label", "Value"), fontproperties=theme.label_font)
+    _annotate_bars(ax, bars, data.get("display_values") or values, theme, horizontal=True)
+
+
+@chart_renderer("line", required=("labels",))  # 'values' or 'series'
+def draw_line(fig, ax, data, style, theme: ChartTheme) -> None:
+    for index, (name, values) in enumerate(_series(data)):
+        color = theme.colors[index % len(theme.colors)]
+        ax.plot(data["labels"], values, marker="o", color=color, linewidth=2, markersize=8, label=name)
+        if len(data.get("series") or []) <= 1:
+            ax.fill_between(data["labels"], values, alpha=0.3, color=color)
+    ax.set_ylabel(style.get("y_label", "Value"), fontproperties=theme.label_font)
+    ax.grid(True, color=theme.grid_color)
+    if len(data.get("series") or []) > 1:
+        _legend(ax, theme)
+
+
+def _draw_pie(ax, data, theme: ChartTheme, donut: bool) -> None:
+    values = data["values"]
+    ax.pie(
+        values,
+        labels=data["labels"],
+        colors=theme.colors[:len(values)],
+        autopct="%1.1f%%",
+        startangle=90,
+        pctdistance=0.75 if donut else 0.6,
+        textprops={"fontproperties": theme.annotation_font, "color": theme.text_color},
+    )
+    if donut:
+        # Draw center circle for donut effect
+        ax.add_patch(Circle((0, 0), 0.50, fc=theme.background_color))
+
+
+@chart_renderer("pie", layout="pie", style_axes=False)
+def draw_pie(fig, ax, data, style, theme: ChartTheme) -> None:
+    _draw_pie(ax, data, theme, donut=False)
+
+
+@chart_renderer("donut", layout="donut", style_axes=False)
+def draw_donut(fig, ax, data, style, theme: ChartTheme) -> None:
+    _draw_pie(ax, data, theme, donut=True)
+
+
+@chart_renderer("stacked_bar", required=("labels", "series"))
+def draw_stacked_bar(fig, ax, data, style, theme: ChartTheme) -> None:
+    bottom = np.zeros(len(data["labels"]))
+    for index, (name, values) in enumerate(_series(data)):
+        ax.bar(data["labels"], values, bottom=bottom, label=name, color=theme.colors[index % len(theme.colors)])
+        bottom += np.asarray(values, dtype=float)
+    ax.set_ylabel(style.get("y_label", "Value"), fontproperties=theme.label_font)
+    _legend(ax, theme)
+
+
+@chart_renderer("grouped_bar", required=("labels", "series"))
+def draw_grouped_bar(fig, ax, data, style, theme: ChartTheme) -> None:
+    series = _series(data)
+    x = np.arange(len(data["labels"]))
+    width = 0.8 / len(series)
+    for index, (name, values) in enumerate(series):
+        offset = (index - (len(series) - 1) / 2) * width
+        ax.bar(x + offset, values, width, label=name, color=theme.colors[index % len(theme.colors)])
+    ax.set_xticks(x)
+    ax.set_xticklabels(data["labels"])
+    ax.set_ylabel(style.get("y_label", "Value"), fontproperties=theme.label_font)
+    _legend(ax, theme)
+
+
+@chart_renderer("waterfall")
+def draw_waterfall(fig, ax, data, style, theme: ChartTheme) -> None:
+    labels = list(data["labels"])
+    deltas = [float(v) for v in data["values"]]
+    starts = np.concatenate([[0.0], np.cumsum(deltas)[:-1]])
+    bottoms = [start + min(delta, 0) for start, delta in zip(starts, deltas)]
+    heights = [abs(delta) for delta in deltas]
+    colors = [theme.positive_color if delta >= 0 else theme.negative_color for delta in deltas]
+    display = list(data.get("display_values") or [f"{delta:+g}" for delta in deltas])
+
+    if style.get("show_total", True):
+        total = sum(deltas)
+        labels.append(style.get("total_label", "Total"))
+        bottoms.append(min(total, 0))
+        heights.append(abs(total))
+        colors.append(theme.colors[0])
+        display.append(f"{total:g}")
+
+    bars = ax.bar(labels, heights, bottom=bottoms, color=colors)
+    ax.axhline(0, color=theme.grid_color, linewidth=1)
+    ax.set_ylabel(style.get("y_label", "Value"), fontproperties=theme.label_font)
+    _annotate_bars(ax, bars, display, theme)
+
+
+@chart_renderer("comparison", layout="horizontal_bar")
+def draw_comparison(fig, ax, data, style, theme: ChartTheme) -> None:
+    labels = data["labels"][:2]
+    values = [float(v) for v in data["values"][:2]]
+    y_pos = np.arange(len(labels))[::-1]  # First item on top
+    bars = ax.barh(y_pos, values, color=[theme.grid_color, theme.colors[0]][:len(values)])
+    ax.set_yticks(y_pos)
+    ax.set_yticklabels(labels)
+    _annotate_bars(ax, bars, data.get("display_values") or values, theme, horizontal=True)
+
+    if len(values) == 2 and values[0]:
+        change = (values[1] - values[0]) / abs(values[0])
+        ax.text(
+            0.98, 0.02, f"{change:+.0%}",
+            transform=ax.transAxes, ha="right", va="bottom",
+            fontproperties=theme.title_font,
+            color=theme.positive_color if change >= 0 else theme.negative_color,
+        )
+
+
+# SVG renderers
+
+
+# Every interpolated string goes through quoteattr (attributes) or escape
+# (text): specs and brand colors are user data, and previews inline the SVG
+# into HTML.
+
+
+def _svg(width: float, height: float, body: str) -> str:
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width:g}" height="{height:g}" '
+        f'viewBox="0 0 {width:g} {height:g}">{body}</svg>'
+    )
+
+
+def _size(style: Dict[str, Any], default: Tuple[float, float]) -> Tuple[float, float]:
+    return float(style.get("width", default[0])), float(style.get("height", default[1]))
+
+
+def _font_family(theme: ChartTheme) -> str:
+    return quoteattr(", ".join(theme.font_family + ("sans-serif",)))
+
+
+@chart_renderer("sparkline", engine="svg", required=("values",))
+def draw_sparkline(data, style, theme: ChartTheme) -> str:
+    (width, height), pad = _size(style, (240, 60)), 4
+    values = [float(v) for v in data["values"]]
+    low, high = min(values), max(values)
+    span = (high - low) or 1.0
+    step = (width - 2 * pad) / max(len(values) - 1, 1)
+
+    points = [
+        (pad + i * step, height - pad - (value - low) / span * (height - 2 * pad))
+        for i, value in enumerate(values)
+    ]
+    path = " ".join(f"{x:.1f},{y:.1f}" for x, y in points)
+    color = quoteattr(theme.colors[0])
+    last_x, last_y = points[-1]
+    return _svg(width, height, (
+        f'<polyline fill="none" stroke={color} stroke-width="2" '
+        f'stroke-linejoin="round" stroke-linecap="round" points="{path}"/>'
+        f'<circle cx="{last_x:.1f}" cy="{last_y:.1f}" r="3" fill={color}/>'
+    ))
+
+
+@chart_renderer("kpi", engine="svg", required=("value",))
+def draw_kpi(data, style, theme: ChartTheme) -> str:
+    width, height = _size(style, (260, 140))
+    font = _font_family(theme)
+    lines = textwrap.wrap(str(data.get("label", "")), 34)[:2]
+
+    body = [
+        f'<rect width="{width:g}" height="{height:g}" rx="8" fill={quoteattr(theme.colors[0])}/>',
+        f'<text x="20" y="58" font-family={font} font-size="36" font-weight="700" '
+        f'fill={quoteattr(theme.colors[1])}>{escape(str(data["value"]))}</text>',
+    ]
+    if data.get("delta"):
+        delta = str(data["delta"])
+        color = theme.negative_color if delta.lstrip().startswith(("-", "−")) else theme.positive_color
+        body.append(
+            f'<text x="{width - 20:g}" y="58" text-anchor="end" font-family={font} '
+            f'font-size="14" font-weight="600" fill={quoteattr(color)}>{escape(delta)}</text>'
+        )
+    for index, line in enumerate(lines):
+        body.append(
+            f'<text x="20" y="{86 + index * 18}" font-family={font} font-size="13" '
+            f'fill="#ffffff">{escape(line)}</text>'
+        )
+    if data.get("source"):
+        body.append(
+            f'<text x="20" y="{height - 12:g}" font-family={font} font-size="10" '
+            f'fill="#ffffff" fill-opacity="0.7">{escape("Source: " + str(data["source"]))}</text>'
+        )
+    return _svg(width, height, "".join(body))
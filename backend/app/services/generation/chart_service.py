@@ -1,154 +1,238 @@
 """Chart generation service."""
 
+import asyncio
 import io
 import json
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import replace
 from typing import Dict, Any, List, Optional
 
 import matplotlib
-matplotlib.use('Agg')  # Use non-interactive backend
-import matplotlib.pyplot as plt
-import numpy as np
+import structlog
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from PIL import Image
 
 from app.config import settings
+from app.services.generation.chart_cache import ChartCache
+from app.services.generation.chart_renderers import RENDERERS, get_renderer, has_data, validate_spec
+from app.services.generation.chart_theme import DEFAULT_COLORS, LAYOUTS, TITLE_Y, ChartTheme
+from app.utils.values import display_value, parse_values
 
+logger = structlog.get_logger()
 
 class ChartService:
-    """Service for generating data visualization charts."""
+    """
+    Service for generating data visualization charts.
+
+    Charts are drawn with matplotlib's object API (``Figure`` plus an Agg
+    canvas) and never touch ``pyplot``'s global figure state, so any number
+    of charts can render at once on the shared chart pool. Rendered images
+    are cached by content, so unchanged charts are never redrawn.
+
+    Chart types come from the renderer registry in ``chart_renderers``.
+    Lightweight types (KPI tiles, sparklines) are written directly as SVG
+    without matplotlib and always render as SVG.
+    """
 
     # Default brand colors
-    DEFAULT_COLORS = [
-        "#1a4a6e",  # Primary blue
-        "#b8860b",  # Secondary gold
-        "#2980b9",  # Tertiary blue
-        "#27ae60",  # Success green
-        "#e74c3c",  # Alert red
-        "#9b59b6",  # Purple
-        "#f39c12",  # Orange
-        "#1abc9c",  # Teal
-    ]
-
-    def __init__(self):
-        self.colors = self.DEFAULT_COLORS
+    DEFAULT_COLORS = list(DEFAULT_COLORS)
+
+    # Supported output formats
+    OUTPUT_FORMATS = ("svg", "png")
+
+    _executor: Optional[Executor] = None
+    _cache: Optional[ChartCache] = None
+
+    @classmethod
+    def executor(cls) -> Executor:
+        """The process-wide chart rendering pool, created on first use."""
+        if cls._executor is None:
+            if settings.CHART_RENDER_EXECUTOR == "process":
+                cls._executor = ProcessPoolExecutor(max_workers=settings.CHART_RENDER_WORKERS)
+            else:
+                cls._executor = ThreadPoolExecutor(
+                    max_workers=settings.CHART_RENDER_WORKERS,
+                    thread_name_prefix="chart-render",
+                )
+        return cls._executor
+
+    @classmethod
+    def cache(cls) -> ChartCache:
+        """The process-wide chart image cache, created on first use."""
+        if cls._cache is None:
+            cls._cache = ChartCache()
+        return cls._cache
+
+    @staticmethod
+    def chart_types() -> List[str]:
+        """All registered chart types."""
+        return sorted(RENDERERS)
+
+    @staticmethod
+    def output_format_for(chart_type: str, output_format: str) -> str:
+        """The format a chart type actually renders to for a requested format."""
+        return "svg" if get_renderer(chart_type).engine == "svg" else output_format
 
     async def generate_chart(
         self,
         chart_type: str,
         data: Dict[str, Any],
         style: Optional[Dict[str, Any]] = None,
+        output_format: str = "svg",
     ) -> bytes:
         """
         Generate a chart image.
 
         Args:
-            chart_type: Type of chart ('bar', 'line', 'pie', 'donut', 'horizontal_bar').
-            data: Chart data with 'labels' and 'values' keys.
-            style: Style options (colors, fonts, etc.).
+            chart_type: A registered chart type (see :meth:`chart_types`).
+            data: Chart data, e.g. 'labels' and 'values' or 'series'.
+            style: Style options (title, labels, figsize). 'branding' selects
+                the brand theme; 'colors' and 'font_size' override it.
+            output_format: 'svg' (vector, default) or 'png' (compact palette PNG).
+
+        Returns:
+            Chart image bytes, in the format given by :meth:`output_format_for`.
+        """
+        if output_format not in self.OUTPUT_FORMATS:
+            raise ValueError(f"Unsupported chart output format: {output_format}")
+
+        style = dict(style or {})
+        theme = ChartTheme.for_brand(style.pop("branding", None))
+        if "colors" in style:
+            theme = replace(theme, colors=tuple(style.pop("colors")))
+        if "font_size" in style:
+            theme = replace(theme, font_size=style.pop("font_size"))
+
+        cache = self.cache()
+        key = ChartCache.key(chart_type, data, {**style, "theme": theme.key}, output_format)
+        image = cache.get(key)
+        if image is not None:
+            return image
+
+        if get_renderer(chart_type).engine == "svg":
+            # Plain string building; not worth a trip through the pool
+            image = self.render_chart(chart_type, data, style, output_format, theme)
+            cache.set(key, image)
+            return image
+
+        loop = asyncio.get_running_loop()
+        image = await loop.run_in_executor(
+            self.executor(),
+            self.render_chart,
+            chart_type,
+            data,
+            style,
+            output_format,
+            theme,
+        )
+        cache.set(key, image)
+        return image
+
+    async def generate_charts_batch(
+        self,
+        charts: List[Dict[str, Any]],
+        output_format: str = "svg",
+    ) -> List[Optional[bytes]]:
+        """
+        Render several charts concurrently on the chart pool.
+
+        A chart whose spec is invalid or whose render fails is logged and
+        comes back as None, so one bad chart never fails the whole document.
+
+        Args:
+            charts: Chart specs with 'type', 'data' and optional 'style'
+                (see :func:`chart_renderers.validate_spec`).
+            output_format: Output format for every chart.
 
         Returns:
-            Chart image as PNG bytes.
+            Chart image bytes (or None), in the same order as ``charts``.
         """
-        style = style or {}
-        colors = style.get("colors", self.colors)
+        async def render(chart: Dict[str, Any]) -> Optional[bytes]:
+            try:
+                spec = validate_spec(chart)
+                return await self.generate_chart(
+                    chart_type=spec["type"],
+                    data=spec["data"],
+                    style={"title": spec["title"], **spec["style"]},
+                    output_format=output_format,
+                )
+            except Exception as e:
+                logger.warning("chart_render_failed", chart_type=chart.get("type"), error=str(e))
+                return None
+
+        return list(await asyncio.gather(*(render(chart) for chart in charts)))
+
+    @staticmethod
+    def render_chart(
+        chart_type: str,
+        data: Dict[str, Any],
+        style: Dict[str, Any],
+        output_format: str,
+        theme: Optional[ChartTheme] = None,
+    ) -> bytes:
+        """Render one chart synchronously. Safe to call from any thread or process."""
+        theme = theme or ChartTheme.for_brand()
         title = style.get("title", "")
-        figsize = style.get("figsize", (10, 6))
-        font_size = style.get("font_size", 12)
+        renderer = get_renderer(chart_type)
+
+        if renderer.engine == "svg":
+            return renderer.draw(data, style, theme).encode("utf-8")
 
-        labels = data.get("labels", [])
-        values = data.get("values", [])
+        fig = Figure(figsize=style.get("figsize", (10, 6)), facecolor=theme.background_color)
+        FigureCanvasAgg(fig)
 
-        if not labels or not values:
+        if not has_data(chart_type, data):
             # Return a placeholder if no data
-            fig, ax = plt.subplots(figsize=figsize)
-            ax.text(0.5, 0.5, "No data available", ha="center", va="center", fontsize=font_size)
+            ax = fig.add_axes(LAYOUTS["placeholder"])
+            ax.text(
+                0.5, 0.5, "No data available",
+                ha="center", va="center",
+                fontproperties=theme.label_font, color=theme.text_color,
+            )
             ax.axis("off")
         else:
-            fig, ax = plt.subplots(figsize=figsize)
-
-            if chart_type == "bar":
-                bars = ax.bar(labels, values, color=colors[:len(values)])
-                ax.set_ylabel(style.get("y_label", "Value"))
-                # Add value labels on bars
-                for bar, val in zip(bars, values):
-                    height = bar.get_height()
-                    ax.annotate(
-                        f"{val}",
-                        xy=(bar.get_x() + bar.get_width() / 2, height),
-                        xytext=(0, 3),
-                        textcoords="offset points",
-                        ha="center",
-                        va="bottom",
-                        fontsize=font_size - 2,
-                    )
-
-            elif chart_type == "horizontal_bar":
-                y_pos = np.arange(len(labels))
-                bars = ax.barh(y_pos, values, color=colors[:len(values)])
-                ax.set_yticks(y_pos)
-                ax.set_yticklabels(labels)
-                ax.set_xlabel(style.get("x_label", "Value"))
-                # Add value labels
-                for bar, val in zip(bars, values):
-                    width = bar.get_width()
-                    ax.annotate(
-                        f"{val}",
-                        xy=(width, bar.get_y() + bar.get_height() / 2),
-                        xytext=(3, 0),
-                        textcoords="offset points",
-                        ha="left",
-                        va="center",
-                        fontsize=font_size - 2,
-                    )
-
-            elif chart_type == "line":
-                ax.plot(labels, values, marker="o", color=colors[0], linewidth=2, markersize=8)
-                ax.fill_between(labels, values, alpha=0.3, color=colors[0])
-                ax.set_ylabel(style.get("y_label", "Value"))
-                ax.grid(True, alpha=0.3)
-
-            elif chart_type == "pie":
-                wedges, texts, autotexts = ax.pie(
-                    values,
-                    labels=labels,
-                    colors=colors[:len(values)],
-                    autopct="%1.1f%%",
-                    startangle=90,
-                )
-                for autotext in autotexts:
-                    autotext.set_fontsize(font_size - 2)
-
-            elif chart_type == "donut":
-                wedges, texts, autotexts = ax.pie(
-                    values,
-                    labels=labels,
-                    colors=colors[:len(values)],
-                    autopct="%1.1f%%",
-                    startangle=90,
-                    pctdistance=0.75,
-                )
-                # Draw center circle for donut effect
-                center_circle = plt.Circle((0, 0), 0.50, fc="white")
-                ax.add_patch(center_circle)
-                for autotext in autotexts:
-                    autotext.set_fontsize(font_size - 2)
-
-            else:
-                # Default to bar chart
-                ax.bar(labels, values, color=colors[:len(values)])
+            ax = fig.add_axes(LAYOUTS[renderer.layout])
+            renderer.draw(fig, ax, data, style, theme)
+            if renderer.style_axes:
+                theme.style_axes(ax)
 
             if title:
-                ax.set_title(title, fontsize=font_size + 2, fontweight="bold", pad=20)
-
-        # Adjust layout
-        plt.tight_layout()
+                fig.text(
+                    0.5, TITLE_Y, title,
+                    ha="center", va="top",
+                    fontproperties=theme.title_font, color=theme.text_color,
+                )
 
-        # Save to bytes
+        # Save to bytes; the layout is fixed, so no tight bbox pass is needed
         buf = io.BytesIO()
-        fig.savefig(buf, format="png", dpi=150, bbox_inches="tight", facecolor="white")
-        buf.seek(0)
-        plt.close(fig)
+        if output_format == "svg":
+            # Stable element ids in SVG output. Set here, not at import: it is
+            # process-wide, and the same value for every render, so concurrent
+            # renders cannot race on it.
+            matplotlib.rcParams["svg.hashsalt"] = "paper"
+            fig.savefig(
+                buf,
+                format="svg",
+                facecolor=theme.background_color,
+                metadata={"Date": None},  # Keep output deterministic
+            )
+        else:
+            fig.savefig(buf, format="png", dpi=theme.dpi, facecolor=theme.background_color)
 
+        if output_format == "png":
+            return ChartService._compact_png(buf.getvalue())
         return buf.getvalue()
 
+    @staticmethod
+    def _compact_png(png_bytes: bytes) -> bytes:
+        """Re-encode a chart PNG as an optimized 256-color palette image."""
+        with Image.open(io.BytesIO(png_bytes)) as image:
+            compact = image.convert("RGB").quantize(colors=256)
+            out = io.BytesIO()
+            compact.save(out, format="PNG", optimize=True)
+        return out.getvalue()
+
     async def suggest_visualizations(
         self,
         statistics: List[Dict[str, Any]],
@@ -163,81 +247,74 @@ class ChartService:
             Suggested visualization configurations.
         """
         suggestions = []
+        parsed_values = parse_values(stat.get("value") for stat in statistics)
 
         # Group statistics by category
         categories = {}
-        for stat in statistics:
+        for stat, parsed in zip(statistics, parsed_values):
             cat = stat.get("category", "general")
             if cat not in categories:
                 categories[cat] = []
-            categories[cat].append(stat)
+            categories[cat].append((stat, parsed))
 
         # Generate suggestions based on data characteristics
         for category, stats in categories.items():
             if len(stats) >= 3:
-                # Multiple stats - good for comparison charts
-                numeric_values = []
-                labels = []
-                for stat in stats[:6]:  # Limit to 6 for readability
-                    value = stat.get("value", "")
-                    # Try to extract numeric value
-                    try:
-                        if "%" in str(value):
-                            num_val = float(str(value).replace("%", "").replace(",", ""))
-                        elif "$" in str(value):
-                            num_val = float(str(value).replace("$", "").replace(",", ""))
-                        else:
-                            num_val = float(str(value).replace(",", ""))
-                        numeric_values.append(num_val)
-                        labels.append(stat.get("context", "")[:30])
-                    except (ValueError, TypeError):
-                        continue
-
-                if len(numeric_values) >= 2:
+                # Multiple stats - good for comparison charts. Only values in
+                # the same unit are comparable, so chart the largest such group.
+                groups = {}
+                for stat, parsed in stats:
+                    if parsed is not None:
+                        groups.setdefault((parsed.kind, parsed.unit), []).append((stat, parsed))
+                comparable = max(groups.values(), key=len, default=[])[:6]  # Limit to 6 for readability
+
+                if len(comparable) >= 2:
                     suggestions.append({
                         "type": "horizontal_bar",
                         "title": f"{category.title()} Comparison",
                         "data": {
-                            "labels": labels,
-                            "values": numeric_values,
+                            "labels": [stat.get("context", "")[:30] for stat, _ in comparable],
+                            "values": [parsed.value for _, parsed in comparable],
+                            "display_values": [
+                                display_value(stat.get("value"), parsed) for stat, parsed in comparable
+                            ],
                         },
-                        "description": f"Compare {len(numeric_values)} {category} metrics",
-                        "priority": "high" if len(numeric_values) >= 4 else "medium",
+                        "description": f"Compare {len(comparable)} {category} metrics",
+                        "priority": "high" if len(comparable) >= 4 else "medium",
                     })
 
-            # Single impactful stat - good for callout
-            for stat in stats:
+            # Single impactful stat - good for a KPI tile
+            for stat, parsed in stats:
                 if stat.get("highlight_worthy"):
                     suggestions.append({
-                        "type": "callout",
-                        "title": "Key Statistic",
-                        "data": stat,
+                        "type": "kpi",
+                        "title": "",
+                        "data": {
+                            "value": display_value(stat.get("value", ""), parsed),
+                            "label": stat.get("context", ""),
+                            "source": stat.get("source", ""),
+                        },
                         "description": "Highlight this important metric",
                         "priority": "high",
                     })
-                    break  # Only one callout per category
+                    break  # Only one KPI per category
 
         # If we have percentage data, suggest a pie chart
-        percentage_stats = [
-            s for s in statistics
-            if "%" in str(s.get("value", ""))
-        ]
-        if len(percentage_stats) >= 2:
-            labels = []
-            values = []
-            for stat in percentage_stats[:5]:
-                try:
-                    val = float(str(stat["value"]).replace("%", ""))
-                    values.append(val)
-                    labels.append(stat.get("context", "")[:20])
-                except (ValueError, TypeError):
-                    continue
-
-            if values and sum(values) <= 100:
+        percentages = [
+            (stat, parsed)
+            for stat, parsed in zip(statistics, parsed_values)
+            if parsed is not None and parsed.kind == "percentage"
+        ][:5]
+        if len(percentages) >= 2:
+            values = [parsed.magnitude for _, parsed in percentages]
+            if sum(values) <= 100:
                 suggestions.append({
                     "type": "pie",
                     "title": "Distribution",
-                    "data": {"labels": labels, "values": values},
+                    "data": {
+                        "labels": [stat.get("context", "")[:20] for stat, _ in percentages],
+                        "values": values,
+                    },
                     "description": "Show percentage distribution",
                     "priority": "medium",
                 })
@@ -0,0 +1,159 @@
+"""Precompiled chart themes and fixed figure layouts."""
+
+import re
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+from matplotlib.font_manager import FontProperties, fontManager
+
+from app.services.render_resources import FontRegistry
+
+
+DEFAULT_COLORS = (
+    "#1a4a6e",  # Primary blue
+    "#b8860b",  # Secondary gold
+    "#2980b9",  # Tertiary blue
+    "#27ae60",  # Success green
+    "#e74c3c",  # Alert red
+    "#9b59b6",  # Purple
+    "#f39c12",  # Orange
+    "#1abc9c",  # Teal
+)
+
+# Axes boxes (left, bottom, width, height) in figure fractions per chart type.
+# Fixed boxes replace tight_layout/bbox_inches="tight", which lay the figure
+# out a second time on every render.
+LAYOUTS = {
+    "bar": (0.08, 0.12, 0.88, 0.72),
+    "line": (0.08, 0.12, 0.88, 0.72),
+    "horizontal_bar": (0.30, 0.08, 0.64, 0.76),
+    "pie": (0.20, 0.04, 0.60, 0.80),
+    "donut": (0.20, 0.04, 0.60, 0.80),
+    "placeholder": (0.0, 0.0, 1.0, 1.0),
+}
+
+# Baseline of the chart title, in figure fractions
+TITLE_Y = 0.95
+
+HEX_COLOR = re.compile(r"#(?:[0-9a-fA-F]{3}){1,2}")
+
+
+def brand_color(value: Any) -> Optional[str]:
+    """A brand color if it is a #rgb/#rrggbb hex color, else None."""
+    if isinstance(value, str) and HEX_COLOR.fullmatch(value):
+        return value
+    return None
+
+
+@dataclass(frozen=True)
+class ChartTheme:
+    """
+    Colors and fonts for one brand, resolved once and shared by all renders.
+
+    Themes are applied as explicit artist properties rather than through
+    ``rcParams``, which is process-global and would leak between charts
+    rendering concurrently on the chart pool.
+    """
+
+    colors: Tuple[str, ...] = DEFAULT_COLORS
+    font_family: Tuple[str, ...] = ("DejaVu Sans",)
+    font_size: int = 12
+    text_color: str = "#333333"
+    grid_color: str = "#dddddd"
+    background_color: str = "#ffffff"
+    positive_color: str = "#27ae60"
+    negative_color: str = "#e74c3c"
+    dpi: int = 150
+
+    @classmethod
+    def for_brand(cls, branding: Optional[Dict[str, Any]] = None) -> "ChartTheme":
+        """Get the (cached) theme for a branding configuration."""
+        branding = branding or {}
+        # Colors end up in SVG attributes, so anything but a hex color is dropped
+        font_family = branding.get("font_family")
+        return _theme_for(
+            brand_color(branding.get("primary_color")),
+            brand_color(branding.get("secondary_color")),
+            brand_color(branding.get("accent_color")),
+            brand_color(branding.get("text_color")),
+            font_family if isinstance(font_family, str) else None,
+        )
+
+    @property
+    def key(self) -> Dict[str, Any]:
+        """Everything that affects rendered output, for cache keys."""
+        return {
+            "colors": list(self.colors),
+            "font_family": list(self.font_family),
+            "font_size": self.font_size,
+            "text_color": self.text_color,
+            "grid_color": self.grid_color,
+            "background_color": self.background_color,
+            "positive_color": self.positive_color,
+            "negative_color": self.negative_color,
+            "dpi": self.dpi,
+        }
+
+    @cached_property
+    def title_font(self) -> FontProperties:
+        return FontProperties(family=list(self.font_family), size=self.font_size + 2, weight="bold")
+
+    @cached_property
+    def label_font(self) -> FontProperties:
+        return FontProperties(family=list(self.font_family), size=self.font_size)
+
+    @cached_property
+    def annotation_font(self) -> FontProperties:
+        return FontProperties(family=list(self.font_family), size=self.font_size - 2)
+
+    def style_axes(self, ax) -> None:
+        """Apply the theme's text, tick and spine styling to an axes."""
+        ax.set_facecolor(self.background_color)
+        for spine in ("top", "right"):
+            ax.spines[spine].set_visible(False)
+        for spine in ("left", "bottom"):
+            ax.spines[spine].set_color(self.grid_color)
+        ax.tick_params(colors=self.text_color, labelsize=self.font_size - 2)
+        for label in ax.get_xticklabels() + ax.get_yticklabels():
+            label.set_fontproperties(self.annotation_font)
+        ax.xaxis.label.set_color(self.text_color)
+        ax.yaxis.label.set_color(self.text_color)
+
+
+@lru_cache(maxsize=1)
+def _available_families() -> frozenset:
+    """Font families matplotlib can use, including the bundled PDF fonts."""
+    for face in FontRegistry.font_faces():
+        if face["src"].endswith((".ttf", ".otf")):
+            fontManager.addfont(face["src"].removeprefix("file://"))
+    return frozenset(font.name for font in fontManager.ttflist)
+
+
+@lru_cache(maxsize=256)
+def _theme_for(
+    primary: Optional[str],
+    secondary: Optional[str],
+    accent: Optional[str],
+    text_color: Optional[str],
+    font_family: Optional[str],
+) -> ChartTheme:
+    """Build a theme; cached so each brand is resolved once per process."""
+    brand_colors = [c for c in (primary, secondary, accent) if c]
+    colors = tuple(dict.fromkeys([*brand_colors, *DEFAULT_COLORS]))
+
+    families = ()
+    if font_family:
+        # CSS font stacks: keep installed families, so matplotlib never has
+        # to search (and warn) for missing ones on every text element
+        available = _available_families()
+        families = tuple(
+            name for name in (part.strip().strip("'\"") for part in font_family.split(","))
+            if name in available
+        )
+
+    return ChartTheme(
+        colors=colors,
+        font_family=tuple(dict.fromkeys([*families, "DejaVu Sans"])),
+        text_color=text_color or ChartTheme.text_color,
+    )
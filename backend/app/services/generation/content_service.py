@@ -3,20 +3,14 @@
 import json
 from typing import Dict, Any, List, Optional
 
-from openai import OpenAI
-
-from app.config import settings
+from app.services.generation.llm_pool import LLMClient, LLMClientPool
 
 
 class ContentService:
     """Service for generating written content."""
 
-    def __init__(self):
-        self.client = OpenAI(
-            api_key=settings.OPENROUTER_API_KEY,
-            base_url=settings.OPENROUTER_BASE_URL,
-        )
-        self.model = settings.OPENROUTER_MODEL
+    def __init__(self, llm: Optional[LLMClient] = None):
+        self.llm = llm or LLMClientPool.default()
 
     async def generate_section(
         self,
@@ -81,14 +75,9 @@ Write the content for this section. Requirements:
 
 Write compelling, professional content:"""
 
-        response = self.client.chat.completions.create(
-            model=self.model,
+        response = await self.llm.create(
             max_tokens=word_count * 2,  # Allow some buffer
             messages=[{"role": "user", "content": prompt}],
-            extra_headers={
-                "HTTP-Referer": "https://paper.aiconnected.com",
-                "X-Title": "Paper by aiConnected",
-            },
         )
 
         return response.choices[0].message.content
@@ -0,0 +1,291 @@
+"""Pool of LLM API clients, keyed by credential."""
+
+import asyncio
+import hashlib
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Set
+
+import structlog
+from openai import AsyncOpenAI
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models import Agency, APIKey, Plan
+from app.services.api_key_service import APIKeyService
+from app.utils.cache import LRUCache
+
+logger = structlog.get_logger()
+
+# BYOK services in order of preference: service -> base URL
+BYOK_PROVIDERS = {
+    "openrouter": settings.OPENROUTER_BASE_URL,
+    "anthropic": "https://api.anthropic.com/v1/",
+}
+
+# OpenRouter model names -> Anthropic API model IDs, for BYOK Anthropic keys
+ANTHROPIC_MODELS = {
+    "anthropic/claude-3.5-haiku": "claude-3-5-haiku-20241022",
+    "anthropic/claude-3.7-sonnet": "claude-3-7-sonnet-20250219",
+    "anthropic/claude-sonnet-4": "claude-sonnet-4-20250514",
+    "anthropic/claude-sonnet-4.5": "claude-sonnet-4-5-20250929",
+    "anthropic/claude-haiku-4.5": "claude-haiku-4-5-20251001",
+    "anthropic/claude-opus-4": "claude-opus-4-20250514",
+    "anthropic/claude-opus-4.1": "claude-opus-4-1-20250805",
+}
+
+EXTRA_HEADERS = {
+    "HTTP-Referer": "https://paper.aiconnected.com",
+    "X-Title": "Paper by aiConnected",
+}
+
+# Close tasks of evicted clients, referenced so they are not garbage collected
+_closing: Set["asyncio.Task"] = set()
+
+
+def byok_model(service: str) -> Optional[str]:
+    """
+    The model name to request from a BYOK service.
+
+    Args:
+        service: BYOK service name.
+
+    Returns:
+        The model name, or None if the configured model is not available
+        on that service.
+    """
+    if service == "anthropic":
+        return settings.ANTHROPIC_MODEL or ANTHROPIC_MODELS.get(settings.OPENROUTER_MODEL)
+    return settings.OPENROUTER_MODEL
+
+
+class LLMClient:
+    """
+    A pooled API client with its own concurrency limit.
+
+    Completions for one credential never exceed `max_concurrency` in flight
+    per process, so a busy agency on its own key cannot starve others.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str,
+        model: str,
+        max_concurrency: int,
+        key_id: Optional[str] = None,
+    ):
+        self._api_key = api_key
+        self._base_url = base_url
+        self.client = self._connect()
+        self.model = model
+        self.key_id = key_id
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self._in_flight = 0
+        self._retired = False
+
+    def _connect(self) -> AsyncOpenAI:
+        return AsyncOpenAI(
+            api_key=self._api_key,
+            base_url=self._base_url,
+            timeout=settings.LLM_REQUEST_TIMEOUT,
+            max_retries=2,
+        )
+
+    @property
+    def is_byok(self) -> bool:
+        """Whether this client uses an agency's own key."""
+        return self.key_id is not None
+
+    async def create(self, **kwargs) -> Any:
+        """
+        Create a chat completion.
+
+        Args:
+            **kwargs: Arguments for `chat.completions.create`; `model` and
+                the attribution headers default to this client's.
+
+        Returns:
+            The completion response.
+        """
+        kwargs.setdefault("model", self.model)
+        kwargs.setdefault("extra_headers", EXTRA_HEADERS)
+        self._in_flight += 1
+        try:
+            async with self.semaphore:
+                if self.client.is_closed():
+                    # Retired while a caller still held on to it
+                    self.client = self._connect()
+                response = await self.client.chat.completions.create(**kwargs)
+        finally:
+            self._in_flight -= 1
+            await self._close_if_idle()
+        if self.key_id:
+            LLMClientPool.record_usage(self.key_id)
+        return response
+
+    def retire(self) -> None:
+        """
+        Close the client once its in-flight requests finish.
+
+        Called when the client is evicted from the pool, so its connection
+        pool is released instead of lingering until garbage collection.
+        """
+        self._retired = True
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # No loop: no connections were opened from this thread
+        task = loop.create_task(self._close_if_idle())
+        _closing.add(task)
+        task.add_done_callback(_closing.discard)
+
+    async def _close_if_idle(self) -> None:
+        # Otherwise the last in-flight request closes it
+        if self._retired and not self._in_flight and not self.client.is_closed():
+            await self.client.close()
+
+
+def _retire_client(fingerprint: str, client: LLMClient) -> None:
+    client.retire()
+
+
+class LLMClientPool:
+    """
+    Process-wide pool of LLM clients.
+
+    Clients (and their keep-alive HTTP connections) are kept in a bounded
+    LRU keyed by a fingerprint of the credential, so every job of an agency
+    reuses one warmed client. Agencies whose plan allows BYOK and who stored
+    a key for a supported service get a client on that key; everyone else
+    shares the platform client. `last_used_at` of BYOK keys is buffered in
+    memory and written by `flush_usage`.
+    """
+
+    _clients = LRUCache(maxsize=settings.LLM_CLIENT_POOL_SIZE, on_evict=_retire_client)
+    _usage: Dict[str, datetime] = {}
+
+    @classmethod
+    def get(
+        cls,
+        api_key: str,
+        base_url: str = None,
+        model: str = None,
+        key_id: Optional[str] = None,
+    ) -> LLMClient:
+        """
+        Get the pooled client for a credential, creating it on first use.
+
+        Args:
+            api_key: Provider API key.
+            base_url: Provider base URL.
+            model: Default model name.
+            key_id: ID of the agency's APIKey, if BYOK.
+
+        Returns:
+            The pooled client.
+        """
+        base_url = base_url or settings.OPENROUTER_BASE_URL
+        fingerprint = hashlib.sha256(f"{base_url}\0{api_key}".encode()).hexdigest()
+        client = cls._clients.get(fingerprint)
+        if client is None:
+            client = LLMClient(
+                api_key=api_key,
+                base_url=base_url,
+                model=model or settings.OPENROUTER_MODEL,
+                max_concurrency=(
+                    settings.LLM_BYOK_CONCURRENCY if key_id else settings.LLM_PLATFORM_CONCURRENCY
+                ),
+                key_id=key_id,
+            )
+            cls._clients.set(fingerprint, client)
+        return client
+
+    @classmethod
+    def default(cls) -> LLMClient:
+        """The shared platform client."""
+        return cls.get(settings.OPENROUTER_API_KEY)
+
+    @classmethod
+    async def for_agency(cls, db: Optional[AsyncSession], agency_id: Optional[str]) -> LLMClient:
+        """
+        Get the client to use for an agency's generation jobs.
+
+        Args:
+            db: Database session.
+            agency_id: Agency ID.
+
+        Returns:
+            A client on the agency's own key if allowed and configured,
+            otherwise the platform client.
+        """
+        if db is None or agency_id is None:
+            return cls.default()
+
+        byok_enabled = await db.scalar(
+            select(Plan.byok_enabled)
+            .join(Agency, Agency.plan_id == Plan.id)
+            .where(Agency.id == agency_id)
+        )
+        if not byok_enabled:
+            return cls.default()
+
+        credentials = await APIKeyService.get_credentials(db, agency_id)
+        for service, base_url in BYOK_PROVIDERS.items():
+            credential = credentials.get(service)
+            if credential is None:
+                continue
+            model = byok_model(service)
+            if model is None:
+                logger.warning(
+                    "byok_model_unavailable",
+                    service=service,
+                    model=settings.OPENROUTER_MODEL,
+                )
+                continue
+            return cls.get(credential.secret, base_url, model, key_id=credential.id)
+
+        return cls.default()
+
+    @classmethod
+    def record_usage(cls, key_id: str) -> None:
+        """Note that a key was used; written on the next flush."""
+        cls._usage[key_id] = datetime.now(timezone.utc)
+
+    @classmethod
+    async def flush_usage(cls, db: AsyncSession) -> int:
+        """
+        Write buffered `last_used_at` timestamps in one statement.
+
+        Args:
+            db: Database session.
+
+        Returns:
+            Number of keys updated.
+        """
+        if not cls._usage:
+            return 0
+
+        usage, cls._usage = cls._usage, {}
+        try:
+            table = APIKey.__table__
+            await db.execute(
+                update(table)
+                .where(table.c.id == bindparam("key_id"))
+                .values(last_used_at=bindparam("used_at")),
+                [{"key_id": key_id, "used_at": used_at} for key_id, used_at in usage.items()],
+            )
+            await db.commit()
+        except Exception as e:
+            # Usage timestamps are informational; keep them for the next flush
+            for key_id, used_at in usage.items():
+                cls._usage.setdefault(key_id, used_at)
+            logger.warning("llm_usage_flush_failed", error=str(e))
+            return 0
+        return len(usage)
+
+    @classmethod
+    def reset(cls) -> None:
+        """Drop all clients, e.g. after a fork (their connections are not shareable)."""
+        cls._clients.clear()
+        cls._usage = {}
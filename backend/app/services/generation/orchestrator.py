@@ -6,13 +6,17 @@ from typing import Dict, Any, Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
 from app.models import Document, GenerationJob
 from app.services.generation.research_service import ResearchService
 from app.services.generation.outline_service import OutlineService
 from app.services.generation.content_service import ContentService
 from app.services.generation.statistics_service import StatisticsService
 from app.services.generation.chart_service import ChartService
+from app.services.generation.chart_renderers import validate_spec
+from app.services.generation.llm_pool import LLMClient, LLMClientPool
 from app.services.pdf_service import PDFService
+from app.services.pdf_optimizer import PDFOptimizer
 
 
 class GenerationOrchestrator:
@@ -38,6 +42,17 @@ class GenerationOrchestrator:
         self.statistics_service = StatisticsService()
         self.chart_service = ChartService()
         self.pdf_service = PDFService()
+        self.pdf_optimizer = PDFOptimizer()
+
+    def use_llm(self, llm: LLMClient) -> None:
+        """Route all LLM calls of the pipeline through one pooled client."""
+        for service in (
+            self.research_service,
+            self.outline_service,
+            self.content_service,
+            self.statistics_service,
+        ):
+            service.llm = llm
 
     async def generate(
         self,
@@ -73,6 +88,9 @@ class GenerationOrchestrator:
         tone = options.get("tone", "professional")
         industry = options.get("industry", "general")
 
+        # The agency's own key when its plan allows BYOK, else the platform key
+        self.use_llm(await LLMClientPool.for_agency(self.db, document.agency_id))
+
         try:
             # Step 1: Topic Analysis (5%)
             await self._update_job_progress(job, "topic_analysis", 5)
@@ -129,37 +147,58 @@ class GenerationOrchestrator:
             # Step 8: Chart Generation (90%)
             await self._update_job_progress(job, "chart_generation", 90)
             chart_suggestions = await self.chart_service.suggest_visualizations(statistics)
-            charts = []
-            for suggestion in chart_suggestions[:3]:  # Limit to 3 charts
-                if suggestion["type"] not in ["callout"]:  # Skip non-chart types
-                    chart_data = suggestion.get("data", {})
-                    if "labels" in chart_data and "values" in chart_data:
-                        chart_bytes = await self.chart_service.generate_chart(
-                            chart_type=suggestion["type"],
-                            data=chart_data,
-                            style={"title": suggestion.get("title", "")},
-                        )
-                        charts.append({
-                            "type": suggestion["type"],
-                            "title": suggestion.get("title", ""),
-                            "data": chart_bytes,  # PNG bytes
-                        })
-            content["charts"] = charts
+            chart_format = options.get("chart_format", "svg")  # 'svg' or 'png'
+            max_charts = options.get("max_charts", settings.MAX_CHARTS_PER_DOCUMENT)
+            chart_specs = []
+            for suggestion in chart_suggestions:
+                try:
+                    chart_specs.append(validate_spec({
+                        **suggestion,
+                        "style": {"branding": options.get("branding", {})},
+                    }))
+                except ValueError:
+                    continue
+            chart_specs = chart_specs[:max_charts]
+            chart_images = await self.chart_service.generate_charts_batch(
+                chart_specs,
+                output_format=chart_format,
+            )
+            # Declarative specs are stored with the content and re-rendered on demand
+            rendered = [
+                (spec, chart_bytes)
+                for spec, chart_bytes in zip(chart_specs, chart_images)
+                if chart_bytes is not None
+            ]
+            content["charts"] = [spec for spec, _ in rendered]
+            rendered_charts = [
+                {
+                    "type": spec["type"],
+                    "title": spec["title"],
+                    "data": chart_bytes,
+                    "format": self.chart_service.output_format_for(spec["type"], chart_format),
+                }
+                for spec, chart_bytes in rendered
+            ]
 
             # Step 9: PDF Rendering (100%)
             await self._update_job_progress(job, "pdf_rendering", 95)
             pdf_bytes = await self.pdf_service.generate_pdf(
-                content=content,
+                content={**content, "charts": rendered_charts},
                 template_id=document.template_id,
                 branding=options.get("branding", {}),
             )
+            pdf_report = {}
+            if settings.PDF_OPTIMIZE_ENABLED:
+                # pikepdf work is CPU-bound; keep it off the event loop
+                pdf_bytes, pdf_report = await asyncio.to_thread(self.pdf_optimizer.optimize, pdf_bytes)
 
             # Update document with generated content
             document.content = content
             document.pdf_path = await self._save_pdf(document.id, pdf_bytes)
             document.status = "completed"
             document.word_count = self._count_words(all_content)
-            document.page_count = len(pdf_bytes) // 50000 + 1  # Rough estimate
+            if pdf_report.get("page_count"):
+                document.page_count = pdf_report["page_count"]
             document.updated_at = datetime.utcnow()
 
             # Mark job as complete
@@ -176,6 +215,10 @@ class GenerationOrchestrator:
             await self._handle_failure(job, e)
             raise
 
+        finally:
+            if self.db:
+                await LLMClientPool.flush_usage(self.db)
+
     def _extract_keywords(self, topic: str) -> list:
         """Extract basic keywords from topic."""
         # Simple keyword extraction - split on common delimiters
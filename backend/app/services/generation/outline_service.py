@@ -3,20 +3,14 @@
 import json
 from typing import Dict, Any, List, Optional
 
-from openai import OpenAI
-
-from app.config import settings
+from app.services.generation.llm_pool import LLMClient, LLMClientPool
 
 
 class OutlineService:
     """Service for generating document outlines."""
 
-    def __init__(self):
-        self.client = OpenAI(
-            api_key=settings.OPENROUTER_API_KEY,
-            base_url=settings.OPENROUTER_BASE_URL,
-        )
-        self.model = settings.OPENROUTER_MODEL
+    def __init__(self, llm: Optional[LLMClient] = None):
+        self.llm = llm or LLMClientPool.default()
 
     async def generate_outline(
         self,
@@ -104,14 +98,9 @@ Create a comprehensive document outline in the following JSON structure:
 
 Create an outline that would result in a compelling, executive-quality thought leadership document with 6-10 main sections."""
 
-        response = self.client.chat.completions.create(
-            model=self.model,
+        response = await self.llm.create(
             max_tokens=3000,
             messages=[{"role": "user", "content": prompt}],
-            extra_headers={
-                "HTTP-Referer": "https://paper.aiconnected.com",
-                "X-Title": "Paper by aiConnected",
-            },
         )
 
         response_text = response.choices[0].message.content
@@ -168,14 +157,9 @@ Feedback for refinement:
 
 Please refine the outline based on the feedback and return the updated outline in the same JSON structure. Maintain all fields and improve based on the specific feedback provided."""
 
-        response = self.client.chat.completions.create(
-            model=self.model,
+        response = await self.llm.create(
             max_tokens=3000,
             messages=[{"role": "user", "content": prompt}],
-            extra_headers={
-                "HTTP-Referer": "https://paper.aiconnected.com",
-                "X-Title": "Paper by aiConnected",
-            },
         )
 
         response_text = response.choices[0].message.content
@@ -1,22 +1,16 @@
 """Research service for web research and analysis."""
 
 import json
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
-from openai import OpenAI
-
-from app.config import settings
+from app.services.generation.llm_pool import LLMClient, LLMClientPool
 
 
 class ResearchService:
     """Service for conducting web research on topics."""
 
-    def __init__(self):
-        self.client = OpenAI(
-            api_key=settings.OPENROUTER_API_KEY,
-            base_url=settings.OPENROUTER_BASE_URL,
-        )
-        self.model = settings.OPENROUTER_MODEL
+    def __init__(self, llm: Optional[LLMClient] = None):
+        self.llm = llm or LLMClientPool.default()
 
     async def research_topic(
         self,
@@ -70,14 +64,9 @@ Provide research findings in the following JSON structure:
 
 Provide substantive, specific research findings that would be valuable for executive-level thought leadership content. Generate realistic but clearly marked as AI-generated statistics and insights."""
 
-        response = self.client.chat.completions.create(
-            model=self.model,
+        response = await self.llm.create(
             max_tokens=max_tokens,
             messages=[{"role": "user", "content": prompt}],
-            extra_headers={
-                "HTTP-Referer": "https://paper.aiconnected.com",
-                "X-Title": "Paper by aiConnected",
-            },
         )
 
         response_text = response.choices[0].message.content
@@ -158,14 +147,9 @@ Provide your analysis in the following JSON structure:
 
 Provide realistic industry insights suitable for executive-level content."""
 
-        response = self.client.chat.completions.create(
-            model=self.model,
+        response = await self.llm.create(
             max_tokens=2000,
             messages=[{"role": "user", "content": prompt}],
-            extra_headers={
-                "HTTP-Referer": "https://paper.aiconnected.com",
-                "X-Title": "Paper by aiConnected",
-            },
         )
 
         response_text = response.choices[0].message.content
@@ -2,22 +2,17 @@
 
 import json
 import re
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
-from openai import OpenAI
-
-from app.config import settings
+from app.services.generation.llm_pool import LLMClient, LLMClientPool
+from app.utils.values import display_value, parse_value, parse_values
 
 
 class StatisticsService:
     """Service for extracting and managing statistics."""
 
-    def __init__(self):
-        self.client = OpenAI(
-            api_key=settings.OPENROUTER_API_KEY,
-            base_url=settings.OPENROUTER_BASE_URL,
-        )
-        self.model = settings.OPENROUTER_MODEL
+    def __init__(self, llm: Optional[LLMClient] = None):
+        self.llm = llm or LLMClientPool.default()
 
     async def extract_statistics(
         self,
@@ -61,14 +56,9 @@ Extract all statistics, numbers, and data points from the content. Return them i
 
 Extract 5-15 key statistics that would be impactful for visualizations and callouts."""
 
-        response = self.client.chat.completions.create(
-            model=self.model,
+        response = await self.llm.create(
             max_tokens=2000,
             messages=[{"role": "user", "content": prompt}],
-            extra_headers={
-                "HTTP-Referer": "https://paper.aiconnected.com",
-                "X-Title": "Paper by aiConnected",
-            },
         )
 
         response_text = response.choices[0].message.content
@@ -78,7 +68,7 @@ Extract 5-15 key statistics that would be impactful for visualizations and callo
             end = response_text.rfind("}") + 1
             if start != -1 and end > start:
                 parsed = json.loads(response_text[start:end])
-                return parsed.get("statistics", [])
+                return self.deduplicate(parsed.get("statistics", []))
         except json.JSONDecodeError:
             pass
 
@@ -113,7 +103,53 @@ Extract 5-15 key statistics that would be impactful for visualizations and callo
                 "visualization_type": "number",
             })
 
-        return extracted
+        return self.deduplicate(extracted)
+
+    @staticmethod
+    def deduplicate(statistics: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Drop statistics that restate one already in the list.
+
+        Two statistics are duplicates when their values normalize to the same
+        number and unit ("$4.2B" and "$4.2 billion") and their contexts share
+        at least half their words. The first occurrence is kept, taking the
+        longer context and any missing source from its duplicates.
+
+        Args:
+            statistics: Extracted statistics.
+
+        Returns:
+            Statistics without duplicates, in their original order.
+        """
+        kept: List[Dict[str, Any]] = []
+        seen: Dict[tuple, List[tuple]] = {}
+
+        for stat, parsed in zip(statistics, parse_values(s.get("value") for s in statistics)):
+            if parsed is None:
+                kept.append(stat)
+                continue
+
+            key = (parsed.kind, parsed.unit, round(parsed.value, 6), parsed.is_range)
+            words = set(re.findall(r"\w+", str(stat.get("context", "")).lower()))
+            duplicate = None
+            for other_words, other in seen.get(key, []):
+                overlap = len(words & other_words)
+                if not words or not other_words or overlap * 2 >= min(len(words), len(other_words)):
+                    duplicate = other
+                    break
+
+            if duplicate is None:
+                stat = dict(stat)
+                kept.append(stat)
+                seen.setdefault(key, []).append((words, stat))
+                continue
+
+            if len(str(stat.get("context", ""))) > len(str(duplicate.get("context", ""))):
+                duplicate["context"] = stat["context"]
+            if not duplicate.get("source") and stat.get("source"):
+                duplicate["source"] = stat["source"]
+
+        return kept
 
     async def format_statistic(
         self,
@@ -130,15 +166,17 @@ Extract 5-15 key statistics that would be impactful for visualizations and callo
         Returns:
             Formatted statistic.
         """
-        value = statistic.get("value", "")
         context = statistic.get("context", "")
         source = statistic.get("source", "")
+        parsed = parse_value(statistic.get("value"))
+        value = display_value(statistic.get("value", ""), parsed)
 
         formatted = {
             "value": value,
             "context": context,
             "source": source,
             "original": statistic,
+            "normalized": parsed._asdict() if parsed else None,
         }
 
         if style == "callout":
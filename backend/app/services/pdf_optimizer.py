@@ -0,0 +1,240 @@
+"""PDF post-processing optimizer."""
+
+import hashlib
+import io
+import math
+import zlib
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import pikepdf
+from PIL import Image
+
+from app.config import settings
+
+
+class PDFOptimizer:
+    """
+    Shrink rendered PDFs before they are stored.
+
+    Fonts are already subset by WeasyPrint at render time (see
+    ``PDFService.render_options``); this pass deduplicates identical image
+    streams, downsamples oversized images to the target DPI and recompresses
+    all streams into object streams.
+
+    An image's useful resolution is the largest size it is drawn at, taken
+    from the transformation matrix in effect where the content streams
+    (including nested form XObjects) paint it. Images that are not painted
+    directly, e.g. pattern fills, are capped by the page size instead.
+    """
+
+    # Only plain 8-bit images are resampled; anything else is left untouched
+    RESAMPLE_COLORSPACES = {"/DeviceRGB": "RGB", "/DeviceGray": "L"}
+
+    # Form XObjects nested deeper than this are not followed
+    MAX_FORM_DEPTH = 8
+
+    IDENTITY = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+
+    def __init__(self, target_dpi: int = None):
+        self.target_dpi = target_dpi or settings.PDF_IMAGE_DPI
+
+    def optimize(self, pdf_bytes: bytes) -> Tuple[bytes, Dict[str, Any]]:
+        """
+        Optimize a PDF.
+
+        Args:
+            pdf_bytes: The rendered PDF.
+
+        Returns:
+            Tuple of (optimized PDF bytes, report). The report contains the
+            real page count, original/optimized sizes and bytes saved. If the
+            optimized output is not smaller, or the PDF cannot be parsed, the
+            original bytes are returned.
+        """
+        report = {
+            "page_count": 0,
+            "original_size": len(pdf_bytes),
+            "optimized_size": len(pdf_bytes),
+            "bytes_saved": 0,
+            "images_deduplicated": 0,
+            "images_downsampled": 0,
+        }
+
+        try:
+            pdf = pikepdf.open(io.BytesIO(pdf_bytes))
+        except pikepdf.PdfError:
+            report["page_count"] = None
+            return pdf_bytes, report
+
+        with pdf:
+            report["page_count"] = len(pdf.pages)
+            canonical: Dict[str, pikepdf.Object] = {}
+            # objgen -> image, its page size cap and its largest placed size
+            images: Dict[Tuple[int, int], pikepdf.Stream] = {}
+            page_caps: Dict[Tuple[int, int], Tuple[int, int]] = {}
+            placed: Dict[Tuple[int, int], Tuple[float, float]] = {}
+
+            for page in pdf.pages:
+                xobjects = page.obj.get("/Resources", {}).get("/XObject", {})
+                page_cap = self._max_image_size(page)
+
+                for name in list(xobjects.keys()):
+                    image = xobjects[name]
+                    if image.get("/Subtype") != "/Image":
+                        continue
+
+                    digest = self._image_digest(image)
+                    existing = canonical.get(digest)
+                    if existing is not None:
+                        if existing.objgen != image.objgen:
+                            xobjects[name] = existing
+                            report["images_deduplicated"] += 1
+                        image = existing
+                    canonical.setdefault(digest, image)
+                    images[image.objgen] = image
+                    page_caps[image.objgen] = _max_size(page_caps.get(image.objgen), page_cap)
+
+                drawn: Dict[Tuple[int, int], pikepdf.Stream] = {}
+                try:
+                    self._record_placements(
+                        page, page.obj.get("/Resources"), self.IDENTITY, placed, drawn
+                    )
+                except (pikepdf.PdfError, ValueError, TypeError):
+                    pass
+                for objgen, image in drawn.items():
+                    images.setdefault(objgen, image)
+                    page_caps[objgen] = _max_size(page_caps.get(objgen), page_cap)
+
+            for objgen, image in images.items():
+                max_width, max_height = page_caps[objgen]
+                if objgen in placed:
+                    # Points are 1/72 inch
+                    width, height = placed[objgen]
+                    max_width = min(max_width, max(1, math.ceil(width / 72 * self.target_dpi)))
+                    max_height = min(max_height, max(1, math.ceil(height / 72 * self.target_dpi)))
+                if self._downsample(image, max_width, max_height):
+                    report["images_downsampled"] += 1
+
+            out = io.BytesIO()
+            pdf.save(
+                out,
+                compress_streams=True,
+                recompress_flate=True,
+                object_stream_mode=pikepdf.ObjectStreamMode.generate,
+            )
+            optimized = out.getvalue()
+
+        if len(optimized) < len(pdf_bytes):
+            report["optimized_size"] = len(optimized)
+            report["bytes_saved"] = len(pdf_bytes) - len(optimized)
+            return optimized, report
+
+        return pdf_bytes, report
+
+    def _max_image_size(self, page: pikepdf.Page) -> Tuple[int, int]:
+        """Largest useful image size in pixels for a page at the target DPI."""
+        x0, y0, x1, y1 = (float(v) for v in page.mediabox)
+        # PDF user space units are 1/72 inch
+        return (
+            int(abs(x1 - x0) / 72 * self.target_dpi),
+            int(abs(y1 - y0) / 72 * self.target_dpi),
+        )
+
+    def _record_placements(
+        self,
+        content: Any,
+        resources: Optional[pikepdf.Dictionary],
+        ctm: Sequence[float],
+        placed: Dict[Tuple[int, int], Tuple[float, float]],
+        drawn: Dict[Tuple[int, int], pikepdf.Stream],
+        depth: int = 0,
+    ) -> None:
+        """Record the largest size (in points) each image is painted at by a content stream."""
+        xobjects = resources.get("/XObject", {}) if resources is not None else {}
+        saved = []
+        for operands, operator in pikepdf.parse_content_stream(content):
+            op = str(operator)
+            if op == "q":
+                saved.append(ctm)
+            elif op == "Q":
+                ctm = saved.pop() if saved else ctm
+            elif op == "cm" and len(operands) == 6:
+                ctm = _concat([float(v) for v in operands], ctm)
+            elif op == "Do" and operands:
+                xobject = xobjects.get(str(operands[0]))
+                if xobject is None:
+                    continue
+                subtype = xobject.get("/Subtype")
+                if subtype == "/Image":
+                    # The image is painted into the unit square mapped by the CTM
+                    a, b, c, d, _, _ = ctm
+                    width, height = placed.get(xobject.objgen, (0.0, 0.0))
+                    placed[xobject.objgen] = (
+                        max(width, math.hypot(a, b)),
+                        max(height, math.hypot(c, d)),
+                    )
+                    drawn[xobject.objgen] = xobject
+                elif subtype == "/Form" and depth < self.MAX_FORM_DEPTH:
+                    matrix = [float(v) for v in xobject.get("/Matrix", self.IDENTITY)]
+                    self._record_placements(
+                        xobject,
+                        xobject.get("/Resources", resources),
+                        _concat(matrix, ctm),
+                        placed,
+                        drawn,
+                        depth + 1,
+                    )
+
+    @staticmethod
+    def _image_digest(image: pikepdf.Stream) -> str:
+        """Hash an image stream together with the keys that affect decoding."""
+        digest = hashlib.sha256(image.read_raw_bytes())
+        for key in ("/Width", "/Height", "/BitsPerComponent", "/Filter", "/DecodeParms"):
+            digest.update(repr(image.get(key)).encode())
+        colorspace = image.get("/ColorSpace")
+        digest.update(repr(colorspace).encode())
+        smask = image.get("/SMask")
+        if smask is not None:
+            digest.update(smask.read_raw_bytes())
+        return digest.hexdigest()
+
+    def _downsample(self, image: pikepdf.Stream, max_width: int, max_height: int) -> bool:
+        """Resample an image in place if it exceeds the given size in pixels."""
+        width, height = int(image.Width), int(image.Height)
+        if width <= max_width and height <= max_height:
+            return False
+
+        mode = self.RESAMPLE_COLORSPACES.get(str(image.get("/ColorSpace")))
+        if mode is None or int(image.get("/BitsPerComponent", 8)) != 8:
+            return False
+
+        try:
+            pil_image = pikepdf.PdfImage(image).as_pil_image()
+        except (pikepdf.PdfError, NotImplementedError, ValueError):
+            return False
+
+        scale = min(max_width / width, max_height / height)
+        size = (max(1, int(width * scale)), max(1, int(height * scale)))
+        resized = pil_image.convert(mode).resize(size, Image.LANCZOS)
+
+        image.write(zlib.compress(resized.tobytes()), filter=pikepdf.Name.FlateDecode)
+        image.Width, image.Height = size
+        if "/DecodeParms" in image:
+            del image["/DecodeParms"]
+        return True
+
+
+def _concat(m: Sequence[float], n: Sequence[float]) -> Tuple[float, ...]:
+    """The PDF matrix product m × n, for [a b c d e f] matrices."""
+    return (
+        m[0] * n[0] + m[1] * n[2],
+        m[0] * n[1] + m[1] * n[3],
+        m[2] * n[0] + m[3] * n[2],
+        m[2] * n[1] + m[3] * n[3],
+        m[4] * n[0] + m[5] * n[2] + n[4],
+        m[4] * n[1] + m[5] * n[3] + n[5],
+    )
+
+
+def _max_size(a: Optional[Tuple[int, int]], b: Tuple[int, int]) -> Tuple[int, int]:
+    return b if a is None else (max(a[0], b[0]), max(a[1], b[1]))
@@ -1,20 +1,57 @@
 """PDF generation service."""
 
 import base64
+import hashlib
+import json
+import re
+from html import escape
 from pathlib import Path
 from typing import Dict, Any, Optional
 from uuid import UUID
 
-from jinja2 import Environment, FileSystemLoader
-from weasyprint import HTML, CSS
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+from app.config import settings
+from app.services.render_assets import RenderAssetMap
+from app.services.render_resources import FontRegistry
+from app.utils.validators import validate_hex_color
+
+# CSS font stacks: names, spaces, commas and quotes only
+FONT_FAMILY = re.compile(r"[\w\s,'\"-]+")
 
 
 class PDFService:
-    """Service for PDF generation using WeasyPrint."""
+    """
+    Service for PDF generation using WeasyPrint.
+
+    WeasyPrint (and its cairo/pango stack) is imported on first render, so
+    HTML previews and fingerprinting never load it.
+    """
+
+    # Bump when layout/CSS changes so render fingerprints change with it
+    RENDER_VERSION = 1
+
+    # Screen-only additions for the HTML preview
+    PREVIEW_CSS = """
+        body {
+            max-width: 21cm;
+            margin: 0 auto;
+            padding: 2cm;
+        }
+
+        .chart svg {
+            max-width: 100%;
+            height: auto;
+        }
+        """
+
+    # Jinja environments per templates path, shared so compiled templates
+    # are kept for the life of the process
+    _environments: Dict[str, Environment] = {}
 
     def __init__(self, templates_path: str = "app/templates"):
         self.templates_path = Path(templates_path)
-        self.env = Environment(loader=FileSystemLoader(str(self.templates_path)))
+        self.env = self.environment(templates_path)
 
         # Default branding colors
         self.default_branding = {
@@ -26,6 +63,44 @@ class PDFService:
             "font_family": "Inter, sans-serif",
         }
 
+    @classmethod
+    def environment(cls, templates_path: str = "app/templates") -> Environment:
+        """Get the shared Jinja environment for a templates directory."""
+        env = cls._environments.get(templates_path)
+        if env is None:
+            env = Environment(
+                loader=FileSystemLoader(templates_path),
+                autoescape=select_autoescape(["html"]),
+                auto_reload=settings.DEBUG,
+            )
+            cls._environments[templates_path] = env
+        return env
+
+    @classmethod
+    def precompile_templates(cls, templates_path: str = "app/templates") -> int:
+        """
+        Compile every HTML template up front.
+
+        Returns:
+            Number of templates compiled.
+        """
+        env = cls.environment(templates_path)
+        names = env.list_templates(extensions=["html"])
+        for name in names:
+            env.get_template(name)
+        return len(names)
+
+    @staticmethod
+    def render_options() -> Dict[str, Any]:
+        """WeasyPrint output options: subset fonts and cap image resolution."""
+        return {
+            "full_fonts": False,  # Embed only the glyphs actually used
+            "hinting": False,  # Drop hinting tables from the subsets
+            "optimize_images": True,
+            "jpeg_quality": settings.PDF_JPEG_QUALITY,
+            "dpi": settings.PDF_IMAGE_DPI,
+        }
+
     def render_html(self, template_name: str, context: Dict[str, Any]) -> str:
         """Render HTML from a template."""
         template = self.env.get_template(template_name)
@@ -48,10 +123,81 @@ class PDFService:
         Returns:
             PDF as bytes.
         """
+        from weasyprint import HTML, CSS
+
+        # Charts are registered in the asset map and referenced by URL
+        assets = RenderAssetMap()
+        context = self.build_context(content, branding, assets=assets)
+        await assets.prefetch([context.get("logo_url"), context.get("client_logo_url")])
+        html_content = self.render_document_html(context, template_id)
+
+        # Generate CSS with branding
+        css_content = self._generate_branded_css(context["branding"])
+
+        # Generate PDF
+        font_config = FontRegistry.font_config()
+        html = HTML(string=html_content, url_fetcher=assets.url_fetcher)
+        stylesheets = FontRegistry.stylesheets() + [
+            CSS(string=css_content, font_config=font_config)
+        ]
+
+        return html.write_pdf(
+            stylesheets=stylesheets,
+            font_config=font_config,
+            **self.render_options(),
+        )
+
+    def render_preview_html(
+        self,
+        content: Dict[str, Any],
+        template_id: Optional[UUID] = None,
+        branding: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """
+        Render document content to a standalone HTML page.
+
+        Uses the same template and branded CSS as :meth:`generate_pdf`, with
+        the CSS and SVG charts inlined, so drafts can be previewed without a
+        PDF render.
+
+        Args:
+            content: The document content with sections, statistics, charts.
+            template_id: Optional template ID for styling.
+            branding: Optional branding configuration.
+
+        Returns:
+            HTML page as a string.
+        """
+        context = self.build_context(content, branding)
+        html_content = self.render_document_html(context, template_id)
+        css_content = self._generate_branded_css(context["branding"]) + self.PREVIEW_CSS
+
+        style_tag = f"<style>{css_content}</style>"
+        if "</head>" in html_content:
+            return html_content.replace("</head>", f"{style_tag}</head>", 1)
+        return style_tag + html_content
+
+    def build_context(
+        self,
+        content: Dict[str, Any],
+        branding: Optional[Dict[str, Any]] = None,
+        assets: Optional[RenderAssetMap] = None,
+    ) -> Dict[str, Any]:
+        """
+        Build the template context for a document.
+
+        Chart bytes are registered in ``assets`` when given (PDF output);
+        otherwise they are inlined (SVG markup, or a data URI for PNG).
+        """
         # Merge branding with defaults
         brand = {**self.default_branding, **(branding or {})}
+        # Brand values are written into CSS; keep only well-formed ones
+        for key in ("primary_color", "secondary_color", "accent_color", "text_color", "background_color"):
+            if not (isinstance(brand.get(key), str) and validate_hex_color(brand[key])):
+                brand[key] = self.default_branding[key]
+        if not (isinstance(brand.get("font_family"), str) and FONT_FAMILY.fullmatch(brand["font_family"])):
+            brand["font_family"] = self.default_branding["font_family"]
 
-        # Build the PDF context
         context = {
             "title": content.get("title", "Untitled Document"),
             "subtitle": content.get("subtitle", ""),
@@ -61,58 +207,108 @@ class PDFService:
             "statistics": content.get("statistics", []),
             "metadata": content.get("metadata", {}),
             "branding": brand,
+            "logo_url": brand.get("logo_url"),
+            "client_logo_url": brand.get("client_logo_url"),
         }
 
-        # Handle charts (convert bytes to base64 for embedding)
         charts = []
-        for chart in content.get("charts", []):
-            if isinstance(chart.get("data"), bytes):
-                chart_base64 = base64.b64encode(chart["data"]).decode("utf-8")
-                charts.append({
-                    "type": chart.get("type"),
-                    "title": chart.get("title"),
-                    "data_uri": f"data:image/png;base64,{chart_base64}",
-                })
+        for index, chart in enumerate(content.get("charts", [])):
+            if not isinstance(chart.get("data"), bytes):
+                continue
+            fmt = chart.get("format", "png")
+            entry = {"type": chart.get("type"), "title": chart.get("title")}
+            if assets is not None:
+                entry["src"] = assets.register(chart["data"], fmt=fmt, name=f"chart-{index}")
+            elif fmt == "svg":
+                entry["svg"] = self._inline_svg(chart["data"])
+            else:
+                encoded = base64.b64encode(chart["data"]).decode("ascii")
+                entry["src"] = f"data:{RenderAssetMap.MIME_TYPES.get(fmt)};base64,{encoded}"
+            charts.append(entry)
         context["charts"] = charts
 
+        return context
+
+    def render_document_html(
+        self,
+        context: Dict[str, Any],
+        template_id: Optional[UUID] = None,
+    ) -> str:
+        """Render the document HTML, falling back to the built-in layout."""
         # Determine template
         template_name = "documents/thought_leadership.html"
 
         # Check if template exists, fall back to default
         try:
-            html_content = self.render_html(template_name, context)
+            return self.render_html(template_name, context)
         except Exception:
             # Use inline template if file doesn't exist
-            html_content = self._generate_default_html(context)
+            return self._generate_default_html(context)
 
-        # Generate CSS with branding
-        css_content = self._generate_branded_css(brand)
-
-        # Generate PDF
-        html = HTML(string=html_content)
-        stylesheets = [CSS(string=css_content)]
+    @staticmethod
+    def render_fingerprint(
+        content: Dict[str, Any],
+        template_id: Optional[UUID] = None,
+        branding: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """
+        Hash everything that affects a document's rendered output.
 
-        return html.write_pdf(stylesheets=stylesheets)
+        Identical fingerprints render identically, so they key preview,
+        thumbnail and other render caches.
+        """
+        def _default(value):
+            if isinstance(value, bytes):
+                return hashlib.sha256(value).hexdigest()
+            return str(value)
+
+        payload = json.dumps(
+            {
+                "content": content,
+                "template_id": str(template_id) if template_id else None,
+                "branding": branding or {},
+                "version": PDFService.RENDER_VERSION,
+            },
+            sort_keys=True,
+            default=_default,
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    @staticmethod
+    def _inline_svg(svg_bytes: bytes) -> str:
+        """Strip the XML prolog so an SVG document can be embedded in HTML."""
+        markup = svg_bytes.decode("utf-8")
+        start = markup.find("<svg")
+        return markup[start:] if start != -1 else markup
 
     def _generate_default_html(self, context: Dict[str, Any]) -> str:
         """Generate default HTML if template doesn't exist."""
+        # Content is plain text from generation or user edits; escape all of it
+        def text(value: Any) -> str:
+            return escape(str(value or ""))
+
         sections_html = ""
         for section in context.get("sections", []):
-            section_html = f"<section class='section'><h2>{section.get('title', '')}</h2>"
+            section_html = f"<section class='section'><h2>{text(section.get('title'))}</h2>"
             if section.get("content"):
-                section_html += f"<div class='content'>{section['content']}</div>"
+                section_html += f"<div class='content'>{text(section['content'])}</div>"
             for subsection in section.get("subsections", []):
-                section_html += f"<h3>{subsection.get('title', '')}</h3>"
-                section_html += f"<div class='content'>{subsection.get('content', '')}</div>"
+                section_html += f"<h3>{text(subsection.get('title'))}</h3>"
+                section_html += f"<div class='content'>{text(subsection.get('content'))}</div>"
             section_html += "</section>"
             sections_html += section_html
 
         charts_html = ""
         for chart in context.get("charts", []):
+            # Inline SVG comes from the chart renderers, which escape their input
+            chart_body = chart.get("svg") or (
+                f"<img src=\"{text(chart.get('src'))}\" alt=\"{text(chart.get('title'))}\">"
+            )
             charts_html += f"""
             <div class="chart">
-                <h4>{chart.get('title', '')}</h4>
-                <img src="{chart.get('data_uri', '')}" alt="{chart.get('title', '')}">
+                <h4>{text(chart.get('title'))}</h4>
+                {chart_body}
             </div>
             """
 
@@ -121,8 +317,8 @@ class PDFService:
         for stat in highlight_stats:
             stats_html += f"""
             <div class="stat-box">
-                <div class="stat-value">{stat.get('value', '')}</div>
-                <div class="stat-context">{stat.get('context', '')}</div>
+                <div class="stat-value">{text(stat.get('value'))}</div>
+                <div class="stat-context">{text(stat.get('context'))}</div>
             </div>
             """
 
@@ -132,8 +328,8 @@ class PDFService:
             conclusion_html = f"""
             <section class="conclusion">
                 <h2>Conclusion</h2>
-                <div class="content">{conclusion.get('content', '')}</div>
-                {f"<div class='cta'>{conclusion.get('call_to_action', '')}</div>" if conclusion.get('call_to_action') else ''}
+                <div class="content">{text(conclusion.get('content'))}</div>
+                {f"<div class='cta'>{text(conclusion.get('call_to_action'))}</div>" if conclusion.get('call_to_action') else ''}
             </section>
             """
 
@@ -142,15 +338,16 @@ class PDFService:
         <html>
         <head>
             <meta charset="UTF-8">
-            <title>{context.get('title', '')}</title>
+            <title>{text(context.get('title'))}</title>
         </head>
         <body>
             <header class="document-header">
-                <h1 class="title">{context.get('title', '')}</h1>
-                {f"<p class='subtitle'>{context.get('subtitle', '')}</p>" if context.get('subtitle') else ''}
+                {f"<img class='logo' src='{text(context['logo_url'])}' alt=''>" if context.get('logo_url') else ''}
+                <h1 class="title">{text(context.get('title'))}</h1>
+                {f"<p class='subtitle'>{text(context.get('subtitle'))}</p>" if context.get('subtitle') else ''}
             </header>
 
-            {f"<section class='executive-summary'><h2>Executive Summary</h2><div class='content'>{context.get('executive_summary', '')}</div></section>" if context.get('executive_summary') else ''}
+            {f"<section class='executive-summary'><h2>Executive Summary</h2><div class='content'>{text(context.get('executive_summary'))}</div></section>" if context.get('executive_summary') else ''}
 
             <div class="stats-container">{stats_html}</div>
 
@@ -195,6 +392,11 @@ class PDFService:
             border-bottom: 3px solid {brand.get('primary_color', '#1a4a6e')};
         }}
 
+        .logo {{
+            max-height: 1.5cm;
+            margin-bottom: 0.5cm;
+        }}
+
         .title {{
             font-size: 28pt;
             color: {brand.get('primary_color', '#1a4a6e')};
@@ -326,15 +528,23 @@ class PDFService:
         base_url: str = None,
     ) -> str:
         """Generate a PDF from a template (synchronous)."""
+        from weasyprint import HTML, CSS
+
         html_content = self.render_html(template_name, context)
 
-        stylesheets = []
+        font_config = FontRegistry.font_config()
+        stylesheets = FontRegistry.stylesheets()
         base_css_path = self.templates_path / "base" / "styles.css"
         if base_css_path.exists():
-            stylesheets.append(CSS(filename=str(base_css_path)))
+            stylesheets = stylesheets + [CSS(filename=str(base_css_path), font_config=font_config)]
 
-        html = HTML(string=html_content, base_url=base_url)
-        html.write_pdf(output_path, stylesheets=stylesheets)
+        html = HTML(string=html_content, base_url=base_url, url_fetcher=RenderAssetMap().url_fetcher)
+        html.write_pdf(
+            output_path,
+            stylesheets=stylesheets,
+            font_config=font_config,
+            **self.render_options(),
+        )
 
         return output_path
 
@@ -345,12 +555,19 @@ class PDFService:
         base_url: str = None,
     ) -> bytes:
         """Generate a PDF and return as bytes (synchronous)."""
+        from weasyprint import HTML, CSS
+
         html_content = self.render_html(template_name, context)
 
-        stylesheets = []
+        font_config = FontRegistry.font_config()
+        stylesheets = FontRegistry.stylesheets()
         base_css_path = self.templates_path / "base" / "styles.css"
         if base_css_path.exists():
-            stylesheets.append(CSS(filename=str(base_css_path)))
-
-        html = HTML(string=html_content, base_url=base_url)
-        return html.write_pdf(stylesheets=stylesheets)
+            stylesheets = stylesheets + [CSS(filename=str(base_css_path), font_config=font_config)]
+
+        html = HTML(string=html_content, base_url=base_url, url_fetcher=RenderAssetMap().url_fetcher)
+        return html.write_pdf(
+            stylesheets=stylesheets,
+            font_config=font_config,
+            **self.render_options(),
+        )
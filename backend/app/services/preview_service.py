@@ -0,0 +1,115 @@
+"""HTML preview rendering service."""
+
+from typing import Any, Dict, Optional, Tuple
+
+from app.config import settings
+from app.models import Document
+from app.services.generation.chart_renderers import validate_spec
+from app.services.generation.chart_service import ChartService
+from app.services.pdf_service import PDFService
+from app.utils.cache import LRUCache
+
+
+class PreviewService:
+    """
+    Service for fast HTML previews of documents.
+
+    Renders the same template and branded CSS as the PDF path, but to a
+    standalone HTML page with SVG charts inlined. Results are cached per
+    process by render fingerprint, so repeat views of an unchanged draft are
+    a dictionary lookup.
+    """
+
+    _cache = LRUCache(
+        maxsize=settings.PREVIEW_CACHE_SIZE,
+        ttl=settings.PREVIEW_CACHE_TTL,
+    )
+
+    def __init__(self):
+        self.pdf_service = PDFService()
+        self.chart_service = ChartService()
+
+    async def render(
+        self,
+        document: Document,
+        branding: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[str, str]:
+        """
+        Render a document preview.
+
+        Args:
+            document: The document to preview (must have content).
+            branding: Optional branding configuration.
+
+        Returns:
+            Tuple of (HTML page, render fingerprint).
+        """
+        content = self.preview_content(document)
+        fingerprint = PDFService.render_fingerprint(content, document.template_id, branding)
+
+        html = self._cache.get(fingerprint)
+        if html is None:
+            content["charts"] = await self._render_charts(content.get("charts", []), branding)
+            html = self.pdf_service.render_preview_html(
+                content,
+                template_id=document.template_id,
+                branding=branding,
+            )
+            self._cache.set(fingerprint, html)
+
+        return html, fingerprint
+
+    async def render_pdf(
+        self,
+        document: Document,
+        branding: Optional[Dict[str, Any]] = None,
+    ) -> bytes:
+        """
+        Render a document's PDF from the same content, charts and branding as its preview.
+
+        Args:
+            document: The document to render (must have content).
+            branding: Optional branding configuration.
+
+        Returns:
+            PDF as bytes.
+        """
+        content = self.preview_content(document)
+        content["charts"] = await self._render_charts(content.get("charts", []), branding)
+        return await self.pdf_service.generate_pdf(
+            content,
+            template_id=document.template_id,
+            branding=branding,
+        )
+
+    @staticmethod
+    def preview_content(document: Document) -> Dict[str, Any]:
+        """Build renderable content from a document's stored content."""
+        content = dict(document.content_json or {})
+        content.setdefault("title", document.title)
+        return content
+
+    async def _render_charts(self, charts: list, branding: Optional[Dict[str, Any]] = None) -> list:
+        """Render stored chart specs to inline SVG."""
+        rendered = [chart for chart in charts if isinstance(chart.get("data"), bytes)]
+        specs = []
+        for chart in charts:
+            if isinstance(chart.get("data"), bytes):
+                continue
+            try:
+                spec = validate_spec(chart)
+            except ValueError:
+                continue
+            specs.append({**spec, "style": {**spec["style"], "branding": branding}})
+
+        images = await self.chart_service.generate_charts_batch(specs, output_format="svg")
+        for spec, svg in zip(specs, images):
+            if svg is None:
+                continue
+            rendered.append({
+                "type": spec["type"],
+                "title": spec["title"],
+                "data": svg,
+                "format": "svg",
+            })
+        return rendered
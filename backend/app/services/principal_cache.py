@@ -0,0 +1,156 @@
+"""Cache of authenticated user principals."""
+
+import json
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+import structlog
+
+from app.config import settings
+from app.models import User
+from app.redis import get_redis, mark_unavailable
+from app.utils.cache import LRUCache
+
+logger = structlog.get_logger()
+
+
+@dataclass(frozen=True)
+class Principal:
+    """The parts of a user that authorization needs."""
+
+    id: str
+    email: str
+    role: str
+    is_active: bool
+    agency_id: Optional[str] = None
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        """Build a principal from a user row."""
+        return cls(
+            id=user.id,
+            email=user.email,
+            role=user.role,
+            is_active=user.is_active,
+            agency_id=user.agency_id,
+        )
+
+
+class PrincipalCache:
+    """
+    Two-tier cache of principals by user ID.
+
+    Entries live in Redis for PRINCIPAL_CACHE_TTL seconds, shared by all API
+    processes, and in a per-process LRU for PRINCIPAL_LOCAL_TTL seconds.
+    Every user has a version counter in Redis; `invalidate` bumps it, and
+    Redis entries written under an older version are ignored. A request that
+    read the user before an update can therefore not put stale data back.
+    Other processes see an invalidation once their local entry expires.
+
+    When Redis is unavailable only the local tier is used.
+    """
+
+    _local = LRUCache(maxsize=settings.PRINCIPAL_CACHE_SIZE, ttl=settings.PRINCIPAL_LOCAL_TTL)
+
+    @staticmethod
+    def _keys(user_id: str):
+        return f"principal:{user_id}", f"principal:{user_id}:version"
+
+    @classmethod
+    async def get(cls, user_id: str) -> Optional[Principal]:
+        """
+        Get a cached principal.
+
+        Args:
+            user_id: User ID.
+
+        Returns:
+            The principal, or None on a miss.
+        """
+        principal = cls._local.get(user_id)
+        if principal is not None:
+            return principal
+
+        redis = get_redis()
+        if redis is None:
+            return None
+
+        data_key, version_key = cls._keys(user_id)
+        try:
+            data, version = await redis.mget(data_key, version_key)
+        except Exception as e:
+            logger.warning("principal_cache_unavailable", error=str(e))
+            mark_unavailable()
+            return None
+
+        if data is None:
+            return None
+        entry = json.loads(data)
+        if entry.pop("version", 0) != int(version or 0):
+            return None
+
+        principal = Principal(**entry)
+        cls._local.set(user_id, principal)
+        return principal
+
+    @classmethod
+    async def version(cls, user_id: str) -> int:
+        """
+        Current version of a user's entry.
+
+        Read it before loading the user, and pass it to `set`.
+        """
+        redis = get_redis()
+        if redis is None:
+            return 0
+        try:
+            return int(await redis.get(cls._keys(user_id)[1]) or 0)
+        except Exception:
+            mark_unavailable()
+            return 0
+
+    @classmethod
+    async def set(cls, principal: Principal, version: int = 0) -> None:
+        """
+        Cache a principal.
+
+        Args:
+            principal: Principal to cache.
+            version: Version read before the user was loaded.
+        """
+        cls._local.set(principal.id, principal)
+
+        redis = get_redis()
+        if redis is None:
+            return
+
+        data_key, _ = cls._keys(principal.id)
+        try:
+            await redis.set(
+                data_key,
+                json.dumps({**asdict(principal), "version": version}),
+                ex=settings.PRINCIPAL_CACHE_TTL,
+            )
+        except Exception as e:
+            logger.warning("principal_cache_unavailable", error=str(e))
+            mark_unavailable()
+
+    @classmethod
+    async def invalidate(cls, user_id: str) -> None:
+        """Drop a user's cached principal, e.g. after a role, status or agency change."""
+        cls._local.delete(user_id)
+
+        redis = get_redis()
+        if redis is None:
+            return
+
+        data_key, version_key = cls._keys(user_id)
+        try:
+            async with redis.pipeline(transaction=True) as pipe:
+                pipe.incr(version_key)
+                pipe.expire(version_key, settings.PRINCIPAL_CACHE_TTL * 2)
+                pipe.delete(data_key)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning("principal_cache_invalidate_failed", user_id=user_id, error=str(e))
+            mark_unavailable()
@@ -0,0 +1,89 @@
+"""Render-time asset map for PDF generation."""
+
+from typing import Dict, Iterable, Optional, Set, Tuple
+from uuid import uuid4
+
+from app.services.render_resources import AssetCache
+
+
+ASSET_SCHEME = "asset:"
+
+
+class RenderAssetMap:
+    """
+    In-memory map of assets referenced by a single render.
+
+    Assets (charts, etc.) are registered under ``asset:`` URLs and served to
+    WeasyPrint through :meth:`url_fetcher`, so their bytes are handed over by
+    reference instead of being base64-encoded into the HTML string. Remote
+    (http/https) URLs passed to :meth:`prefetch` are only ever served from
+    the local :class:`AssetCache`; any other remote URL is fetched as
+    WeasyPrint normally would.
+    """
+
+    MIME_TYPES = {
+        "svg": "image/svg+xml",
+        "png": "image/png",
+        "jpeg": "image/jpeg",
+        "webp": "image/webp",
+    }
+
+    def __init__(self, asset_cache: Optional[AssetCache] = None):
+        self._assets: Dict[str, Tuple[bytes, str]] = {}
+        self._prefetched: Set[str] = set()
+        self.asset_cache = asset_cache or AssetCache()
+
+    async def prefetch(self, urls: Iterable[Optional[str]]) -> Dict[str, bool]:
+        """
+        Prefetch remote assets into the asset cache ahead of the render.
+
+        Returns:
+            Dict of URL -> whether it is available from the cache.
+        """
+        results = await self.asset_cache.prefetch(urls)
+        self._prefetched.update(results)
+        return results
+
+    def register(self, data: bytes, fmt: str = "png", name: Optional[str] = None) -> str:
+        """
+        Register an asset and return the URL to reference it by.
+
+        Args:
+            data: Raw asset bytes.
+            fmt: Asset format ('svg', 'png', ...).
+            name: Optional stable name; a random one is used if omitted.
+
+        Returns:
+            The ``asset:`` URL for use in ``src``/``href`` attributes.
+        """
+        url = f"{ASSET_SCHEME}{name or uuid4().hex}.{fmt}"
+        mime_type = self.MIME_TYPES.get(fmt, "application/octet-stream")
+        self._assets[url] = (data, mime_type)
+        return url
+
+    def get(self, url: str) -> Optional[Tuple[bytes, str]]:
+        """Get a registered asset's bytes and MIME type."""
+        return self._assets.get(url)
+
+    def url_fetcher(self, url: str, timeout: int = 10, ssl_context=None) -> dict:
+        """WeasyPrint URL fetcher serving registered assets from memory."""
+        asset = self._assets.get(url)
+        if asset is not None:
+            data, mime_type = asset
+            return {"string": data, "mime_type": mime_type, "redirected_url": url}
+
+        if AssetCache.is_remote(url):
+            cached = self.asset_cache.read(url)
+            if cached is not None:
+                data, mime_type = cached
+                return {"string": data, "mime_type": mime_type, "redirected_url": url}
+            if url in self._prefetched:
+                # Its download already failed; never block a render on it again
+                raise ValueError(f"Remote asset unavailable: {url}")
+
+        from weasyprint import default_url_fetcher
+
+        return default_url_fetcher(url, timeout=timeout, ssl_context=ssl_context)
+
+    def __len__(self) -> int:
+        return len(self._assets)
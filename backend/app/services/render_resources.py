@@ -0,0 +1,309 @@
+"""Process-wide fonts and cached remote assets for PDF rendering."""
+
+import asyncio
+import hashlib
+import io
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import httpx
+import structlog
+from PIL import Image, UnidentifiedImageError
+
+from app.config import settings
+from app.utils.cache import LRUCache
+
+logger = structlog.get_logger()
+
+
+class FontRegistry:
+    """
+    Bundled fonts registered once per render process.
+
+    Font files in ``app/templates/fonts`` named ``<Family>-<Style>.<ext>``
+    (e.g. ``Inter-SemiBold.woff2``) are declared with ``@font-face`` rules in a
+    single stylesheet that is parsed once, against one shared WeasyPrint
+    ``FontConfiguration``. Renders then reuse both instead of asking
+    fontconfig to resolve system fonts each time.
+    """
+
+    FONTS_PATH = Path(__file__).resolve().parent.parent / "templates" / "fonts"
+
+    FONT_EXTENSIONS = {".woff2", ".woff", ".ttf", ".otf"}
+
+    WEIGHTS = {
+        "thin": 100,
+        "extralight": 200,
+        "light": 300,
+        "regular": 400,
+        "medium": 500,
+        "semibold": 600,
+        "bold": 700,
+        "extrabold": 800,
+        "black": 900,
+    }
+
+    _font_config = None
+    _stylesheets: Optional[list] = None
+
+    @classmethod
+    def font_faces(cls) -> List[Dict[str, object]]:
+        """Describe every bundled font file as an ``@font-face`` declaration."""
+        if not cls.FONTS_PATH.is_dir():
+            return []
+
+        faces = []
+        for path in sorted(cls.FONTS_PATH.iterdir()):
+            if path.suffix.lower() not in cls.FONT_EXTENSIONS:
+                continue
+            family, _, style = path.stem.partition("-")
+            style = style.lower()
+            italic = style.endswith("italic")
+            weight = cls.WEIGHTS.get(style.replace("italic", "") or "regular", 400)
+            faces.append({
+                "family": family,
+                "weight": weight,
+                "style": "italic" if italic else "normal",
+                "src": path.as_uri(),
+            })
+        return faces
+
+    @classmethod
+    def font_face_css(cls) -> str:
+        """Build the ``@font-face`` stylesheet for the bundled fonts."""
+        return "\n".join(
+            f"@font-face {{ font-family: '{face['family']}'; src: url('{face['src']}'); "
+            f"font-weight: {face['weight']}; font-style: {face['style']}; }}"
+            for face in cls.font_faces()
+        )
+
+    @classmethod
+    def font_config(cls):
+        """The shared WeasyPrint font configuration for this process."""
+        if cls._font_config is None:
+            from weasyprint.text.fonts import FontConfiguration
+
+            cls._font_config = FontConfiguration()
+        return cls._font_config
+
+    @classmethod
+    def stylesheets(cls) -> list:
+        """Parsed ``@font-face`` stylesheets, built on first use."""
+        if cls._stylesheets is None:
+            from weasyprint import CSS
+
+            css = cls.font_face_css()
+            cls._stylesheets = (
+                [CSS(string=css, font_config=cls.font_config())] if css else []
+            )
+        return cls._stylesheets
+
+
+class AssetCache:
+    """
+    Local disk cache for remote images referenced by templates.
+
+    Agency and client logos are downloaded ahead of a render, downscaled and
+    stored under ``ASSET_CACHE_PATH`` keyed by URL hash. During the render the
+    URL fetcher only reads from this cache, so WeasyPrint never waits on the
+    network. Entries older than ``ASSET_CACHE_TTL`` are revalidated with the
+    origin (conditionally, by ETag/Last-Modified) so a logo replaced at the
+    same URL is picked up, and the directory is trimmed back to
+    ``ASSET_CACHE_MAX_BYTES`` by evicting the least recently used files.
+    Failed downloads are remembered for ``ASSET_NEGATIVE_TTL`` seconds so a
+    dead logo URL is not retried on every render.
+    """
+
+    MIME_TYPES = {".png": "image/png", ".svg": "image/svg+xml"}
+
+    # Sidecar with the fetch time and validators of a cached asset
+    META_SUFFIX = ".json"
+
+    _failures = LRUCache(maxsize=1024, ttl=settings.ASSET_NEGATIVE_TTL)
+
+    def __init__(
+        self,
+        cache_path: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+        ttl: Optional[float] = None,
+    ):
+        self.cache_path = Path(cache_path or settings.ASSET_CACHE_PATH)
+        self.max_bytes = settings.ASSET_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self.ttl = settings.ASSET_CACHE_TTL if ttl is None else ttl
+
+    @staticmethod
+    def is_remote(url: Optional[str]) -> bool:
+        """Whether a URL must be fetched over the network."""
+        return bool(url) and url.startswith(("http://", "https://"))
+
+    def read(self, url: str) -> Optional[Tuple[bytes, str]]:
+        """
+        Read a cached asset.
+
+        Returns:
+            Tuple of (bytes, MIME type), or None if the URL is not cached.
+        """
+        cached = self._cached(url)
+        if cached is None:
+            return None
+
+        path, mime_type = cached
+        try:
+            data = path.read_bytes()
+            # Touch so eviction sees it as recently used
+            os.utime(path)
+        except OSError:
+            return None
+        return data, mime_type
+
+    async def prefetch(self, urls: Iterable[Optional[str]]) -> Dict[str, bool]:
+        """
+        Make sure remote assets are in the local cache and fresh.
+
+        Args:
+            urls: Asset URLs; empty and non-HTTP values are ignored.
+
+        Returns:
+            Dict of URL -> whether it is available from the cache.
+        """
+        results = {}
+        pending = []
+        for url in dict.fromkeys(u for u in urls if self.is_remote(u)):
+            cached = self._cached(url) is not None
+            if cached and self._is_fresh(url):
+                results[url] = True
+            elif url in self._failures:
+                # Serve a stale copy rather than none while the origin is down
+                results[url] = cached
+            else:
+                pending.append(url)
+
+        if pending:
+            async with httpx.AsyncClient(
+                timeout=settings.ASSET_FETCH_TIMEOUT,
+                follow_redirects=True,
+            ) as client:
+                fetched = await asyncio.gather(*(self._fetch(client, url) for url in pending))
+            results.update(zip(pending, fetched))
+            self._enforce_budget()
+
+        return results
+
+    async def _fetch(self, client: httpx.AsyncClient, url: str) -> bool:
+        """Download (or revalidate), normalize and store one asset."""
+        meta = self._read_meta(url) if self._cached(url) is not None else {}
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+        try:
+            response = await client.get(url, headers=headers)
+            if response.status_code == 304 and headers:
+                self._write_meta(url, {**meta, "fetched_at": time.time()})
+                return True
+            response.raise_for_status()
+            data, suffix = self._normalize(
+                response.content,
+                response.headers.get("content-type", ""),
+            )
+            self._write(self._path(url, suffix), data)
+            for other in self.MIME_TYPES:
+                if other != suffix:
+                    self._path(url, other).unlink(missing_ok=True)
+            self._write_meta(url, {
+                "fetched_at": time.time(),
+                "etag": response.headers.get("etag"),
+                "last_modified": response.headers.get("last-modified"),
+            })
+            return True
+        except (httpx.HTTPError, UnidentifiedImageError, OSError) as e:
+            self._failures.set(url, True)
+            logger.warning("asset_prefetch_failed", url=url, error=str(e))
+            return self._cached(url) is not None
+
+    @staticmethod
+    def _normalize(data: bytes, content_type: str) -> Tuple[bytes, str]:
+        """Downscale raster images to the render width; keep SVG as-is."""
+        if "svg" in content_type or data.lstrip()[:5] in (b"<?xml", b"<svg "):
+            return data, ".svg"
+
+        image = Image.open(io.BytesIO(data))
+        image.thumbnail((settings.ASSET_MAX_WIDTH, settings.ASSET_MAX_WIDTH), Image.LANCZOS)
+        if image.mode not in ("RGB", "RGBA", "L", "LA"):
+            image = image.convert("RGBA")
+        buf = io.BytesIO()
+        image.save(buf, format="PNG", optimize=True)
+        return buf.getvalue(), ".png"
+
+    def _cached(self, url: str) -> Optional[Tuple[Path, str]]:
+        """The cached file of a URL and its MIME type, if any."""
+        for suffix, mime_type in self.MIME_TYPES.items():
+            path = self._path(url, suffix)
+            if path.exists():
+                return path, mime_type
+        return None
+
+    def _is_fresh(self, url: str) -> bool:
+        """Whether a cached asset was fetched or revalidated within the TTL."""
+        fetched_at = self._read_meta(url).get("fetched_at")
+        return isinstance(fetched_at, (int, float)) and time.time() - fetched_at < self.ttl
+
+    def _read_meta(self, url: str) -> Dict[str, Any]:
+        try:
+            meta = json.loads(self._path(url, self.META_SUFFIX).read_text())
+        except (OSError, ValueError):
+            return {}
+        return meta if isinstance(meta, dict) else {}
+
+    def _write_meta(self, url: str, meta: Dict[str, Any]) -> None:
+        self._write(self._path(url, self.META_SUFFIX), json.dumps(meta).encode())
+
+    def _enforce_budget(self) -> None:
+        """
+        Delete least recently used assets until usage is down to 90% of the budget.
+
+        Runs after network fetches only, which are rare, so it scans the
+        directory rather than tracking its size; that also counts assets
+        written by other processes sharing the directory.
+        """
+        if self.max_bytes <= 0 or not self.cache_path.is_dir():
+            return
+
+        entries = []
+        for path in self.cache_path.iterdir():
+            if path.suffix not in self.MIME_TYPES:
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            return
+
+        target = int(self.max_bytes * 0.9)
+        for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+            if total <= target:
+                break
+            path.unlink(missing_ok=True)
+            path.with_suffix(self.META_SUFFIX).unlink(missing_ok=True)
+            total -= size
+
+    def _path(self, url: str, suffix: str) -> Path:
+        """Cache file path for a URL."""
+        return self.cache_path / f"{hashlib.sha256(url.encode()).hexdigest()}{suffix}"
+
+    @staticmethod
+    def _write(path: Path, data: bytes) -> None:
+        """Write a cache file atomically so readers never see partial files."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f"{path.suffix}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
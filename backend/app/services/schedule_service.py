@@ -1,12 +1,14 @@
 """Schedule service."""
 
-from typing import List, Optional, Tuple
+from typing import List, Optional, Sequence
 from datetime import datetime
 
-from sqlalchemy import func, select, and_
+from sqlalchemy import select, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import ScheduledContent, Client
+from app.utils.fields import load_columns
+from app.utils.pagination import Page, paginate
 
 
 class ScheduleService:
@@ -14,14 +16,20 @@ class ScheduleService:
 
     @staticmethod
     async def get_by_id(
-        db: AsyncSession, schedule_id: str, agency_id: str
+        db: AsyncSession,
+        schedule_id: str,
+        agency_id: str,
+        columns: Optional[Sequence[str]] = None,
     ) -> Optional[ScheduledContent]:
-        """Get scheduled content by ID within an agency."""
-        result = await db.execute(
+        """Get scheduled content by ID within an agency, optionally only some columns."""
+        query = (
             select(ScheduledContent)
             .join(Client, ScheduledContent.client_id == Client.id)
             .where(ScheduledContent.id == schedule_id, Client.agency_id == agency_id)
         )
+        if columns:
+            query = query.options(load_columns(ScheduledContent, columns))
+        result = await db.execute(query)
         return result.scalar_one_or_none()
 
     @staticmethod
@@ -33,8 +41,11 @@ class ScheduleService:
         client_id: Optional[str] = None,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
-    ) -> Tuple[List[ScheduledContent], int]:
-        """List scheduled content for an agency with pagination."""
+        cursor: Optional[str] = None,
+        count: str = "cached",
+        columns: Optional[Sequence[str]] = None,
+    ) -> Page[ScheduledContent]:
+        """List scheduled content for an agency, soonest first, by cursor or page."""
         base_conditions = [Client.agency_id == agency_id]
 
         if client_id:
@@ -44,28 +55,26 @@ class ScheduleService:
         if end_date:
             base_conditions.append(ScheduledContent.scheduled_date <= end_date)
 
-        # Build query
         query = (
             select(ScheduledContent)
             .join(Client, ScheduledContent.client_id == Client.id)
             .where(and_(*base_conditions))
         )
-        count_query = (
-            select(func.count(ScheduledContent.id))
-            .join(Client, ScheduledContent.client_id == Client.id)
-            .where(and_(*base_conditions))
-        )
-
-        # Get total count
-        total = await db.scalar(count_query)
-
-        # Get paginated results
-        query = query.order_by(ScheduledContent.scheduled_date.asc())
-        query = query.offset((page - 1) * per_page).limit(per_page)
-        result = await db.execute(query)
-        items = result.scalars().all()
+        if columns:
+            query = query.options(
+                load_columns(ScheduledContent, [*columns, "scheduled_date", "id"])
+            )
 
-        return list(items), total or 0
+        return await paginate(
+            db,
+            query,
+            order_by=[(ScheduledContent.scheduled_date, False), (ScheduledContent.id, False)],
+            limit=per_page,
+            cursor=cursor,
+            page=page,
+            count=count,
+            count_key=("schedule", agency_id, client_id, start_date, end_date),
+        )
 
     @staticmethod
     async def create(
@@ -0,0 +1,137 @@
+"""Short-lived signed URLs for stored files."""
+
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import math
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from app.config import settings
+
+
+class SignedURL(NamedTuple):
+    """A URL that grants access to one file until it expires."""
+
+    url: str
+    expires_at: datetime
+
+
+class SignedFile(NamedTuple):
+    """The file a verified local signed URL points to."""
+
+    path: str
+    filename: Optional[str]
+    media_type: Optional[str]
+    expires_at: int  # Epoch seconds
+
+
+@lru_cache(maxsize=4)
+def _signing_key(secret: str) -> bytes:
+    """Key for local URL signatures, separate from other uses of the secret."""
+    return hmac.new(secret.encode(), b"signed-url", hashlib.sha256).digest()
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+class SignedURLService:
+    """
+    Issue and verify direct download URLs.
+
+    With S3 storage the URL is an S3 presigned GET, so bytes never pass
+    through the API. With local storage it is `/api/v1/files/<token>`, where
+    the token carries the path and expiry and an HMAC over both; the files
+    route checks it without authentication or a database query.
+
+    Expiry times are rounded up to a multiple of the TTL, so the same file
+    gets the same URL for a while and clients can cache it.
+    """
+
+    @staticmethod
+    def sign(
+        path: str,
+        filename: Optional[str] = None,
+        media_type: Optional[str] = None,
+        ttl: Optional[int] = None,
+    ) -> SignedURL:
+        """
+        Create a signed URL for a stored file.
+
+        Args:
+            path: File path/URL from `StorageService.save_file`.
+            filename: Download filename; served as an attachment if given.
+            media_type: Content type to serve the file with.
+            ttl: Minimum lifetime in seconds (default SIGNED_URL_TTL).
+
+        Returns:
+            The URL and its expiry.
+        """
+        ttl = ttl or settings.SIGNED_URL_TTL
+        expires = math.ceil((time.time() + ttl) / ttl) * ttl
+        expires_at = datetime.fromtimestamp(expires, tz=timezone.utc)
+
+        if settings.STORAGE_TYPE == "s3":
+            from app.services.storage_service import StorageService
+
+            url = StorageService().presigned_url(
+                path, int(expires - time.time()), filename, media_type
+            )
+            return SignedURL(url, expires_at)
+
+        payload = _b64encode(
+            json.dumps(
+                {"p": path, "e": expires, "f": filename, "m": media_type},
+                separators=(",", ":"),
+            ).encode()
+        )
+        signature = _b64encode(
+            hmac.new(_signing_key(settings.SECRET_KEY), payload.encode(), hashlib.sha256).digest()
+        )
+        return SignedURL(f"/api/v1/files/{payload}.{signature}", expires_at)
+
+    @staticmethod
+    def verify(token: str) -> SignedFile:
+        """
+        Verify a local signed URL token.
+
+        Args:
+            token: Last path segment of the URL.
+
+        Returns:
+            The file it grants access to.
+
+        Raises:
+            ValueError: If the token is malformed, tampered with, expired or
+                points outside local storage.
+        """
+        payload, _, signature = token.partition(".")
+        expected = hmac.new(
+            _signing_key(settings.SECRET_KEY), payload.encode(), hashlib.sha256
+        ).digest()
+        try:
+            valid = hmac.compare_digest(_b64decode(signature), expected)
+            data = json.loads(_b64decode(payload)) if valid else None
+        except (binascii.Error, ValueError) as e:
+            raise ValueError("Invalid signed URL") from e
+        if not valid:
+            raise ValueError("Invalid signed URL")
+
+        if data["e"] < time.time():
+            raise ValueError("Signed URL expired")
+
+        root = Path(settings.STORAGE_LOCAL_PATH).resolve()
+        if not Path(data["p"]).resolve().is_relative_to(root):
+            raise ValueError("Invalid signed URL")
+
+        return SignedFile(data["p"], data.get("f"), data.get("m"), data["e"])
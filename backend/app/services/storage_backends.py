@@ -0,0 +1,638 @@
+"""Async storage backends behind StorageService."""
+
+import asyncio
+import fcntl
+import functools
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import aclosing
+from pathlib import Path
+from typing import AsyncIterator, Dict, NamedTuple, Optional, Tuple
+
+import aiofiles
+import structlog
+
+from app.config import settings
+from app.utils import metrics
+from app.utils.cache import LRUCache
+
+logger = structlog.get_logger()
+
+
+class FileStat(NamedTuple):
+    """Size and validators of a stored file."""
+
+    size: int
+    etag: str
+    last_modified: float  # Epoch seconds
+
+
+class StorageBackend(ABC):
+    """
+    Where stored files live.
+
+    Paths are the strings returned by `save` and kept on the models
+    (`Document.pdf_url`, `cover_image_url`, ...).
+    """
+
+    @abstractmethod
+    async def save(self, content: bytes, key: str) -> str:
+        """Store content under a key (`folder/filename`) and return its path."""
+
+    @abstractmethod
+    async def read(self, path: str) -> Optional[bytes]:
+        """Read a whole file, or None if it does not exist."""
+
+    @abstractmethod
+    def stream(
+        self, path: str, start: int = 0, end: Optional[int] = None
+    ) -> AsyncIterator[bytes]:
+        """Stream bytes start..end (inclusive) in STORAGE_CHUNK_SIZE chunks."""
+
+    @abstractmethod
+    async def stat(self, path: str) -> Optional[FileStat]:
+        """Size and validators of a file, or None if it does not exist."""
+
+    @abstractmethod
+    async def delete(self, path: str) -> bool:
+        """Delete a file. Returns whether it existed."""
+
+    def presigned_url(
+        self,
+        path: str,
+        expires_in: int,
+        filename: Optional[str] = None,
+        media_type: Optional[str] = None,
+    ) -> str:
+        """Direct download URL, for backends that can issue one."""
+        raise NotImplementedError(f"{type(self).__name__} does not issue presigned URLs")
+
+
+class LocalBackend(StorageBackend):
+    """Files on the local filesystem under STORAGE_LOCAL_PATH."""
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+
+    async def save(self, content: bytes, key: str) -> str:
+        file_path = self.root / key
+        await asyncio.to_thread(file_path.parent.mkdir, parents=True, exist_ok=True)
+        async with aiofiles.open(file_path, "wb") as f:
+            await f.write(content)
+        return str(file_path)
+
+    async def read(self, path: str) -> Optional[bytes]:
+        try:
+            async with aiofiles.open(path, "rb") as f:
+                return await f.read()
+        except FileNotFoundError:
+            return None
+
+    async def stream(
+        self, path: str, start: int = 0, end: Optional[int] = None
+    ) -> AsyncIterator[bytes]:
+        chunk_size = settings.STORAGE_CHUNK_SIZE
+        async with aiofiles.open(path, "rb") as f:
+            await f.seek(start)
+            remaining = None if end is None else end - start + 1
+            while remaining is None or remaining > 0:
+                size = chunk_size if remaining is None else min(chunk_size, remaining)
+                chunk = await f.read(size)
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+
+    async def stat(self, path: str) -> Optional[FileStat]:
+        try:
+            stat = await asyncio.to_thread(os.stat, path)
+        except FileNotFoundError:
+            return None
+        tag = hashlib.md5(f"{stat.st_mtime}-{stat.st_size}".encode(), usedforsecurity=False)
+        return FileStat(stat.st_size, f'"{tag.hexdigest()}"', stat.st_mtime)
+
+    async def delete(self, path: str) -> bool:
+        try:
+            await asyncio.to_thread(os.remove, path)
+            return True
+        except FileNotFoundError:
+            return False
+
+
+class S3Backend(StorageBackend):
+    """
+    Objects in an S3 bucket (or an S3-compatible service via AWS_S3_ENDPOINT_URL).
+
+    One boto3 client, whose connection pool holds STORAGE_S3_MAX_CONNECTIONS
+    keep-alive connections, is shared by the process. Its blocking calls run
+    on a dedicated thread pool of the same size, never on the event loop.
+    Uploads of STORAGE_MULTIPART_THRESHOLD bytes or more are sent as
+    multipart uploads with STORAGE_MULTIPART_CONCURRENCY parts in flight.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        endpoint_url: Optional[str] = None,
+        region: Optional[str] = None,
+        client=None,
+    ):
+        # boto3 is only needed (and only imported) for S3 storage
+        import boto3
+        from boto3.s3.transfer import TransferConfig
+        from botocore.config import Config
+        from botocore.exceptions import ClientError
+
+        self.bucket = bucket
+        self.client = client or boto3.session.Session().client(
+            "s3",
+            endpoint_url=endpoint_url or None,
+            region_name=region or None,
+            config=Config(
+                max_pool_connections=settings.STORAGE_S3_MAX_CONNECTIONS,
+                retries={"max_attempts": 3, "mode": "standard"},
+            ),
+        )
+        self.transfer_config = TransferConfig(
+            multipart_threshold=settings.STORAGE_MULTIPART_THRESHOLD,
+            multipart_chunksize=settings.STORAGE_MULTIPART_CHUNK_SIZE,
+            max_concurrency=settings.STORAGE_MULTIPART_CONCURRENCY,
+        )
+        self.client_error = ClientError
+        self._executor = ThreadPoolExecutor(
+            max_workers=settings.STORAGE_S3_MAX_CONNECTIONS, thread_name_prefix="s3"
+        )
+
+    def key(self, path: str) -> str:
+        """Object key of a stored path."""
+        return path.replace(f"s3://{self.bucket}/", "")
+
+    async def _call(self, func, *args, **kwargs):
+        """Run a blocking client call on the S3 thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    async def save(self, content: bytes, key: str) -> str:
+        if len(content) >= settings.STORAGE_MULTIPART_THRESHOLD:
+            await self._call(
+                self.client.upload_fileobj,
+                io.BytesIO(content),
+                self.bucket,
+                key,
+                Config=self.transfer_config,
+            )
+        else:
+            await self._call(self.client.put_object, Bucket=self.bucket, Key=key, Body=content)
+        return f"s3://{self.bucket}/{key}"
+
+    async def read(self, path: str) -> Optional[bytes]:
+        try:
+            response = await self._call(
+                self.client.get_object, Bucket=self.bucket, Key=self.key(path)
+            )
+            body = response["Body"]
+            try:
+                return await self._call(body.read)
+            finally:
+                body.close()
+        except self.client_error:
+            return None
+
+    async def stream(
+        self, path: str, start: int = 0, end: Optional[int] = None
+    ) -> AsyncIterator[bytes]:
+        response = await self._call(
+            self.client.get_object,
+            Bucket=self.bucket,
+            Key=self.key(path),
+            Range=f"bytes={start}-{'' if end is None else end}",
+        )
+        body = response["Body"]
+        try:
+            chunks = body.iter_chunks(settings.STORAGE_CHUNK_SIZE)
+            while True:
+                chunk = await self._call(next, chunks, None)
+                if chunk is None:
+                    break
+                yield chunk
+        finally:
+            body.close()
+
+    async def stat(self, path: str) -> Optional[FileStat]:
+        try:
+            head = await self._call(
+                self.client.head_object, Bucket=self.bucket, Key=self.key(path)
+            )
+        except self.client_error:
+            return None
+        return FileStat(head["ContentLength"], head["ETag"], head["LastModified"].timestamp())
+
+    async def delete(self, path: str) -> bool:
+        try:
+            await self._call(self.client.delete_object, Bucket=self.bucket, Key=self.key(path))
+            return True
+        except self.client_error:
+            return False
+
+    def presigned_url(
+        self,
+        path: str,
+        expires_in: int,
+        filename: Optional[str] = None,
+        media_type: Optional[str] = None,
+    ) -> str:
+        params = {"Bucket": self.bucket, "Key": self.key(path)}
+        if filename:
+            params["ResponseContentDisposition"] = f'attachment; filename="{filename}"'
+        if media_type:
+            params["ResponseContentType"] = media_type
+        return self.client.generate_presigned_url(
+            "get_object", Params=params, ExpiresIn=expires_in
+        )
+
+    def close(self) -> None:
+        """Stop the thread pool."""
+        self._executor.shutdown(wait=False)
+
+
+class CachingBackend(StorageBackend):
+    """
+    Local disk cache in front of a remote backend.
+
+    Whole-file reads go through the cache: a miss downloads the object to a
+    temporary file (so memory use stays constant), records its size,
+    SHA-256 and the remote validators in a sidecar `.meta` file and renames
+    both into place, meta last, so readers never see a partial entry.
+    Streams never wait on a download: a full-file stream is teed into the
+    cache as it is sent, and a ranged stream is served from the remote while
+    the object is cached in the background. Saves write through to the
+    cache, deletes invalidate it.
+
+    Cached entries are revalidated against the remote ETag at most every
+    STORAGE_CACHE_REVALIDATE_TTL seconds per process, so an object
+    overwritten by another host is dropped rather than served stale.
+    Whole-file reads are checked against the stored checksum and ranged
+    reads against the stored size; a corrupt entry is dropped and the remote
+    used instead.
+
+    The directory may be shared by every process on the host, so the size
+    budget is enforced from the disk, not from per-process counts: after
+    writing SCAN_SLACK of `max_bytes`, or STORAGE_CACHE_SCAN_INTERVAL
+    seconds after its last scan, a process scans the directory under a file
+    lock and deletes least recently used entries down to 90% of
+    `max_bytes`. Hits and misses are counted in the `storage_cache_hits` and
+    `storage_cache_misses` metrics, which every process logs each
+    METRICS_LOG_INTERVAL seconds.
+    """
+
+    # Fraction of the budget a process may write between scans
+    SCAN_SLACK = 0.05
+
+    def __init__(self, remote: StorageBackend, path: str, max_bytes: int):
+        self.remote = remote
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.hits = metrics.counter("storage_cache_hits")
+        self.misses = metrics.counter("storage_cache_misses")
+        self._files = LocalBackend(str(self.path))
+        # Path -> ETag last confirmed against the remote
+        self._validated = LRUCache(maxsize=4096, ttl=settings.STORAGE_CACHE_REVALIDATE_TTL)
+        self._fills: Dict[str, asyncio.Task] = {}
+        self._unscanned_bytes = 0
+        self._last_scan: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of reads served from disk."""
+        total = self.hits.value + self.misses.value
+        return self.hits.value / total if total else 0.0
+
+    async def save(self, content: bytes, key: str) -> str:
+        path = await self.remote.save(content, key)
+        stat = await self.remote.stat(path)
+        if stat is not None:
+            await asyncio.to_thread(self._store, path, content, stat)
+            self._validated.set(path, stat.etag)
+        return path
+
+    async def read(self, path: str) -> Optional[bytes]:
+        entry = await self._cached(path)
+        if entry is None:
+            stat = await self.remote.stat(path)
+            entry = await self._download(path, stat) if stat else None
+        if entry is None:
+            return await self.remote.read(path)
+
+        data = await asyncio.to_thread(self._read_verified, *entry)
+        if data is not None:
+            return data
+
+        await asyncio.to_thread(self._invalidate, path)
+        return await self.remote.read(path)
+
+    async def stream(
+        self, path: str, start: int = 0, end: Optional[int] = None
+    ) -> AsyncIterator[bytes]:
+        entry = await self._cached(path)
+        if entry is not None:
+            chunks = self._files.stream(str(entry[0]), start, end)
+        elif start == 0 and end is None:
+            chunks = self._tee(path)
+        else:
+            self._fill_in_background(path)
+            chunks = self.remote.stream(path, start, end)
+        # Close the source right away if the client goes away mid-stream
+        async with aclosing(chunks):
+            async for chunk in chunks:
+                yield chunk
+
+    async def stat(self, path: str) -> Optional[FileStat]:
+        entry = await asyncio.to_thread(self._lookup, path)
+        if entry is None or not await self._revalidate(path, entry[1]):
+            return await self.remote.stat(path)
+        meta = entry[1]
+        return FileStat(meta["size"], meta["etag"], meta["last_modified"])
+
+    async def delete(self, path: str) -> bool:
+        await asyncio.to_thread(self._invalidate, path)
+        return await self.remote.delete(path)
+
+    def presigned_url(
+        self,
+        path: str,
+        expires_in: int,
+        filename: Optional[str] = None,
+        media_type: Optional[str] = None,
+    ) -> str:
+        return self.remote.presigned_url(path, expires_in, filename, media_type)
+
+    async def _cached(self, path: str) -> Optional[Tuple[Path, dict]]:
+        """Current cached entry for a path, or None on a miss."""
+        entry = await asyncio.to_thread(self._lookup, path)
+        if entry is not None and not await self._revalidate(path, entry[1]):
+            entry = None
+        (self.hits if entry else self.misses).inc()
+        return entry
+
+    async def _revalidate(self, path: str, meta: dict) -> bool:
+        """Whether an entry still matches the remote; drops it if not."""
+        if self._validated.get(path) == meta["etag"]:
+            return True
+        stat = await self.remote.stat(path)
+        if stat is None or stat.etag != meta["etag"]:
+            await asyncio.to_thread(self._invalidate, path)
+            return False
+        self._validated.set(path, stat.etag)
+        return True
+
+    async def _download(self, path: str, stat: FileStat) -> Optional[Tuple[Path, dict]]:
+        """Copy an object into the cache and return its entry."""
+        blob, _ = self._paths(path)
+        tmp_path = self._tmp(blob)
+        digest = hashlib.sha256()
+        await asyncio.to_thread(blob.parent.mkdir, parents=True, exist_ok=True)
+        try:
+            async with aiofiles.open(tmp_path, "wb") as f:
+                async for chunk in self.remote.stream(path):
+                    digest.update(chunk)
+                    await f.write(chunk)
+            return await asyncio.to_thread(self._commit, path, tmp_path, digest.hexdigest(), stat)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+    async def _tee(self, path: str) -> AsyncIterator[bytes]:
+        """Stream a whole object from the remote, caching it on the way."""
+        stat = await self.remote.stat(path)
+        blob, _ = self._paths(path)
+        tmp_path = self._tmp(blob)
+        digest = hashlib.sha256()
+        sink = None
+        if stat is not None:
+            try:
+                await asyncio.to_thread(blob.parent.mkdir, parents=True, exist_ok=True)
+                sink = await aiofiles.open(tmp_path, "wb")
+            except OSError:
+                sink = None
+        try:
+            async for chunk in self.remote.stream(path):
+                if sink is not None:
+                    try:
+                        digest.update(chunk)
+                        await sink.write(chunk)
+                    except OSError:
+                        # The cache is best-effort; keep serving the client
+                        await sink.close()
+                        sink = None
+                yield chunk
+            if sink is not None:
+                await sink.close()
+                sink = None
+                await asyncio.to_thread(self._commit, path, tmp_path, digest.hexdigest(), stat)
+        finally:
+            # Also reached when the client goes away mid-stream
+            if sink is not None:
+                await sink.close()
+            tmp_path.unlink(missing_ok=True)
+
+    def _fill_in_background(self, path: str) -> None:
+        """Start caching an object unless this process is already doing so."""
+        if path in self._fills:
+            return
+        task = asyncio.get_running_loop().create_task(self._fill(path))
+        self._fills[path] = task
+        task.add_done_callback(lambda _: self._fills.pop(path, None))
+
+    async def _fill(self, path: str) -> None:
+        try:
+            stat = await self.remote.stat(path)
+            if stat is not None:
+                await self._download(path, stat)
+        except Exception as e:
+            logger.warning("storage_cache_fill_failed", path=path, error=str(e))
+
+    def _paths(self, path: str) -> Tuple[Path, Path]:
+        """Blob and meta file of a stored path, fanned out by hash prefix."""
+        key = hashlib.sha256(path.encode()).hexdigest()
+        folder = self.path / key[:2]
+        return folder / f"{key}.blob", folder / f"{key}.meta"
+
+    @staticmethod
+    def _tmp(path: Path) -> Path:
+        return path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+
+    def _lookup(self, path: str) -> Optional[Tuple[Path, dict]]:
+        """Read an entry's metadata and mark it recently used."""
+        blob, meta_path = self._paths(path)
+        try:
+            meta = json.loads(meta_path.read_text())
+            size = blob.stat().st_size
+        except (OSError, ValueError):
+            return None
+        if size != meta.get("size"):
+            self._invalidate(path)
+            return None
+
+        # Touch so eviction sees it as recently used
+        try:
+            os.utime(blob)
+        except OSError:
+            return None
+        return blob, meta
+
+    @staticmethod
+    def _read_verified(blob: Path, meta: dict) -> Optional[bytes]:
+        """Read a blob if it matches its checksum."""
+        try:
+            data = blob.read_bytes()
+        except OSError:
+            return None
+        return data if hashlib.sha256(data).hexdigest() == meta["sha256"] else None
+
+    def _store(self, path: str, content: bytes, stat: FileStat) -> None:
+        """Write an entry from bytes in memory."""
+        blob, _ = self._paths(path)
+        tmp_path = self._tmp(blob)
+        try:
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_bytes(content)
+            self._commit(path, tmp_path, hashlib.sha256(content).hexdigest(), stat)
+        except OSError:
+            # The cache is best-effort; the remote has the file
+            tmp_path.unlink(missing_ok=True)
+
+    def _commit(
+        self, path: str, tmp_path: Path, sha256: str, stat: FileStat
+    ) -> Optional[Tuple[Path, dict]]:
+        """Move a fully written blob into place and record its metadata."""
+        size = tmp_path.stat().st_size
+        if size != stat.size:
+            # The object changed while it was being copied
+            return None
+
+        blob, meta_path = self._paths(path)
+        meta = {
+            "path": path,
+            "size": size,
+            "sha256": sha256,
+            "etag": stat.etag,
+            "last_modified": stat.last_modified,
+        }
+        try:
+            replaced = blob.stat().st_size
+        except OSError:
+            replaced = 0
+        tmp_meta = self._tmp(meta_path)
+        tmp_meta.write_text(json.dumps(meta))
+        os.replace(tmp_path, blob)
+        os.replace(tmp_meta, meta_path)
+
+        self._account(size - replaced)
+        return (blob, meta) if blob.exists() else None
+
+    def _account(self, added: int) -> None:
+        """Record bytes written and enforce the budget when a scan is due."""
+        now = time.monotonic()
+        with self._lock:
+            self._unscanned_bytes += added
+            due = (
+                self._last_scan is None
+                or self._unscanned_bytes >= self.max_bytes * self.SCAN_SLACK
+                or now - self._last_scan >= settings.STORAGE_CACHE_SCAN_INTERVAL
+            )
+            if not due:
+                return
+            self._unscanned_bytes = 0
+            self._last_scan = now
+        self._enforce_budget()
+
+    def _invalidate(self, path: str) -> None:
+        """Drop an entry."""
+        self._validated.delete(path)
+        blob, meta_path = self._paths(path)
+        meta_path.unlink(missing_ok=True)
+        blob.unlink(missing_ok=True)
+
+    def _enforce_budget(self) -> None:
+        """
+        Scan the directory and, if it is over budget, delete least recently
+        used entries until it is down to 90% of `max_bytes`.
+
+        One process scans at a time; if another holds the lock, its scan
+        already covers this process's writes.
+        """
+        self.path.mkdir(parents=True, exist_ok=True)
+        with open(self.path / ".lock", "a") as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return
+
+            entries = []
+            for blob in self._blobs():
+                try:
+                    stat = blob.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, blob))
+
+            total = sum(size for _, size, _ in entries)
+            if total <= self.max_bytes:
+                return
+            target = int(self.max_bytes * 0.9)
+            for _, size, blob in sorted(entries, key=lambda entry: entry[0]):
+                if total <= target:
+                    break
+                blob.with_suffix(".meta").unlink(missing_ok=True)
+                blob.unlink(missing_ok=True)
+                total -= size
+
+    def _blobs(self):
+        """Cached blob files on disk."""
+        if not self.path.is_dir():
+            return []
+        return list(self.path.glob("*/*.blob"))
+
+
+@functools.lru_cache(maxsize=4)
+def _backend(
+    storage_type: str,
+    local_path: str,
+    bucket: str,
+    endpoint_url: str,
+    region: str,
+    cache_path: str,
+    cache_max_bytes: int,
+):
+    if storage_type != "s3":
+        return LocalBackend(local_path)
+    backend = S3Backend(bucket, endpoint_url, region)
+    if cache_max_bytes > 0:
+        return CachingBackend(backend, cache_path, cache_max_bytes)
+    return backend
+
+
+def get_backend() -> StorageBackend:
+    """The process-wide backend for the configured storage."""
+    return _backend(
+        settings.STORAGE_TYPE,
+        settings.STORAGE_LOCAL_PATH,
+        settings.AWS_S3_BUCKET,
+        settings.AWS_S3_ENDPOINT_URL,
+        settings.AWS_S3_REGION,
+        settings.STORAGE_CACHE_PATH,
+        settings.STORAGE_CACHE_MAX_BYTES,
+    )
+
+
+def reset_backends() -> None:
+    """Drop shared backends, e.g. after a fork (clients and pools are not shareable)."""
+    _backend.cache_clear()
@@ -1,27 +1,24 @@
 """File storage service."""
 
-import os
 import uuid
-from pathlib import Path
-from typing import Optional
+from typing import AsyncIterator, Optional
 
-import aiofiles
-import boto3
-from botocore.exceptions import ClientError
+from app.services.storage_backends import FileStat, StorageBackend, get_backend
 
-from app.config import settings
+__all__ = ["FileStat", "StorageService"]
 
 
 class StorageService:
-    """Service for file storage operations."""
+    """
+    Service for file storage operations.
 
-    def __init__(self):
-        self.storage_type = settings.STORAGE_TYPE
-        self.local_path = Path(settings.STORAGE_LOCAL_PATH)
+    Delegates to the process-wide backend for the configured STORAGE_TYPE
+    (see `app.services.storage_backends`), so creating a StorageService is
+    free and every instance shares one S3 client and connection pool.
+    """
 
-        if self.storage_type == "s3":
-            self.s3_client = boto3.client("s3")
-            self.bucket = os.getenv("AWS_S3_BUCKET")
+    def __init__(self, backend: Optional[StorageBackend] = None):
+        self.backend = backend or get_backend()
 
     async def save_file(
         self,
@@ -33,78 +30,56 @@ class StorageService:
         """Save a file and return the path/URL."""
         if not filename:
             filename = f"{uuid.uuid4()}{extension}"
+        return await self.backend.save(content, f"{folder}/{filename}")
 
-        if self.storage_type == "local":
-            return await self._save_local(content, folder, filename)
-        else:
-            return await self._save_s3(content, folder, filename)
+    async def get_file(self, path: str) -> Optional[bytes]:
+        """Get a file by path."""
+        return await self.backend.read(path)
 
-    async def _save_local(self, content: bytes, folder: str, filename: str) -> str:
-        """Save file to local filesystem."""
-        folder_path = self.local_path / folder
-        folder_path.mkdir(parents=True, exist_ok=True)
+    async def stat_file(self, path: str) -> Optional[FileStat]:
+        """Get the size and validators of a file, or None if it does not exist."""
+        return await self.backend.stat(path)
 
-        file_path = folder_path / filename
-        async with aiofiles.open(file_path, "wb") as f:
-            await f.write(content)
+    def iter_file(
+        self, path: str, start: int = 0, end: Optional[int] = None
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream a file in STORAGE_CHUNK_SIZE chunks.
 
-        return str(file_path)
+        Args:
+            path: File path/URL from `save_file`.
+            start: First byte offset.
+            end: Last byte offset (inclusive), or None for the end of the file.
 
-    async def _save_s3(self, content: bytes, folder: str, filename: str) -> str:
-        """Save file to S3."""
-        key = f"{folder}/{filename}"
-        self.s3_client.put_object(
-            Bucket=self.bucket,
-            Key=key,
-            Body=content,
-        )
-        return f"s3://{self.bucket}/{key}"
+        Returns:
+            Async iterator over chunks; memory use does not depend on file size.
+        """
+        return self.backend.stream(path, start, end)
 
-    async def get_file(self, path: str) -> Optional[bytes]:
-        """Get a file by path."""
-        if self.storage_type == "local":
-            return await self._get_local(path)
-        else:
-            return await self._get_s3(path)
-
-    async def _get_local(self, path: str) -> Optional[bytes]:
-        """Get file from local filesystem."""
-        try:
-            async with aiofiles.open(path, "rb") as f:
-                return await f.read()
-        except FileNotFoundError:
-            return None
-
-    async def _get_s3(self, path: str) -> Optional[bytes]:
-        """Get file from S3."""
-        try:
-            # Parse S3 path
-            key = path.replace(f"s3://{self.bucket}/", "")
-            response = self.s3_client.get_object(Bucket=self.bucket, Key=key)
-            return response["Body"].read()
-        except ClientError:
-            return None
+    def presigned_url(
+        self,
+        path: str,
+        expires_in: int,
+        filename: Optional[str] = None,
+        media_type: Optional[str] = None,
+    ) -> str:
+        """
+        Presigned GET URL of a stored file (computed locally, no request).
+
+        Args:
+            path: Path from `save_file`.
+            expires_in: Lifetime in seconds.
+            filename: Download filename; served as an attachment if given.
+            media_type: Content type override.
+
+        Returns:
+            The URL.
+
+        Raises:
+            NotImplementedError: If the backend cannot issue presigned URLs.
+        """
+        return self.backend.presigned_url(path, expires_in, filename, media_type)
 
     async def delete_file(self, path: str) -> bool:
         """Delete a file."""
-        if self.storage_type == "local":
-            return await self._delete_local(path)
-        else:
-            return await self._delete_s3(path)
-
-    async def _delete_local(self, path: str) -> bool:
-        """Delete file from local filesystem."""
-        try:
-            os.remove(path)
-            return True
-        except FileNotFoundError:
-            return False
-
-    async def _delete_s3(self, path: str) -> bool:
-        """Delete file from S3."""
-        try:
-            key = path.replace(f"s3://{self.bucket}/", "")
-            self.s3_client.delete_object(Bucket=self.bucket, Key=key)
-            return True
-        except ClientError:
-            return False
+        return await self.backend.delete(path)
@@ -0,0 +1,114 @@
+"""Document thumbnail generation service."""
+
+import asyncio
+import io
+import threading
+from pathlib import PurePosixPath
+from typing import Dict, Optional
+
+from PIL import Image
+
+from app.config import settings
+from app.models import Document
+from app.services.storage_service import StorageService
+
+# PDFium is not thread-safe; rasterization is serialized across threads
+_pdfium_lock = threading.Lock()
+
+
+class ThumbnailService:
+    """Service for rendering first-page thumbnails of finished PDFs."""
+
+    # Thumbnail widths in pixels
+    SIZES = {
+        "small": 160,
+        "card": 400,
+        "large": 800,
+    }
+
+    # The size stored on Document.cover_image_url
+    COVER_SIZE = "card"
+
+    MIME_TYPES = {"webp": "image/webp", "png": "image/png"}
+
+    def __init__(self, image_format: Optional[str] = None):
+        self.image_format = image_format or settings.THUMBNAIL_FORMAT
+
+    def render(self, pdf_bytes: bytes) -> Dict[str, bytes]:
+        """
+        Render page one of a PDF at every thumbnail size.
+
+        Args:
+            pdf_bytes: The PDF.
+
+        Returns:
+            Encoded images keyed by size name.
+        """
+        import pypdfium2 as pdfium
+
+        with _pdfium_lock:
+            pdf = pdfium.PdfDocument(pdf_bytes)
+            try:
+                page = pdf[0]
+                # Rasterize once at the largest size and downscale from there
+                scale = max(self.SIZES.values()) / page.get_width()
+                base = page.render(scale=scale).to_pil().convert("RGB")
+                page.close()
+            finally:
+                pdf.close()
+
+        images = {}
+        for size, width in self.SIZES.items():
+            height = round(base.height * width / base.width)
+            image = base if width == base.width else base.resize((width, height), Image.LANCZOS)
+            images[size] = self._encode(image)
+        return images
+
+    async def generate(
+        self,
+        document: Document,
+        pdf_bytes: bytes,
+        fingerprint: str,
+    ) -> Dict[str, str]:
+        """
+        Render and store thumbnails next to a document's PDF.
+
+        Filenames carry the render fingerprint, so a stored thumbnail never
+        changes and can be cached indefinitely.
+
+        Returns:
+            Storage paths keyed by size name.
+        """
+        storage_service = StorageService()
+        images = await asyncio.to_thread(self.render, pdf_bytes)
+        paths = {}
+        for size, data in images.items():
+            paths[size] = await storage_service.save_file(
+                data,
+                folder=f"documents/{document.agency_id}/thumbnails",
+                filename=f"{document.slug}-{fingerprint[:16]}-{size}.{self.image_format}",
+            )
+        return paths
+
+    @classmethod
+    def paths_for(cls, cover_image_url: str) -> Dict[str, str]:
+        """Storage paths of every size in the thumbnail set of a cover image."""
+        cover = PurePosixPath(cover_image_url)
+        prefix = cover.stem.rsplit("-", 1)[0]
+        folder = cover_image_url[: -len(cover.name)]
+        return {size: f"{folder}{prefix}-{size}{cover.suffix}" for size in cls.SIZES}
+
+    async def delete(self, cover_image_url: str) -> None:
+        """Delete a thumbnail set from storage."""
+        storage_service = StorageService()
+        for path in self.paths_for(cover_image_url).values():
+            await storage_service.delete_file(path)
+
+    def _encode(self, image: Image.Image) -> bytes:
+        """Encode a thumbnail in the configured format."""
+        buf = io.BytesIO()
+        if self.image_format == "webp":
+            image.save(buf, format="WEBP", quality=80, method=6)
+        else:
+            image.save(buf, format="PNG", optimize=True)
+        return buf.getvalue()
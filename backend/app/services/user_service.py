@@ -7,7 +7,9 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import User, Agency
+from app.services.agency_host_cache import AgencyHostCache, agency_keys
 from app.services.auth_service import AuthService
+from app.services.principal_cache import PrincipalCache
 
 
 class UserService:
@@ -40,7 +42,7 @@ class UserService:
         user = User(
             id=str(uuid4()),
             email=email.lower(),
-            hashed_password=AuthService.hash_password(password),
+            hashed_password=await AuthService.hash_password_async(password),
             first_name=first_name,
             last_name=last_name,
             role=role,
@@ -51,6 +53,9 @@ class UserService:
         db.add(user)
         await db.commit()
         await db.refresh(user)
+
+        # Role, active flag or agency may have changed
+        await PrincipalCache.invalidate(user.id)
         return user
 
     @staticmethod
@@ -81,7 +86,7 @@ class UserService:
         user = User(
             id=str(uuid4()),
             email=email.lower(),
-            hashed_password=AuthService.hash_password(password),
+            hashed_password=await AuthService.hash_password_async(password),
             first_name=first_name,
             last_name=last_name,
             role="agency_admin",
@@ -94,6 +99,9 @@ class UserService:
         await db.refresh(user)
         await db.refresh(agency)
 
+        # The new subdomain may be cached as unknown
+        await AgencyHostCache.invalidate(agency_keys(agency.subdomain, agency.custom_domain))
+
         return user, agency
 
     @staticmethod
@@ -102,9 +110,12 @@ class UserService:
         for key, value in kwargs.items():
             if hasattr(user, key) and value is not None:
                 if key == "password":
-                    user.hashed_password = AuthService.hash_password(value)
+                    user.hashed_password = await AuthService.hash_password_async(value)
                 else:
                     setattr(user, key, value)
         await db.commit()
         await db.refresh(user)
+
+        # Role, active flag or agency may have changed
+        await PrincipalCache.invalidate(user.id)
         return user
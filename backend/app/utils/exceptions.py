@@ -75,3 +75,15 @@ class ExternalServiceError(ContentStrategistException):
             details={"service": service},
             **kwargs,
         )
+
+
+class ServiceBusyError(ContentStrategistException):
+    """Too much work queued; the client should retry later."""
+
+    def __init__(self, message: str = "Service busy, retry later", retry_after: int = 1, **kwargs):
+        super().__init__(
+            message,
+            code="SERVICE_BUSY",
+            details={"retry_after": retry_after},
+            **kwargs,
+        )
@@ -0,0 +1,89 @@
+"""Sparse fieldsets (`?fields=`) for API responses."""
+
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Type
+
+from pydantic import BaseModel
+from sqlalchemy.orm import load_only
+
+
+def load_columns(model: Any, columns: Sequence[str]):
+    """Loader option selecting only the given columns of a model."""
+    return load_only(*(getattr(model, column) for column in columns))
+
+
+def _field_names(schema: Type[BaseModel]) -> List[str]:
+    """Declared and computed fields of a schema, in declaration order."""
+    return [*schema.model_fields, *schema.__pydantic_decorators__.computed_fields]
+
+
+class FieldSet:
+    """
+    Field selection for a response schema backed by an ORM model.
+
+    Resolves the `?fields=` parameter of an endpoint to the model columns
+    to load, and serializes rows loaded that way. Fields not requested are
+    neither selected from the database nor serialized, so heavy JSONB
+    columns only cost anything when asked for.
+    """
+
+    def __init__(
+        self,
+        model: Any,
+        schema: Type[BaseModel],
+        depends: Optional[Mapping[str, Iterable[str]]] = None,
+    ):
+        """
+        Args:
+            model: ORM model class.
+            schema: Response schema listing every selectable field.
+            depends: Columns read by the schema's computed fields.
+        """
+        self.model = model
+        self.schema = schema
+        self.available = set(_field_names(schema))
+        self.depends = {name: tuple(columns) for name, columns in (depends or {}).items()}
+
+    def parse(self, fields: Optional[str], default: Type[BaseModel]) -> Tuple[str, ...]:
+        """
+        Resolve a comma-separated `fields` parameter.
+
+        Args:
+            fields: Requested fields, or None for the default.
+            default: Schema whose fields are returned when none are requested.
+
+        Returns:
+            Field names; `id` is always included.
+
+        Raises:
+            ValueError: If an unknown field is requested.
+        """
+        if not fields:
+            requested = _field_names(default)
+        else:
+            requested = [name.strip() for name in fields.split(",") if name.strip()]
+            unknown = sorted(set(requested) - self.available)
+            if unknown:
+                raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+
+        return tuple(dict.fromkeys(["id", *requested]))
+
+    def columns(self, fields: Iterable[str], always: Iterable[str] = ()) -> List[str]:
+        """Model columns needed to serialize the given fields."""
+        columns = ["id", *always]
+        for name in fields:
+            columns.extend(self.depends.get(name, (name,)))
+        return list(dict.fromkeys(columns))
+
+    def serialize(self, obj: Any, fields: Sequence[str]) -> Dict[str, Any]:
+        """
+        Serialize a row loaded with `columns(fields)`.
+
+        Args:
+            obj: ORM instance.
+            fields: Field names from `parse`.
+
+        Returns:
+            The requested fields only.
+        """
+        values = {column: getattr(obj, column) for column in self.columns(fields)}
+        return self.schema.model_construct(**values).model_dump(include=set(fields))
@@ -0,0 +1,105 @@
+"""Import-time profiling for API cold starts.
+
+Usage::
+
+    python -m app.utils.import_profile [module] [--top N]
+
+Prints the slowest imports (cumulative) of a module in a fresh interpreter,
+plus any heavy optional dependencies it loaded eagerly.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Tuple
+
+BACKEND_PATH = Path(__file__).resolve().parents[2]
+
+# Dependencies that must only load on first use in the API process
+HEAVY_MODULES = (
+    "boto3",
+    "botocore",
+    "weasyprint",
+    "matplotlib",
+    "openai",
+    "pandas",
+    "numpy",
+    "pikepdf",
+    "pypdfium2",
+)
+
+_MEASURE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "modules": sorted(sys.modules)}}))
+"""
+
+
+@dataclass
+class ImportReport:
+    """Cost of importing a module in a fresh interpreter."""
+
+    module: str
+    seconds: float
+    heavy_modules: List[str] = field(default_factory=list)
+    slowest: List[Tuple[str, int]] = field(default_factory=list)  # (module, cumulative µs)
+
+
+def profile_imports(module: str = "app.main", top: int = 20) -> ImportReport:
+    """
+    Import a module in a subprocess and report what it cost.
+
+    Args:
+        module: Module to import.
+        top: Number of slowest imports to include.
+
+    Returns:
+        The import report.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _MEASURE.format(module=module)],
+        cwd=BACKEND_PATH,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    measured = json.loads(result.stdout.strip().splitlines()[-1])
+    loaded = set(measured["modules"])
+
+    timings = []
+    for line in result.stderr.splitlines():
+        # "import time:   self [us] |  cumulative | imported package"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        timings.append((name.strip(), int(cumulative)))
+
+    return ImportReport(
+        module=module,
+        seconds=measured["seconds"],
+        heavy_modules=[name for name in HEAVY_MODULES if name in loaded],
+        slowest=sorted(timings, key=lambda item: item[1], reverse=True)[:top],
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("module", nargs="?", default="app.main")
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+
+    report = profile_imports(args.module, args.top)
+    print(f"import {report.module}: {report.seconds * 1000:.0f} ms")
+    for name, cumulative in report.slowest:
+        print(f"{cumulative / 1000:10.1f} ms  {name}")
+    if report.heavy_modules:
+        print(f"eagerly loaded heavy modules: {', '.join(report.heavy_modules)}")
+
+
+if __name__ == "__main__":
+    main()
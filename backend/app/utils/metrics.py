@@ -0,0 +1,143 @@
+"""In-process metrics."""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Sequence, Union
+
+import structlog
+
+logger = structlog.get_logger()
+
+# Seconds; suits anything from cache lookups to password hashing
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+_registry: Dict[str, Union["Histogram", "Counter"]] = {}
+_registry_lock = threading.Lock()
+
+_reporter: Optional[threading.Thread] = None
+_reporter_stop = threading.Event()
+
+
+class Histogram:
+    """
+    Thread-safe latency histogram with fixed bucket bounds.
+
+    Bucket counts are cumulative in `snapshot`, Prometheus style, so they can
+    be exported as-is if a metrics backend is added later.
+    """
+
+    def __init__(self, name: str, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """Record one observation."""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        """Record the duration of a block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def snapshot(self) -> dict:
+        """Cumulative bucket counts, total count and sum."""
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+
+        cumulative, running = {}, 0
+        for bound, count in zip(self.buckets, counts):
+            running += count
+            cumulative[str(bound)] = running
+        cumulative["+Inf"] = running + counts[-1]
+        return {"buckets": cumulative, "count": cumulative["+Inf"], "sum": total}
+
+
+class Counter:
+    """Thread-safe monotonically increasing counter."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: int = 1) -> None:
+        """Add to the counter."""
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> int:
+        """Current value."""
+        return self._value
+
+    def snapshot(self) -> dict:
+        """Current value."""
+        return {"value": self._value}
+
+
+def histogram(name: str, buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+    """Get or create the histogram registered under a name."""
+    with _registry_lock:
+        if name not in _registry:
+            _registry[name] = Histogram(name, buckets)
+        return _registry[name]
+
+
+def counter(name: str) -> Counter:
+    """Get or create the counter registered under a name."""
+    with _registry_lock:
+        if name not in _registry:
+            _registry[name] = Counter(name)
+        return _registry[name]
+
+
+def snapshot() -> Dict[str, dict]:
+    """Snapshots of all registered metrics."""
+    with _registry_lock:
+        metrics = list(_registry.values())
+    return {m.name: m.snapshot() for m in metrics}
+
+
+def start_reporting(interval: float) -> None:
+    """
+    Log a snapshot of all metrics every `interval` seconds.
+
+    Metrics are per process, so each API and worker process reports its
+    own. Runs on a daemon thread; a no-op if already running or if
+    `interval` is not positive.
+    """
+    global _reporter
+    if interval <= 0 or (_reporter is not None and _reporter.is_alive()):
+        return
+
+    def report() -> None:
+        while not _reporter_stop.wait(interval):
+            metrics = snapshot()
+            if metrics:
+                logger.info("metrics", metrics=metrics)
+
+    _reporter_stop.clear()
+    _reporter = threading.Thread(target=report, name="metrics-reporter", daemon=True)
+    _reporter.start()
+
+
+def stop_reporting() -> None:
+    """Stop the reporting thread, if running."""
+    global _reporter
+    if _reporter is not None:
+        _reporter_stop.set()
+        _reporter.join()
+        _reporter = None
@@ -0,0 +1,217 @@
+"""Keyset (cursor) pagination helpers."""
+
+import base64
+import json
+import math
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Generic, List, Optional, Sequence, Tuple, TypeVar
+
+from sqlalchemy import DateTime, Select, and_, func, or_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.utils.cache import LRUCache
+
+T = TypeVar("T")
+
+# Count modes: an exact COUNT(*) per request, a COUNT(*) reused for
+# COUNT_CACHE_TTL seconds, or no total at all
+COUNT_MODES = ("exact", "cached", "none")
+
+_counts = LRUCache(maxsize=4096, ttl=settings.COUNT_CACHE_TTL)
+
+
+@dataclass
+class Page(Generic[T]):
+    """One page of results."""
+
+    items: List[T]
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    Encode the sort key of the last row of a page as an opaque cursor.
+
+    Args:
+        values: Sort key values, in key order.
+
+    Returns:
+        URL-safe cursor string.
+    """
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, columns: Sequence[Any]) -> Tuple[Any, ...]:
+    """
+    Decode a cursor produced by `encode_cursor`.
+
+    Args:
+        cursor: Cursor string.
+        columns: Sort key columns, used to restore value types.
+
+    Returns:
+        Sort key values.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+    if not isinstance(values, list) or len(values) != len(columns):
+        raise ValueError("Invalid cursor")
+
+    decoded = []
+    for column, value in zip(columns, values):
+        if isinstance(column.type, DateTime):
+            try:
+                value = datetime.fromisoformat(value)
+            except (TypeError, ValueError) as e:
+                raise ValueError("Invalid cursor") from e
+        elif not isinstance(value, _python_type(column)) or isinstance(value, bool):
+            raise ValueError("Invalid cursor")
+        decoded.append(value)
+    return tuple(decoded)
+
+
+def _python_type(column: Any) -> Tuple[type, ...]:
+    """Types a cursor value for a column may have."""
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return (str, int, float)
+    # JSON has no separate integer and float types
+    return (int, float) if python_type in (int, float) else (python_type,)
+
+
+async def paginate(
+    db: AsyncSession,
+    query: Select,
+    order_by: Sequence[Tuple[Any, bool]],
+    limit: int,
+    cursor: Optional[str] = None,
+    page: int = 1,
+    count: str = "cached",
+    count_key: Optional[Tuple] = None,
+) -> Page:
+    """
+    Fetch a page of an ORM query, by cursor or by page number.
+
+    With a cursor (or on the first page) rows are selected with a keyset
+    condition on the sort key, which uses the composite indexes and costs the
+    same on every page. Page numbers beyond the first fall back to OFFSET for
+    existing clients. The sort key must end in a unique column.
+
+    Args:
+        db: Database session.
+        query: Filtered select of a single entity.
+        order_by: Sort key as (column, descending) pairs.
+        limit: Page size.
+        cursor: Cursor from a previous page's `next_cursor`.
+        page: Page number, used when no cursor is given.
+        count: Count mode, one of COUNT_MODES.
+        count_key: Cache key for the "cached" count mode (filters of the query).
+
+    Returns:
+        The page.
+
+    Raises:
+        ValueError: If the cursor or count mode is invalid.
+    """
+    if count not in COUNT_MODES:
+        raise ValueError(f"Unknown count mode: {count}")
+
+    columns = [column for column, _ in order_by]
+    paged = query.order_by(
+        *(column.desc() if descending else column.asc() for column, descending in order_by)
+    )
+
+    if cursor:
+        paged = paged.where(_after(order_by, decode_cursor(cursor, columns)))
+    elif page > 1:
+        paged = paged.offset((page - 1) * limit)
+
+    # One extra row tells whether there is a next page
+    result = await db.execute(paged.limit(limit + 1))
+    rows = list(result.scalars().all())
+    has_more = len(rows) > limit
+    items = rows[:limit]
+
+    next_cursor = None
+    if has_more and items:
+        last = items[-1]
+        next_cursor = encode_cursor([getattr(last, column.key) for column in columns])
+
+    return Page(
+        items=items,
+        next_cursor=next_cursor,
+        total=await _count(db, query, count, count_key),
+    )
+
+
+def _after(order_by: Sequence[Tuple[Any, bool]], values: Tuple[Any, ...]):
+    """Condition selecting rows strictly after `values` in sort order."""
+    directions = {descending for _, descending in order_by}
+    if len(directions) == 1:
+        # A row comparison is answered with a single index range scan
+        key = tuple_(*(column for column, _ in order_by))
+        return key < tuple_(*values) if directions.pop() else key > tuple_(*values)
+
+    # (a, b) after (x, y)  <=>  a > x OR (a = x AND b > y), per direction
+    clauses = []
+    for i, (column, descending) in enumerate(order_by):
+        step = column < values[i] if descending else column > values[i]
+        equal = [order_by[j][0] == values[j] for j in range(i)]
+        clauses.append(and_(*equal, step) if equal else step)
+    return or_(*clauses)
+
+
+async def _count(
+    db: AsyncSession, query: Select, mode: str, key: Optional[Tuple]
+) -> Optional[int]:
+    """Total rows of a query, according to the count mode."""
+    if mode == "none":
+        return None
+
+    if mode == "cached" and key is not None:
+        total = _counts.get(key)
+        if total is not None:
+            return total
+
+    total = await db.scalar(
+        select(func.count()).select_from(query.order_by(None).subquery())
+    ) or 0
+    if key is not None:
+        _counts.set(key, total)
+    return total
+
+
+def page_response(result: Page, page: int, per_page: int) -> dict:
+    """
+    Build the listing response body for a page.
+
+    Args:
+        result: The page.
+        page: Requested page number (1 when paging by cursor).
+        per_page: Page size.
+
+    Returns:
+        Response body with items, totals and the next cursor.
+    """
+    total = result.total
+    return {
+        "items": result.items,
+        "total": total,
+        "page": page,
+        "per_page": per_page,
+        "pages": math.ceil(total / per_page) if total is not None else None,
+        "next_cursor": result.next_cursor,
+    }
@@ -0,0 +1,140 @@
+"""HTTP Range requests (RFC 9110) for streamed downloads."""
+
+from email.utils import formatdate, parsedate_to_datetime
+from typing import AsyncIterator, Callable, Dict, Optional, Tuple
+
+from starlette.requests import Request
+from starlette.responses import Response, StreamingResponse
+
+
+class RangeNotSatisfiable(ValueError):
+    """The requested range lies outside the resource."""
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a `Range` header.
+
+    Only single byte ranges are served; anything else (multiple ranges,
+    other units, malformed values) is ignored and the whole resource sent,
+    which the RFC allows.
+
+    Args:
+        header: Range header value.
+        size: Resource size in bytes.
+
+    Returns:
+        Inclusive (start, end) offsets, or None for the whole resource.
+
+    Raises:
+        RangeNotSatisfiable: If the range starts beyond the resource.
+    """
+    if not header:
+        return None
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+
+    first, sep, last = spec.strip().partition("-")
+    if not sep:
+        return None
+    try:
+        if not first:
+            # Suffix range: the last N bytes
+            length = int(last)
+            if length <= 0 or size == 0:
+                raise RangeNotSatisfiable(header)
+            return max(size - length, 0), size - 1
+        start = int(first)
+        end = int(last) if last else size - 1
+    except ValueError:
+        return None
+
+    if start >= size:
+        raise RangeNotSatisfiable(header)
+    if end < start:
+        return None
+    return start, min(end, size - 1)
+
+
+def if_range_matches(
+    if_range: Optional[str], etag: Optional[str], last_modified: Optional[float]
+) -> bool:
+    """
+    Whether a Range request may be served as a range given its `If-Range`.
+
+    Args:
+        if_range: If-Range header value.
+        etag: Current entity tag of the resource.
+        last_modified: Current modification time (epoch seconds).
+
+    Returns:
+        True if there is no If-Range or the validator still matches.
+    """
+    if not if_range:
+        return True
+    if if_range.startswith('"') or if_range.startswith("W/"):
+        # Weak tags never match (strong comparison)
+        return etag is not None and not if_range.startswith("W/") and if_range == etag
+    if last_modified is None:
+        return False
+    try:
+        return int(parsedate_to_datetime(if_range).timestamp()) == int(last_modified)
+    except (TypeError, ValueError):
+        return False
+
+
+def range_response(
+    request: Request,
+    size: int,
+    open_range: Callable[[int, int], AsyncIterator[bytes]],
+    media_type: str,
+    etag: Optional[str] = None,
+    last_modified: Optional[float] = None,
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """
+    Stream a resource, honouring `Range` and `If-Range`.
+
+    Args:
+        request: The request.
+        size: Resource size in bytes.
+        open_range: Returns an async iterator over bytes start..end (inclusive).
+        media_type: Content type.
+        etag: Entity tag, sent as ETag and checked against If-Range.
+        last_modified: Modification time (epoch seconds).
+        headers: Extra response headers.
+
+    Returns:
+        A 200, 206 or 416 response; bodies are streamed in chunks.
+    """
+    response_headers = {"Accept-Ranges": "bytes", **(headers or {})}
+    if etag:
+        response_headers["ETag"] = etag
+    if last_modified is not None:
+        response_headers["Last-Modified"] = formatdate(last_modified, usegmt=True)
+
+    byte_range = None
+    if if_range_matches(request.headers.get("if-range"), etag, last_modified):
+        try:
+            byte_range = parse_range(request.headers.get("range"), size)
+        except RangeNotSatisfiable:
+            return Response(
+                status_code=416,
+                headers={**response_headers, "Content-Range": f"bytes */{size}"},
+            )
+
+    if byte_range is None:
+        start, end, status_code = 0, size - 1, 200
+    else:
+        (start, end), status_code = byte_range, 206
+        response_headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    response_headers["Content-Length"] = str(end - start + 1)
+
+    return StreamingResponse(
+        open_range(start, end) if size else iter(()),
+        status_code=status_code,
+        media_type=media_type,
+        headers=response_headers,
+    )
+
@@ -0,0 +1,174 @@
+"""Parsing and formatting of statistic values such as "$4.2B" or "3-5%"."""
+
+import re
+from functools import lru_cache
+from typing import Any, Iterable, List, NamedTuple, Optional
+
+
+class ParsedValue(NamedTuple):
+    """A statistic value normalized into a number with its unit."""
+
+    magnitude: float  # Number as written; the midpoint for ranges ("3-5%" -> 4)
+    unit: str  # "%", "x", a currency code, or "" for plain numbers
+    scale: float  # Multiplier from a suffix ("B" -> 1e9), 1 if none
+    kind: str  # "percentage", "currency", "multiplier" or "number"
+    low: float
+    high: float
+
+    @property
+    def value(self) -> float:
+        """The magnitude with its scale applied."""
+        return self.magnitude * self.scale
+
+    @property
+    def is_range(self) -> bool:
+        """Whether the value was written as a range ("3-5%")."""
+        return self.low != self.high
+
+
+CURRENCY_SYMBOLS = {"$": "USD", "€": "EUR", "£": "GBP", "¥": "JPY"}
+
+SCALES = {
+    "k": 1e3, "thousand": 1e3,
+    "m": 1e6, "mm": 1e6, "mn": 1e6, "million": 1e6,
+    "b": 1e9, "bn": 1e9, "billion": 1e9,
+    "t": 1e12, "tn": 1e12, "trillion": 1e12,
+}
+
+SCALE_SUFFIXES = {1e3: "K", 1e6: "M", 1e9: "B", 1e12: "T"}
+
+_NUMBER = r"\d+(?:,\d{3})*(?:\.\d+)?|\.\d+"
+
+_VALUE_RE = re.compile(
+    rf"""
+    (?P<sign>[-−])?
+    (?P<currency>[$€£¥]|\b(?:USD|EUR|GBP)\b)?\s*
+    (?P<low>{_NUMBER})
+    (?:\s*(?:-|–|—|to)\s*[$€£¥]?\s*(?P<high>{_NUMBER}))?
+    (?:\s*(?P<scale>thousand|million|billion|trillion|mm|mn|bn|tn|[kmbt])\b)?
+    \s*(?P<unit>%|percent\b|x\b|×|times\b|USD\b|EUR\b|GBP\b)?
+    """,
+    re.IGNORECASE | re.VERBOSE,
+)
+
+# A bare year or year range ("2023", "2023-2024"), which must not be formatted as a number
+_YEARS_RE = re.compile(r"(?:1[89]|2\d)\d{2}(?:\s*(?:-|–|—|to)\s*(?:1[89]|2\d)\d{2})?")
+
+
+@lru_cache(maxsize=4096)
+def _parse_text(text: str) -> Optional[ParsedValue]:
+    """Parse one value string. Memoized: LLM output repeats values a lot."""
+    match = _VALUE_RE.search(text)
+    if not match:
+        return None
+
+    low = float(match["low"].replace(",", ""))
+    high = float(match["high"].replace(",", "")) if match["high"] else low
+    if match["sign"]:
+        low = -low
+        if not match["high"]:
+            high = low
+
+    scale = SCALES[match["scale"].lower()] if match["scale"] else 1.0
+    currency = match["currency"]
+    unit = (match["unit"] or "").lower()
+
+    if unit in ("%", "percent"):
+        kind, unit = "percentage", "%"
+    elif currency or unit.upper() in CURRENCY_SYMBOLS.values():
+        kind = "currency"
+        unit = CURRENCY_SYMBOLS.get(currency, (currency or unit).upper())
+    elif unit in ("x", "×", "times"):
+        kind, unit = "multiplier", "x"
+    else:
+        kind, unit = "number", ""
+
+    return ParsedValue(
+        magnitude=(low + high) / 2,
+        unit=unit,
+        scale=scale,
+        kind=kind,
+        low=low,
+        high=high,
+    )
+
+
+def parse_value(value: Any) -> Optional[ParsedValue]:
+    """
+    Parse a statistic value.
+
+    Args:
+        value: A value string ("73%", "$4.2B", "2.5x", "3-5%", "1.2 million")
+            or a number.
+
+    Returns:
+        The parsed value, or None if it contains no number.
+    """
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, (int, float)):
+        number = float(value)
+        return ParsedValue(number, "", 1.0, "number", number, number)
+    return _parse_text(str(value).strip())
+
+
+def parse_values(values: Iterable[Any]) -> List[Optional[ParsedValue]]:
+    """
+    Parse a batch of values.
+
+    Values are parsed one by one, but each distinct value only once per
+    batch, and `_parse_text` memoizes repeats across batches.
+    """
+    parsed = {}
+    results = []
+    for value in values:
+        key = (type(value), value) if isinstance(value, (str, int, float)) else None
+        if key is None:
+            results.append(parse_value(value))
+            continue
+        if key not in parsed:
+            parsed[key] = parse_value(value)
+        results.append(parsed[key])
+    return results
+
+
+def format_value(parsed: ParsedValue) -> str:
+    """Format a parsed value compactly ("$4.2B", "73%", "2.5x", "3-5%")."""
+    def number(n: float) -> str:
+        return f"{n:,.2f}".rstrip("0").rstrip(".")
+
+    amount = number(parsed.magnitude)
+    if parsed.is_range:
+        amount = f"{number(parsed.low)}-{number(parsed.high)}"
+    amount += SCALE_SUFFIXES.get(parsed.scale, "")
+
+    if parsed.kind == "percentage":
+        return f"{amount}%"
+    if parsed.kind == "multiplier":
+        return f"{amount}x"
+    if parsed.kind == "currency":
+        symbol = {code: sym for sym, code in CURRENCY_SYMBOLS.items()}.get(parsed.unit)
+        return f"{symbol}{amount}" if symbol else f"{amount} {parsed.unit}"
+    return amount
+
+
+def display_value(value: Any, parsed: Optional[ParsedValue] = None) -> Any:
+    """
+    The value to display for a statistic.
+
+    Normalized ("$4.2 billion" -> "$4.2B") only when the whole value is a
+    number with its unit; values with other text ("12 months", "45% of
+    SMBs") and years ("2023-2024") are returned as written.
+
+    Args:
+        value: The value as written.
+        parsed: `parse_value(value)`, if already parsed.
+
+    Returns:
+        The display value.
+    """
+    parsed = parsed or parse_value(value)
+    text = str(value).strip()
+    if parsed is None or _YEARS_RE.fullmatch(text) or not _VALUE_RE.fullmatch(text):
+        return value
+    return format_value(parsed)
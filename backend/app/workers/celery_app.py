@@ -46,3 +46,6 @@ celery_app.conf.beat_schedule = {
         "schedule": 86400.0,  # Daily (checks if month changed)
     },
 }
+
+# Warm-up and per-child reset hooks
+from app.workers import warmup  # noqa: E402,F401
@@ -1,23 +1,20 @@
 """Content distribution Celery tasks."""
 
-import asyncio
 from datetime import datetime
 from typing import Optional
 
 from sqlalchemy import select
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.config import settings
 from app.models import Document
+from app.database import AsyncSessionLocal
 from app.workers.celery_app import celery_app
+from app.workers.runtime import run_async
 
 
 def get_async_session():
     """Create an async session for task context."""
-    engine = create_async_engine(settings.DATABASE_URL)
-    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
-    return async_session()
+    return AsyncSessionLocal()
 
 
 async def get_document(db: AsyncSession, document_id: str) -> Optional[Document]:
@@ -37,7 +34,7 @@ def distribute_to_linkedin(self, document_id: str, message: str = None):
         message: Optional custom message.
     """
     try:
-        asyncio.run(_distribute_to_linkedin_async(document_id, message))
+        run_async(_distribute_to_linkedin_async(document_id, message))
     except Exception as exc:
         # Retry with exponential backoff
         raise self.retry(exc=exc, countdown=60 * (2 ** self.request.retries))
@@ -79,7 +76,7 @@ def distribute_to_facebook(self, document_id: str, message: str = None):
         message: Optional custom message.
     """
     try:
-        asyncio.run(_distribute_to_facebook_async(document_id, message))
+        run_async(_distribute_to_facebook_async(document_id, message))
     except Exception as exc:
         raise self.retry(exc=exc, countdown=60 * (2 ** self.request.retries))
 
@@ -113,7 +110,7 @@ def distribute_to_twitter(self, document_id: str, message: str = None):
         message: Optional custom message.
     """
     try:
-        asyncio.run(_distribute_to_twitter_async(document_id, message))
+        run_async(_distribute_to_twitter_async(document_id, message))
     except Exception as exc:
         raise self.retry(exc=exc, countdown=60 * (2 ** self.request.retries))
 
@@ -147,7 +144,7 @@ def distribute_to_google_business(self, document_id: str, message: str = None):
         message: Optional custom message.
     """
     try:
-        asyncio.run(_distribute_to_google_business_async(document_id, message))
+        run_async(_distribute_to_google_business_async(document_id, message))
     except Exception as exc:
         raise self.retry(exc=exc, countdown=60 * (2 ** self.request.retries))
 
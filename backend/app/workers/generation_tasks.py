@@ -1,27 +1,23 @@
 """Content generation Celery tasks."""
 
-import asyncio
 from typing import Optional
 
+import structlog
 from celery import shared_task
 
 from app.workers.celery_app import celery_app
+from app.workers.runtime import run_async
 from app.database import AsyncSessionLocal
 from app.services.generation_service import GenerationService
 from app.services.document_service import DocumentService
 from app.services.pdf_service import PDFService
+from app.services.pdf_optimizer import PDFOptimizer
 from app.services.storage_service import StorageService
+from app.services.thumbnail_service import ThumbnailService
 from app.config import settings
+from app.redis import get_redis, mark_unavailable
 
-
-def run_async(coro):
-    """Run an async function in a sync context."""
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(coro)
-    finally:
-        loop.close()
+logger = structlog.get_logger()
 
 
 @celery_app.task(bind=True, name="generate_content_task", max_retries=3)
@@ -111,15 +107,6 @@ async def _generate_content_async(task, job_id: str):
                 {**job.steps, "statistics": {"status": "completed", "count": len(statistics)}}
             )
 
-            # Step 7: PDF Rendering (95%)
-            pdf_bytes = await _render_pdf(document, content, statistics, client)
-            storage_service = StorageService()
-            pdf_path = await storage_service.save_file(
-                pdf_bytes,
-                folder=f"documents/{document.agency_id}",
-                filename=f"{document.slug}.pdf",
-            )
-
             # Update document
             document.content_json = {
                 "outline": outline,
@@ -127,11 +114,29 @@ async def _generate_content_async(task, job_id: str):
                 "statistics": statistics,
                 "sources": research_data.get("sources", []),
             }
+
+            # Step 7: PDF Rendering (95%) - deferred to finalize/download by default
+            pdf_path = None
+            pdf_report = {}
+            if settings.PDF_RENDER_ON_GENERATE:
+                pdf_bytes = await _render_pdf(db, document)
+                pdf_bytes, pdf_report = _optimize_pdf(pdf_bytes)
+                storage_service = StorageService()
+                pdf_path = await storage_service.save_file(
+                    pdf_bytes,
+                    folder=f"documents/{document.agency_id}",
+                    filename=f"{document.slug}.pdf",
+                )
+
             document.pdf_url = pdf_path
             document.status = "ready"
             document.word_count = sum(len(s.get("content", "").split()) for s in content)
             document.statistics_count = len(statistics)
             document.sources_count = len(research_data.get("sources", []))
+            if pdf_report.get("page_count"):
+                document.page_count = pdf_report["page_count"]
+            if pdf_path:
+                await _generate_thumbnails(db, document, pdf_bytes)
             await db.commit()
 
             # Complete job
@@ -206,49 +211,55 @@ async def _extract_statistics(content: list, research_data: dict) -> list:
     ]
 
 
-async def _render_pdf(document, content: list, statistics: list, client) -> bytes:
-    """Render the document as PDF."""
-    pdf_service = PDFService()
+async def _render_pdf(db, document) -> bytes:
+    """Render the document as PDF, exactly as its preview shows it."""
+    from app.services.preview_service import PreviewService
 
-    context = {
-        "document": document,
-        "content": content,
-        "statistics": statistics,
-        "client": client,
-        "branding": {
-            "primary_color": "#1a4a6e",
-            "secondary_color": "#b8860b",
-        },
-    }
+    branding = await DocumentService.get_branding(db, document)
+    return await PreviewService().render_pdf(document, branding)
+
+
+def _optimize_pdf(pdf_bytes: bytes) -> tuple:
+    """Run the post-render optimizer if enabled."""
+    if not settings.PDF_OPTIMIZE_ENABLED:
+        return pdf_bytes, {}
+    return PDFOptimizer().optimize(pdf_bytes)
+
+
+async def claim_pdf_render(document_id: str) -> bool:
+    """
+    Mark a PDF render as queued.
 
+    Returns:
+        False if a render of this document is already queued or running
+        (the marker expires after PDF_RENDER_LOCK_TTL seconds in case a
+        worker dies); True otherwise, including when Redis is unavailable.
+    """
+    redis = get_redis()
+    if redis is None:
+        return True
     try:
-        return pdf_service.generate_pdf_bytes(
-            template_name="professional/document.html",
-            context=context,
+        return bool(
+            await redis.set(
+                f"pdf_render:{document_id}", "1", nx=True, ex=settings.PDF_RENDER_LOCK_TTL
+            )
         )
-    except Exception:
-        # Fallback to simple HTML if template not found
-        html = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <style>
-                body {{ font-family: Arial, sans-serif; margin: 40px; }}
-                h1 {{ color: #1a4a6e; }}
-                h2 {{ color: #2980b9; border-bottom: 2px solid #b8860b; }}
-                .stat {{ background: #f5f5f5; padding: 10px; margin: 10px 0; }}
-            </style>
-        </head>
-        <body>
-            <h1>{document.title}</h1>
-            {"".join(f"<h2>{s['title']}</h2><p>{s['content']}</p>" for s in content)}
-            <h2>Key Statistics</h2>
-            {"".join(f"<div class='stat'><strong>{s['value']}</strong> - {s['label']}</div>" for s in statistics)}
-        </body>
-        </html>
-        """
-        from weasyprint import HTML
-        return HTML(string=html).write_pdf()
+    except Exception as e:
+        logger.warning("pdf_render_claim_failed", document_id=document_id, error=str(e))
+        mark_unavailable()
+        return True
+
+
+async def release_pdf_render(document_id: str) -> None:
+    """Clear the queued-render marker once a render finishes or fails."""
+    redis = get_redis()
+    if redis is None:
+        return
+    try:
+        await redis.delete(f"pdf_render:{document_id}")
+    except Exception as e:
+        logger.warning("pdf_render_release_failed", document_id=document_id, error=str(e))
+        mark_unavailable()
 
 
 @celery_app.task(bind=True, name="render_pdf_task")
@@ -264,9 +275,17 @@ def render_pdf_task(self, document_id: str):
 
 async def _render_pdf_async(document_id: str):
     """Async implementation of PDF rendering."""
+    try:
+        return await _render_and_store_pdf(document_id)
+    finally:
+        await release_pdf_render(document_id)
+
+
+async def _render_and_store_pdf(document_id: str):
+    """Render a document's PDF and record it on the document."""
     async with AsyncSessionLocal() as db:
         from sqlalchemy import select
-        from app.models import Document, Client
+        from app.models import Document
 
         result = await db.execute(
             select(Document).where(Document.id == document_id)
@@ -276,15 +295,8 @@ async def _render_pdf_async(document_id: str):
         if not document or not document.content_json:
             return {"error": "Document not found or no content"}
 
-        result = await db.execute(
-            select(Client).where(Client.id == document.client_id)
-        )
-        client = result.scalar_one_or_none()
-
-        content = document.content_json.get("sections", [])
-        statistics = document.content_json.get("statistics", [])
-
-        pdf_bytes = await _render_pdf(document, content, statistics, client)
+        pdf_bytes = await _render_pdf(db, document)
+        pdf_bytes, pdf_report = _optimize_pdf(pdf_bytes)
 
         storage_service = StorageService()
         pdf_path = await storage_service.save_file(
@@ -294,19 +306,71 @@ async def _render_pdf_async(document_id: str):
         )
 
         document.pdf_url = pdf_path
+        if pdf_report.get("page_count"):
+            document.page_count = pdf_report["page_count"]
+        await _generate_thumbnails(db, document, pdf_bytes)
         await db.commit()
 
         return {"status": "completed", "pdf_url": pdf_path}
 
 
 @celery_app.task(bind=True, name="generate_cover_image")
-def generate_cover_image(self, document_id: str, query: str = None):
+def generate_cover_image(self, document_id: str):
     """
-    Generate or fetch cover image for a document.
+    Generate first-page thumbnails for a document's existing PDF.
+
+    Thumbnails are normally produced right after rendering; this task
+    backfills or regenerates them from the stored PDF.
 
     Args:
         document_id: The document ID.
-        query: Optional search query for image.
     """
-    # TODO: Implement with Freepik API integration
-    pass
+    return run_async(_generate_cover_image_async(document_id))
+
+
+async def _generate_cover_image_async(document_id: str):
+    """Async implementation of thumbnail generation."""
+    async with AsyncSessionLocal() as db:
+        from sqlalchemy import select
+        from app.models import Document
+
+        result = await db.execute(
+            select(Document).where(Document.id == document_id)
+        )
+        document = result.scalar_one_or_none()
+
+        if not document or not document.pdf_url:
+            return {"error": "Document not found or no PDF"}
+
+        pdf_bytes = await StorageService().get_file(document.pdf_url)
+        if not pdf_bytes:
+            return {"error": "PDF file not found"}
+
+        await _generate_thumbnails(db, document, pdf_bytes)
+        await db.commit()
+
+        return {"status": "completed", "cover_image_url": document.cover_image_url}
+
+
+async def _generate_thumbnails(db, document, pdf_bytes: bytes) -> None:
+    """Render first-page thumbnails and record the cover image."""
+    # Thumbnail URLs are immutable, so the fingerprint must change with the
+    # branding (logos, colors) as well as the content
+    fingerprint = PDFService.render_fingerprint(
+        {"title": document.title, **(document.content_json or {})},
+        document.template_id,
+        await DocumentService.get_branding(db, document),
+    )
+    thumbnail_service = ThumbnailService()
+    previous = document.cover_image_url
+
+    try:
+        paths = await thumbnail_service.generate(document, pdf_bytes, fingerprint)
+    except Exception as e:
+        # Thumbnails are cosmetic; never fail a render over them
+        logger.warning("thumbnail_generation_failed", document_id=document.id, error=str(e))
+        return
+
+    document.cover_image_url = paths[ThumbnailService.COVER_SIZE]
+    if previous and previous != document.cover_image_url:
+        await thumbnail_service.delete(previous)
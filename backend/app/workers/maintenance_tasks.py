@@ -1,24 +1,21 @@
 """Maintenance and cleanup tasks."""
 
-import asyncio
 import os
 import shutil
 from datetime import datetime, timedelta
 
 from sqlalchemy import select, update, delete
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
 
 from app.config import settings
 from app.models import Document, Agency
+from app.database import AsyncSessionLocal
 from app.workers.celery_app import celery_app
+from app.workers.runtime import run_async
 
 
 def get_async_session():
     """Create an async session for task context."""
-    engine = create_async_engine(settings.DATABASE_URL)
-    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
-    return async_session()
+    return AsyncSessionLocal()
 
 
 @celery_app.task
@@ -31,7 +28,7 @@ def cleanup_expired_documents():
     - Hard-delete documents 30 days after soft-delete
     - Remove associated files from storage
     """
-    asyncio.run(_cleanup_expired_documents_async())
+    run_async(_cleanup_expired_documents_async())
 
 
 async def _cleanup_expired_documents_async():
@@ -77,7 +74,7 @@ def reset_monthly_usage():
 
     Runs daily, checks if new month and resets counters.
     """
-    asyncio.run(_reset_monthly_usage_async())
+    run_async(_reset_monthly_usage_async())
 
 
 async def _reset_monthly_usage_async():
@@ -150,7 +147,7 @@ def send_usage_warnings():
 
     Runs daily to check usage levels.
     """
-    asyncio.run(_send_usage_warnings_async())
+    run_async(_send_usage_warnings_async())
 
 
 async def _send_usage_warnings_async():
@@ -0,0 +1,40 @@
+"""Per-process async runtime for Celery tasks."""
+
+import asyncio
+from typing import Optional
+
+from app.database import engine
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """The event loop of this worker process, created on first use."""
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_loop)
+    return _loop
+
+
+def run_async(coro):
+    """
+    Run an async function in a sync context.
+
+    Every task in a worker process runs on the same long-lived loop, so the
+    shared database engine's pooled connections (which are bound to the loop
+    that opened them) are reused across tasks instead of rebuilt per task.
+    """
+    return get_loop().run_until_complete(coro)
+
+
+def reset_after_fork() -> None:
+    """
+    Drop state inherited from the parent process.
+
+    Pooled connections must never be shared between processes, and an event
+    loop cannot be used across a fork, so each child starts fresh.
+    """
+    global _loop
+    engine.sync_engine.dispose(close=False)
+    _loop = None
@@ -1,23 +1,19 @@
 """Scheduled content processing tasks."""
 
-import asyncio
 from datetime import datetime
 
 from sqlalchemy import select
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
 
-from app.config import settings
 from app.models import ScheduledContent, Document
+from app.database import AsyncSessionLocal
 from app.workers.celery_app import celery_app
+from app.workers.runtime import run_async
 from app.workers.generation_tasks import generate_content_task
 
 
 def get_async_session():
     """Create an async session for task context."""
-    engine = create_async_engine(settings.DATABASE_URL)
-    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
-    return async_session()
+    return AsyncSessionLocal()
 
 
 @celery_app.task
@@ -27,7 +23,7 @@ def process_scheduled_content():
 
     Runs every 5 minutes via Celery beat.
     """
-    asyncio.run(_process_scheduled_content_async())
+    run_async(_process_scheduled_content_async())
 
 
 async def _process_scheduled_content_async():
@@ -99,7 +95,7 @@ def process_auto_distribution():
 
     Runs after content generation completes.
     """
-    asyncio.run(_process_auto_distribution_async())
+    run_async(_process_auto_distribution_async())
 
 
 async def _process_auto_distribution_async():
@@ -0,0 +1,119 @@
+"""Worker warm-up: pay import and cache costs once, before forking."""
+
+import gc
+import importlib
+import time
+
+import structlog
+from celery.signals import worker_init, worker_process_init
+
+from app.config import settings
+from app.utils import metrics
+from app.workers.runtime import reset_after_fork
+
+logger = structlog.get_logger()
+
+# Imported in the parent so every prefork child inherits them
+HEAVY_MODULES = (
+    "numpy",
+    "pandas",
+    "PIL.Image",
+    "matplotlib.figure",
+    "matplotlib.backends.backend_agg",
+    "matplotlib.backends.backend_svg",
+    "weasyprint",
+    "pikepdf",
+    "pypdfium2",
+    "openai",
+    "app.services.pdf_service",
+    "app.services.generation.chart_service",
+    "app.services.generation.orchestrator",
+)
+
+
+def warm_up() -> dict:
+    """
+    Import heavy modules and build process-wide caches.
+
+    Run in the Celery parent process. Children forked afterwards share the
+    loaded modules and caches copy-on-write, so the first task in a fresh
+    child is as fast as any other.
+
+    Returns:
+        Timings in seconds per stage.
+    """
+    timings = {}
+
+    start = time.perf_counter()
+    for name in HEAVY_MODULES:
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            logger.warning("warmup_import_failed", module=name, error=str(e))
+    timings["imports"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    try:
+        from app.services.generation.chart_service import ChartService
+        from app.services.generation.chart_theme import ChartTheme
+
+        # Loads the matplotlib font cache and exercises the Agg and SVG
+        # text paths for the default theme
+        theme = ChartTheme.for_brand()
+        sample = {"labels": ["a", "b"], "values": [1, 2]}
+        for output_format in ChartService.OUTPUT_FORMATS:
+            ChartService.render_chart("bar", sample, {"title": "warmup"}, output_format, theme)
+    except Exception as e:
+        logger.warning("warmup_charts_failed", error=str(e))
+    timings["charts"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    try:
+        from app.services.pdf_service import PDFService
+        from app.services.render_resources import FontRegistry
+
+        FontRegistry.stylesheets()
+        PDFService.precompile_templates()
+    except Exception as e:
+        logger.warning("warmup_templates_failed", error=str(e))
+    timings["fonts_and_templates"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    try:
+        from app.services.api_key_service import APIKeyService
+
+        # Derive the encryption keys (PBKDF2) once for every child
+        APIKeyService.encryption().encrypt("warmup")
+    except Exception as e:
+        logger.warning("warmup_encryption_failed", error=str(e))
+    timings["encryption"] = time.perf_counter() - start
+
+    # Move everything allocated so far out of the collector's view, so
+    # collections in children do not touch (and copy) the shared pages
+    gc.collect()
+    gc.freeze()
+
+    return timings
+
+
+@worker_init.connect
+def _on_worker_init(**kwargs):
+    """Warm the parent process before the pool forks."""
+    if not settings.WORKER_WARMUP_ENABLED:
+        return
+    timings = warm_up()
+    logger.info("worker_warmed_up", **{k: round(v, 3) for k, v in timings.items()})
+
+
+@worker_process_init.connect
+def _on_worker_process_init(**kwargs):
+    """Reset per-process state in each forked child."""
+    reset_after_fork()
+
+    from app.services.generation.llm_pool import LLMClientPool
+    from app.services.storage_backends import reset_backends
+
+    LLMClientPool.reset()
+    reset_backends()
+    # Threads do not survive the fork; each child reports its own metrics
+    metrics.start_reporting(settings.METRICS_LOG_INTERVAL)
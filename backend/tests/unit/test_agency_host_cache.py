@@ -0,0 +1,49 @@
+"""Tests for host to agency resolution."""
+
+import pytest
+
+from app.services import agency_host_cache
+from app.services.agency_host_cache import AgencyHostCache, AgencyRoute, lookup_key
+
+
+class TestAgencyHostCache:
+    """Test cases for AgencyHostCache."""
+
+    @pytest.mark.parametrize(
+        "host,key",
+        [
+            ("Acme.paper.aiconnected.com", "sub:acme"),
+            ("content.acme.com.", "domain:content.acme.com"),
+            ("paper.aiconnected.com", None),
+            ("localhost", None),
+            ("10.0.0.1", None),
+        ],
+    )
+    def test_lookup_key(self, monkeypatch, host, key):
+        """Test hosts map to subdomain or custom domain keys."""
+        monkeypatch.setattr(agency_host_cache.settings, "APP_BASE_DOMAIN", "paper.aiconnected.com")
+        assert lookup_key(host) == key
+
+    @pytest.mark.asyncio
+    async def test_caches_hits_and_misses(self, monkeypatch):
+        """Test each host is loaded once, unknown hosts included, until invalidated."""
+        monkeypatch.setattr(agency_host_cache, "get_redis", lambda: None)
+        monkeypatch.setattr(agency_host_cache.settings, "APP_BASE_DOMAIN", "paper.aiconnected.com")
+        AgencyHostCache._local.clear()
+
+        loads = []
+
+        async def load(key):
+            loads.append(key)
+            return AgencyRoute(id="a1", subdomain="acme") if key == "sub:acme" else None
+
+        monkeypatch.setattr(AgencyHostCache, "_load", staticmethod(load))
+
+        for _ in range(3):
+            assert await AgencyHostCache.resolve("acme.paper.aiconnected.com") == AgencyRoute("a1", "acme")
+            assert await AgencyHostCache.resolve("unknown.example.com") is None
+        assert loads == ["sub:acme", "domain:unknown.example.com"]
+
+        await AgencyHostCache.invalidate(["sub:acme"])
+        await AgencyHostCache.resolve("acme.paper.aiconnected.com")
+        assert loads[-1] == "sub:acme" and len(loads) == 3
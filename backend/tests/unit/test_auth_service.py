@@ -61,3 +61,21 @@ class TestAuthService:
         decoded = AuthService.decode_token("invalid.token.here")
 
         assert decoded is None
+
+    @pytest.mark.asyncio
+    async def test_verify_and_update_rehashes_outdated_cost(self):
+        """Test a hash with fewer rounds than configured is upgraded on verify."""
+        from app.services.auth_service import pwd_context
+
+        weak = pwd_context.hash("testpassword123", rounds=4)
+        valid, new_hash = await AuthService.verify_and_update("testpassword123", weak)
+
+        assert valid is True
+        assert new_hash is not None
+        assert AuthService.verify_password("testpassword123", new_hash) is True
+
+    @pytest.mark.asyncio
+    async def test_verify_and_update_wrong_password(self):
+        """Test a wrong password is rejected without a new hash."""
+        hashed = AuthService.hash_password("testpassword123")
+        assert await AuthService.verify_and_update("wrongpassword", hashed) == (False, None)
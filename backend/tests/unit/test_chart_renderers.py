@@ -0,0 +1,124 @@
+"""Tests for chart spec validation and the SVG chart renderers."""
+
+from xml.etree import ElementTree
+
+import pytest
+
+from app.services.generation.chart_renderers import get_renderer, validate_spec
+from app.services.generation.chart_service import ChartService
+from app.services.generation.chart_theme import ChartTheme
+
+
+class TestValidateSpec:
+    """Test cases for validate_spec."""
+
+    def test_canonical_form(self):
+        """Test that a valid spec is returned with defaults filled in."""
+        spec = validate_spec({"type": "bar", "data": {"labels": ["a", "b"], "values": [1, 2.5]}})
+        assert spec == {
+            "type": "bar",
+            "title": "",
+            "data": {"labels": ["a", "b"], "values": [1, 2.5]},
+            "style": {},
+        }
+
+    @pytest.mark.parametrize(
+        "spec",
+        [
+            {"type": "unknown", "data": {}},
+            {"type": "sparkline", "data": {"values": []}},
+            {"type": "sparkline", "data": {"values": ["high"]}},
+            {"type": "sparkline", "data": {"values": [1, float("nan")]}},
+            {"type": "sparkline", "data": {"values": [1, None]}},
+            {"type": "sparkline", "data": {"values": [1, 2]}, "style": {"width": "100%"}},
+            {"type": "comparison", "data": {"labels": ["a", "b"], "values": ["1", "n/a"]}},
+            {"type": "waterfall", "data": {"labels": ["a"], "values": [{"v": 1}]}},
+            {"type": "bar", "data": {"labels": ["a", "b"], "values": [1]}},
+            {"type": "grouped_bar", "data": {"labels": ["a"], "series": [{"values": []}]}},
+            {"type": "line", "data": {"labels": ["a"]}},
+            {"type": "kpi", "data": {"value": ""}},
+        ],
+    )
+    def test_rejects_unrenderable_specs(self, spec):
+        """Test that specs the renderers cannot draw are rejected up front."""
+        with pytest.raises(ValueError):
+            validate_spec(spec)
+
+    def test_numeric_strings_are_accepted(self):
+        """Test that numbers serialized as strings still validate."""
+        validate_spec({"type": "waterfall", "data": {"labels": ["a", "b"], "values": ["1.5", -2]}})
+
+
+class TestSvgRenderers:
+    """Test cases for the SVG renderers."""
+
+    def render(self, chart_type, data, theme=None):
+        spec = validate_spec({"type": chart_type, "data": data})
+        return get_renderer(chart_type).draw(spec["data"], spec["style"], theme or ChartTheme.for_brand())
+
+    def test_sparkline(self):
+        """Test that a sparkline is well-formed SVG with one point per value."""
+        svg = ElementTree.fromstring(self.render("sparkline", {"values": [3, 1, 4, 1, 5]}))
+        polyline = svg.find("{http://www.w3.org/2000/svg}polyline")
+        assert len(polyline.get("points").split()) == 5
+
+    def test_sparkline_single_value(self):
+        """Test that a flat, single-point sparkline renders."""
+        ElementTree.fromstring(self.render("sparkline", {"values": [7]}))
+
+    def test_kpi_escapes_text(self):
+        """Test that KPI text is escaped."""
+        svg = self.render(
+            "kpi",
+            {"value": "<script>alert(1)</script>", "label": '"quoted" & <b>', "source": "</text>"},
+        )
+        root = ElementTree.fromstring(svg)
+        assert "<script>" not in svg
+        texts = [el.text for el in root.iter("{http://www.w3.org/2000/svg}text")]
+        assert "<script>alert(1)</script>" in texts
+        assert "Source: </text>" in texts
+
+    def test_injected_theme_values_are_escaped(self):
+        """Test that theme values cannot break out of SVG attributes."""
+        theme = ChartTheme(
+            colors=('"/><script>alert(1)</script><x a="', "#fff"),
+            font_family=('Evil" onload="alert(1)',),
+            positive_color='"><script>',
+        )
+        for chart_type, data in (
+            ("kpi", {"value": "1", "delta": "+2"}),
+            ("sparkline", {"values": [1, 2]}),
+        ):
+            svg = self.render(chart_type, data, theme)
+            root = ElementTree.fromstring(svg)
+            assert "<script" not in svg
+            assert not list(root.iter("script"))
+
+    def test_brand_colors_must_be_hex(self):
+        """Test that non-hex brand colors are dropped from the theme."""
+        theme = ChartTheme.for_brand({
+            "primary_color": '"/><script>alert(1)</script><x a="',
+            "secondary_color": "#123abc",
+            "text_color": "red;}",
+        })
+        assert theme.colors[0] == "#123abc"
+        assert theme.text_color == ChartTheme.text_color
+
+
+class TestGenerateChartsBatch:
+    """Test cases for ChartService.generate_charts_batch."""
+
+    @pytest.mark.asyncio
+    async def test_bad_chart_does_not_fail_batch(self):
+        """Test that an invalid chart comes back as None and the rest render."""
+        images = await ChartService().generate_charts_batch(
+            [
+                {"type": "sparkline", "data": {"values": [1, 2, 3]}},
+                {"type": "sparkline", "data": {"values": []}},
+                {"type": "kpi", "data": {"value": "42%"}},
+            ],
+            output_format="svg",
+        )
+        assert images[0].startswith(b"<svg")
+        assert images[1] is None
+        assert images[2].startswith(b"<svg")
@@ -0,0 +1,37 @@
+"""Tests for the encryption service."""
+
+import pytest
+from cryptography.fernet import InvalidToken
+
+from app.services.encryption_service import EncryptionService, derive_key
+
+
+class TestEncryptionService:
+    """Test cases for EncryptionService."""
+
+    def test_round_trip(self):
+        """Test a value decrypts to the original."""
+        service = EncryptionService(secret="current", previous=[])
+        token = service.encrypt("sk-test")
+        assert token != "sk-test"
+        assert service.decrypt(token) == "sk-test"
+
+    def test_key_derived_once(self):
+        """Test services sharing a secret reuse the derived key."""
+        EncryptionService(secret="shared", previous=[]).encrypt("a")
+        before = derive_key.cache_info().hits
+        EncryptionService(secret="shared", previous=[]).encrypt("b")
+        assert derive_key.cache_info().hits == before + 1
+
+    def test_previous_keys_decrypt_and_rotate(self):
+        """Test values under a retired secret still decrypt and can be rotated."""
+        old = EncryptionService(secret="old", previous=[])
+        token = old.encrypt("sk-test")
+
+        rotated_service = EncryptionService(secret="new", previous=["old"])
+        assert rotated_service.decrypt(token) == "sk-test"
+
+        rotated = rotated_service.rotate(token)
+        assert EncryptionService(secret="new", previous=[]).decrypt(rotated) == "sk-test"
+        with pytest.raises(InvalidToken):
+            old.decrypt(rotated)
@@ -0,0 +1,68 @@
+"""Tests for the LLM client pool."""
+
+import asyncio
+
+import pytest
+
+from app.services.generation import llm_pool
+from app.services.generation.llm_pool import LLMClientPool, _retire_client, byok_model
+from app.utils.cache import LRUCache
+
+
+class TestByokModel:
+    """Test cases for byok_model."""
+
+    def test_anthropic_model_is_mapped(self, monkeypatch):
+        """Test that OpenRouter model names map to Anthropic model IDs."""
+        monkeypatch.setattr(llm_pool.settings, "OPENROUTER_MODEL", "anthropic/claude-sonnet-4")
+        monkeypatch.setattr(llm_pool.settings, "ANTHROPIC_MODEL", "")
+        assert byok_model("anthropic") == "claude-sonnet-4-20250514"
+        assert byok_model("openrouter") == "anthropic/claude-sonnet-4"
+
+    def test_unknown_anthropic_model(self, monkeypatch):
+        """Test that a model with no Anthropic ID is not sent to Anthropic."""
+        monkeypatch.setattr(llm_pool.settings, "OPENROUTER_MODEL", "openai/gpt-4o")
+        monkeypatch.setattr(llm_pool.settings, "ANTHROPIC_MODEL", "")
+        assert byok_model("anthropic") is None
+
+        monkeypatch.setattr(llm_pool.settings, "ANTHROPIC_MODEL", "claude-custom")
+        assert byok_model("anthropic") == "claude-custom"
+
+
+class TestClientEviction:
+    """Test cases for closing clients evicted from the pool."""
+
+    @pytest.fixture(autouse=True)
+    def small_pool(self, monkeypatch):
+        monkeypatch.setattr(LLMClientPool, "_clients", LRUCache(maxsize=1, on_evict=_retire_client))
+
+    @pytest.mark.asyncio
+    async def test_evicted_client_is_closed(self):
+        """Test that an idle client is closed when evicted."""
+        first = LLMClientPool.get("key-1")
+        LLMClientPool.get("key-2")
+        await asyncio.gather(*llm_pool._closing)
+        assert first.client.is_closed()
+
+    @pytest.mark.asyncio
+    async def test_in_flight_request_finishes_before_close(self, monkeypatch):
+        """Test that a busy client is closed only after its last request."""
+        first = LLMClientPool.get("key-1")
+        started, release = asyncio.Event(), asyncio.Event()
+
+        async def create(**kwargs):
+            started.set()
+            await release.wait()
+            return "completion"
+
+        monkeypatch.setattr(first.client.chat.completions, "create", create)
+        request = asyncio.create_task(first.create(messages=[]))
+        await started.wait()
+
+        LLMClientPool.get("key-2")
+        await asyncio.gather(*llm_pool._closing)
+        assert not first.client.is_closed()
+
+        release.set()
+        assert await request == "completion"
+        assert first.client.is_closed()
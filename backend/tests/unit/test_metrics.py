@@ -0,0 +1,31 @@
+"""Tests for in-process metrics."""
+
+import time
+
+from structlog.testing import capture_logs
+
+from app.utils import metrics
+
+
+class TestReporting:
+    """Test cases for periodic metrics reporting."""
+
+    def test_logs_snapshots(self):
+        """Test that the reporter logs counters without a /metrics route."""
+        metrics.counter("test_reporting_hits").inc()
+        with capture_logs() as logs:
+            metrics.start_reporting(0.01)
+            try:
+                deadline = time.monotonic() + 2
+                while not logs and time.monotonic() < deadline:
+                    time.sleep(0.01)
+            finally:
+                metrics.stop_reporting()
+
+        assert logs[0]["event"] == "metrics"
+        assert logs[0]["metrics"]["test_reporting_hits"] == {"value": 1}
+
+    def test_disabled(self):
+        """Test that a zero interval starts nothing."""
+        metrics.start_reporting(0)
+        assert metrics._reporter is None
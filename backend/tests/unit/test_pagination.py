@@ -0,0 +1,45 @@
+"""Tests for keyset pagination helpers."""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from app.models import Document, ScheduledContent
+from app.utils.pagination import _after, decode_cursor, encode_cursor
+
+
+class TestCursor:
+    """Test cases for pagination cursors."""
+
+    def test_round_trip(self):
+        """Test a cursor decodes to the original sort key."""
+        created_at = datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+        cursor = encode_cursor([created_at, "doc-1"])
+        assert decode_cursor(cursor, [Document.created_at, Document.id]) == (created_at, "doc-1")
+
+    @pytest.mark.parametrize(
+        "cursor",
+        [
+            "not-a-cursor!",
+            encode_cursor(["only-one"]),
+            encode_cursor([None, "doc-1"]),
+            encode_cursor([1714566615, "doc-1"]),
+            encode_cursor(["2024-05-01T12:30:15", 7]),
+            encode_cursor(["2024-05-01T12:30:15", ["doc-1"]]),
+            encode_cursor(["yesterday", "doc-1"]),
+        ],
+    )
+    def test_invalid_cursor(self, cursor):
+        """Test malformed cursors are rejected."""
+        with pytest.raises(ValueError):
+            decode_cursor(cursor, [Document.created_at, Document.id])
+
+    def test_keyset_condition_uses_row_comparison(self):
+        """Test a uniform sort direction compiles to a row comparison."""
+        now = datetime.now(timezone.utc)
+        newest_first = str(_after([(Document.created_at, True), (Document.id, True)], (now, "x")))
+        soonest_first = str(_after(
+            [(ScheduledContent.scheduled_date, False), (ScheduledContent.id, False)], (now, "x")
+        ))
+        assert "(documents.created_at, documents.id) <" in newest_first
+        assert "(scheduled_content.scheduled_date, scheduled_content.id) >" in soonest_first
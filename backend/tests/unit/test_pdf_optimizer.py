@@ -0,0 +1,111 @@
+"""Tests for the PDF optimizer."""
+
+import io
+import random
+import zlib
+
+import pikepdf
+
+from app.services.pdf_optimizer import PDFOptimizer
+
+
+def _image(pdf: pikepdf.Pdf, image_size: int) -> pikepdf.Stream:
+    pixels = random.Random(0).randbytes(image_size * image_size * 3)
+    image = pikepdf.Stream(pdf, zlib.compress(pixels))
+    image.Type = pikepdf.Name.XObject
+    image.Subtype = pikepdf.Name.Image
+    image.Width = image_size
+    image.Height = image_size
+    image.ColorSpace = pikepdf.Name.DeviceRGB
+    image.BitsPerComponent = 8
+    image.Filter = pikepdf.Name.FlateDecode
+    return image
+
+
+def _build_pdf(pages: int = 2, image_size: int = 1000) -> bytes:
+    """Build a PDF that places the same large RGB image on every page."""
+    pdf = pikepdf.new()
+    for _ in range(pages):
+        # A separate (but identical) image stream per page, like a repeated logo
+        image = _image(pdf, image_size)
+        page = pdf.add_blank_page(page_size=(595, 842))
+        page.Resources = pikepdf.Dictionary(XObject=pikepdf.Dictionary(Im0=image))
+        page.Contents = pdf.make_stream(b"q 500 0 0 500 40 300 cm /Im0 Do Q")
+
+    out = io.BytesIO()
+    pdf.save(out, compress_streams=False)
+    return out.getvalue()
+
+
+class TestPDFOptimizer:
+    """Test cases for PDFOptimizer."""
+
+    def test_reports_real_page_count(self):
+        """Test the report carries the actual page count."""
+        _, report = PDFOptimizer(target_dpi=150).optimize(_build_pdf(pages=3))
+
+        assert report["page_count"] == 3
+
+    def test_deduplicates_and_downsamples_images(self):
+        """Test identical images are merged and oversized ones resampled."""
+        original = _build_pdf(pages=2)
+        optimized, report = PDFOptimizer(target_dpi=72).optimize(original)
+
+        assert report["images_deduplicated"] == 1
+        assert report["images_downsampled"] == 1
+        assert report["bytes_saved"] == len(original) - len(optimized)
+        assert len(optimized) < len(original)
+
+        with pikepdf.open(io.BytesIO(optimized)) as pdf:
+            images = [page.Resources.XObject.Im0 for page in pdf.pages]
+            assert images[0].objgen == images[1].objgen
+            # A4 width at 72 DPI
+            assert int(images[0].Width) <= 595
+
+    def test_invalid_pdf_is_returned_unchanged(self):
+        """Test unparseable input is passed through."""
+        optimized, report = PDFOptimizer().optimize(b"not a pdf")
+
+        assert optimized == b"not a pdf"
+        assert report["page_count"] is None
+
+    def test_downsamples_to_placed_size(self):
+        """Test a small placed image is resampled for its placement, not the page."""
+        pdf = pikepdf.new()
+        page = pdf.add_blank_page(page_size=(595, 842))
+        page.Resources = pikepdf.Dictionary(XObject=pikepdf.Dictionary(Logo=_image(pdf, 1000)))
+        # 72 x 36 pt, scaled by 2 in an outer cm: drawn at 144 x 72 pt = 2 x 1 inch
+        page.Contents = pdf.make_stream(b"q 2 0 0 2 0 0 cm q 72 0 0 36 10 10 cm /Logo Do Q Q")
+        out = io.BytesIO()
+        pdf.save(out)
+
+        optimized, report = PDFOptimizer(target_dpi=150).optimize(out.getvalue())
+
+        assert report["images_downsampled"] == 1
+        with pikepdf.open(io.BytesIO(optimized)) as result:
+            logo = result.pages[0].Resources.XObject.Logo
+            # Aspect ratio is kept, so the tighter (1 inch) side decides
+            assert (int(logo.Width), int(logo.Height)) == (150, 150)
+
+    def test_placement_inside_form_xobject(self):
+        """Test images drawn by nested form XObjects use the combined matrix."""
+        pdf = pikepdf.new()
+        form = pdf.make_stream(b"q 144 0 0 144 0 0 cm /Im0 Do Q")
+        form.Type = pikepdf.Name.XObject
+        form.Subtype = pikepdf.Name.Form
+        form.BBox = [0, 0, 144, 144]
+        form.Matrix = [0.5, 0, 0, 0.5, 0, 0]
+        form.Resources = pikepdf.Dictionary(XObject=pikepdf.Dictionary(Im0=_image(pdf, 1000)))
+        page = pdf.add_blank_page(page_size=(595, 842))
+        page.Resources = pikepdf.Dictionary(XObject=pikepdf.Dictionary(Fm0=form))
+        page.Contents = pdf.make_stream(b"/Fm0 Do")
+        out = io.BytesIO()
+        pdf.save(out)
+
+        optimized, report = PDFOptimizer(target_dpi=144).optimize(out.getvalue())
+
+        assert report["images_downsampled"] == 1
+        with pikepdf.open(io.BytesIO(optimized)) as result:
+            image = result.pages[0].Resources.XObject.Fm0.Resources.XObject.Im0
+            # 72 pt (1 inch) at 144 DPI
+            assert int(image.Width) == 144
@@ -0,0 +1,35 @@
+"""Tests for PDF/preview HTML rendering."""
+
+from app.services.pdf_service import PDFService
+
+
+class TestPreviewHtml:
+    """Test cases for PDFService.render_preview_html."""
+
+    def test_content_is_escaped(self):
+        """Test that document text cannot inject markup into the preview."""
+        html = PDFService().render_preview_html({
+            "title": "<script>alert(1)</script>",
+            "sections": [{"title": "<img src=x onerror=alert(1)>", "content": "a < b & c"}],
+            "conclusion": {"content": "ok", "call_to_action": "<a href='javascript:x'>go</a>"},
+        })
+        assert "<script>" not in html
+        assert "<img src=x" not in html
+        assert "&lt;script&gt;alert(1)&lt;/script&gt;" in html
+        assert "a &lt; b &amp; c" in html
+
+    def test_branding_is_sanitized(self):
+        """Test that branding values cannot break out of the inlined CSS."""
+        html = PDFService().render_preview_html(
+            {"title": "Doc"},
+            branding={
+                "primary_color": "red}</style><script>alert(1)</script>",
+                "font_family": "x;}</style><script>",
+                "logo_url": "' onerror='alert(1)",
+                "secondary_color": "#123abc",
+            },
+        )
+        assert "<script" not in html
+        assert "onerror='" not in html
+        assert "#1a4a6e" in html  # Default primary color
+        assert "#123abc" in html
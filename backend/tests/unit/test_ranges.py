@@ -0,0 +1,81 @@
+"""Tests for HTTP Range handling."""
+
+import pytest
+from starlette.applications import Starlette
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.services import storage_backends
+from app.services.storage_service import StorageService
+from app.utils.ranges import RangeNotSatisfiable, if_range_matches, parse_range, range_response
+
+
+class TestRanges:
+    """Test cases for Range parsing and ranged responses."""
+
+    @pytest.mark.parametrize(
+        "header,expected",
+        [
+            (None, None),
+            ("bytes=0-99", (0, 99)),
+            ("bytes=100-", (100, 999)),
+            ("bytes=-200", (800, 999)),
+            ("bytes=900-5000", (900, 999)),
+            ("bytes=0-1,5-6", None),
+            ("items=0-1", None),
+            ("bytes=oops", None),
+        ],
+    )
+    def test_parse_range(self, header, expected):
+        """Test single byte ranges are parsed and clamped."""
+        assert parse_range(header, 1000) == expected
+
+    def test_unsatisfiable(self):
+        """Test ranges starting past the end are rejected."""
+        with pytest.raises(RangeNotSatisfiable):
+            parse_range("bytes=1000-", 1000)
+
+    def test_if_range(self):
+        """Test If-Range matches only the current strong validator."""
+        assert if_range_matches(None, '"a"', 0)
+        assert if_range_matches('"a"', '"a"', 0)
+        assert not if_range_matches('"b"', '"a"', 0)
+        assert not if_range_matches('W/"a"', '"a"', 0)
+        assert if_range_matches("Thu, 01 Jan 1970 00:00:10 GMT", '"a"', 10.5)
+
+    def test_streams_ranges_from_local_storage(self, monkeypatch, tmp_path):
+        """Test partial and full downloads of a stored file."""
+        monkeypatch.setattr(storage_backends.settings, "STORAGE_TYPE", "local")
+        monkeypatch.setattr(storage_backends.settings, "STORAGE_CHUNK_SIZE", 7)
+        path = tmp_path / "doc.pdf"
+        data = bytes(range(256)) * 4
+        path.write_bytes(data)
+
+        async def download(request):
+            storage = StorageService()
+            stat = await storage.stat_file(str(path))
+            return range_response(
+                request,
+                size=stat.size,
+                open_range=lambda start, end: storage.iter_file(str(path), start, end),
+                media_type="application/pdf",
+                etag=stat.etag,
+                last_modified=stat.last_modified,
+            )
+
+        client = TestClient(Starlette(routes=[Route("/doc", download)]))
+
+        full = client.get("/doc")
+        assert full.status_code == 200
+        assert full.content == data
+        assert full.headers["accept-ranges"] == "bytes"
+
+        partial = client.get("/doc", headers={"Range": "bytes=10-29"})
+        assert partial.status_code == 206
+        assert partial.content == data[10:30]
+        assert partial.headers["content-range"] == f"bytes 10-29/{len(data)}"
+
+        stale = client.get("/doc", headers={"Range": "bytes=10-29", "If-Range": '"stale"'})
+        assert stale.status_code == 200
+
+        assert client.get("/doc", headers={"Range": "bytes=5000-"}).status_code == 416
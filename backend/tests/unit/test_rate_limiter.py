@@ -0,0 +1,97 @@
+"""Tests for the rate limiter."""
+
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.middleware import rate_limiter
+from app.middleware.rate_limiter import RateLimit, RateLimiter, RateLimiterMiddleware
+
+
+class TestRateLimiter:
+    """Test cases for the local GCRA limiter."""
+
+    def test_burst_then_sustained_rate(self):
+        """Test a full window is allowed at once, then one request per interval."""
+        limiter = RateLimiter(local_size=10)
+        limit = RateLimit("ip:1", limit=5, window=10)
+
+        results = [limiter.hit_local([limit], now=100.0) for _ in range(6)]
+        assert [r.allowed for r in results] == [True] * 5 + [False]
+        assert [r.remaining for r in results[:5]] == [4, 3, 2, 1, 0]
+        assert results[5].retry_after == 2.0
+
+        assert not limiter.hit_local([limit], now=101.9).allowed
+        assert limiter.hit_local([limit], now=102.0).allowed
+
+    def test_denied_request_is_not_counted(self):
+        """Test a request denied by one limit does not consume the others."""
+        limiter = RateLimiter(local_size=10)
+        default = RateLimit("user:1", limit=100, window=60)
+        route = RateLimit("user:1:/api/v1/auth/", limit=1, window=60)
+
+        assert limiter.hit_local([default, route], now=0.0).allowed
+        denied = limiter.hit_local([default, route], now=0.0)
+        assert not denied.allowed
+        assert denied.limit == 1
+
+        assert limiter.hit_local([default], now=0.0).remaining == 98
+
+    def test_state_is_bounded(self):
+        """Test idle keys are evicted."""
+        limiter = RateLimiter(local_size=3)
+        for i in range(10):
+            limiter.hit_local([RateLimit(f"ip:{i}", 5, 60)], now=0.0)
+        assert len(limiter._local) == 3
+
+
+class TestRateLimiterMiddleware:
+    """Test cases for the ASGI middleware."""
+
+    def test_limits_requests(self, monkeypatch):
+        """Test requests over the limit get a 429 with rate limit headers."""
+        monkeypatch.setattr(rate_limiter, "get_redis", lambda: None)
+        monkeypatch.setattr(rate_limiter.settings, "RATE_LIMIT_REQUESTS", 2)
+        monkeypatch.setattr(rate_limiter.settings, "RATE_LIMIT_ROUTES", {})
+
+        app = Starlette(routes=[Route("/ping", lambda request: PlainTextResponse("pong"))])
+        app.add_middleware(RateLimiterMiddleware)
+        client = TestClient(app)
+
+        first = client.get("/ping")
+        assert first.status_code == 200
+        assert first.headers["X-RateLimit-Limit"] == "2"
+        assert first.headers["X-RateLimit-Remaining"] == "1"
+
+        assert client.get("/ping").status_code == 200
+        limited = client.get("/ping")
+        assert limited.status_code == 429
+        assert limited.json()["error"]["code"] == "RATE_LIMIT_EXCEEDED"
+        assert int(limited.headers["Retry-After"]) > 0
+
+
+class TestClientIp:
+    """Test cases for client_ip."""
+
+    @staticmethod
+    def _scope(peer, forwarded=None):
+        headers = [(b"x-forwarded-for", forwarded.encode())] if forwarded else []
+        return {"type": "http", "client": (peer, 1234), "headers": headers}
+
+    def test_forwarded_for_ignored_from_untrusted_peer(self, monkeypatch):
+        """Test a client cannot pick its own identity with X-Forwarded-For."""
+        monkeypatch.setattr(rate_limiter.settings, "TRUSTED_PROXIES", [])
+        assert rate_limiter.client_ip(self._scope("203.0.113.9", "1.2.3.4")) == "203.0.113.9"
+
+    def test_rightmost_untrusted_hop(self, monkeypatch):
+        """Test spoofed hops left of the client's real address are ignored."""
+        monkeypatch.setattr(rate_limiter.settings, "TRUSTED_PROXIES", ["10.0.0.0/8"])
+        scope = self._scope("10.0.0.2", "1.2.3.4, 198.51.100.7, 10.0.0.1")
+        assert rate_limiter.client_ip(scope) == "198.51.100.7"
+
+    def test_only_proxies_in_chain(self, monkeypatch):
+        """Test a chain of trusted proxies falls back to its leftmost hop."""
+        monkeypatch.setattr(rate_limiter.settings, "TRUSTED_PROXIES", ["10.0.0.0/8"])
+        assert rate_limiter.client_ip(self._scope("10.0.0.2", "10.0.0.5")) == "10.0.0.5"
+        assert rate_limiter.client_ip(self._scope("10.0.0.2")) == "10.0.0.2"
@@ -0,0 +1,112 @@
+"""Tests for the render-time asset map."""
+
+import functools
+
+import httpx
+import pytest
+
+from app.services import render_resources
+from app.services.render_assets import RenderAssetMap
+from app.services.render_resources import AssetCache
+
+
+@pytest.fixture
+def origin(monkeypatch):
+    """Serve asset requests from a dict of URL -> (body, ETag)."""
+    assets = {}
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        body, etag = assets[str(request.url)]
+        if request.headers.get("if-none-match") == etag:
+            return httpx.Response(304)
+        return httpx.Response(
+            200, content=body, headers={"content-type": "image/svg+xml", "etag": etag}
+        )
+
+    monkeypatch.setattr(
+        render_resources.httpx,
+        "AsyncClient",
+        functools.partial(httpx.AsyncClient, transport=httpx.MockTransport(handler)),
+    )
+    return assets, requests
+
+
+class TestRenderAssetMap:
+    """Test cases for RenderAssetMap."""
+
+    def test_registered_assets_are_served(self, tmp_path):
+        """Test that registered assets are served from memory."""
+        assets = RenderAssetMap(AssetCache(str(tmp_path)))
+        url = assets.register(b"<svg/>", fmt="svg", name="chart-0")
+        assert assets.url_fetcher(url) == {
+            "string": b"<svg/>",
+            "mime_type": "image/svg+xml",
+            "redirected_url": url,
+        }
+
+    @pytest.mark.asyncio
+    async def test_failed_prefetch_is_skipped(self, tmp_path, monkeypatch):
+        """Test that a remote asset whose prefetch failed is not fetched again."""
+        cache = AssetCache(str(tmp_path))
+
+        async def prefetch(urls):
+            return {url: False for url in urls if url}
+
+        monkeypatch.setattr(cache, "prefetch", prefetch)
+        assets = RenderAssetMap(cache)
+        await assets.prefetch(["https://example.com/logo.png", None])
+
+        with pytest.raises(ValueError):
+            assets.url_fetcher("https://example.com/logo.png")
+
+
+class TestAssetCache:
+    """Test cases for the on-disk asset cache."""
+
+    @pytest.mark.asyncio
+    async def test_fresh_asset_is_not_refetched(self, tmp_path, origin):
+        """Test that an asset within its TTL is served without a request."""
+        assets, requests = origin
+        url = "https://example.com/logo.svg"
+        assets[url] = (b"<svg>1</svg>", '"v1"')
+        cache = AssetCache(str(tmp_path), ttl=3600)
+
+        assert await cache.prefetch([url]) == {url: True}
+        assert await cache.prefetch([url]) == {url: True}
+        assert len(requests) == 1
+        assert cache.read(url) == (b"<svg>1</svg>", "image/svg+xml")
+
+    @pytest.mark.asyncio
+    async def test_expired_asset_is_revalidated(self, tmp_path, origin):
+        """Test that an expired asset is revalidated and replaced if it changed."""
+        assets, requests = origin
+        url = "https://example.com/logo.svg"
+        assets[url] = (b"<svg>1</svg>", '"v1"')
+        cache = AssetCache(str(tmp_path), ttl=0)
+
+        await cache.prefetch([url])
+        await cache.prefetch([url])
+        assert requests[-1].headers["if-none-match"] == '"v1"'
+        assert cache.read(url) == (b"<svg>1</svg>", "image/svg+xml")
+
+        assets[url] = (b"<svg>2</svg>", '"v2"')
+        await cache.prefetch([url])
+        assert cache.read(url) == (b"<svg>2</svg>", "image/svg+xml")
+
+    @pytest.mark.asyncio
+    async def test_size_limit(self, tmp_path, origin):
+        """Test that least recently used assets are evicted over the budget."""
+        assets, _ = origin
+        urls = [f"https://example.com/{i}.svg" for i in range(4)]
+        for url in urls:
+            assets[url] = (b"<svg>" + bytes(95) + b"</svg>", '"v1"')
+        cache = AssetCache(str(tmp_path), max_bytes=250)
+
+        for url in urls:
+            await cache.prefetch([url])
+
+        assert sum(path.stat().st_size for path in tmp_path.glob("*.svg")) <= 250
+        assert cache.read(urls[-1]) is not None
+        assert cache.read(urls[0]) is None
@@ -0,0 +1,52 @@
+"""Tests for request logging middleware."""
+
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+from structlog.testing import capture_logs
+
+from app.middleware import request_logging
+from app.middleware.request_logging import RequestLoggingMiddleware
+
+
+def _client() -> TestClient:
+    app = Starlette(routes=[
+        Route("/ping", lambda request: PlainTextResponse(request.state.request_id)),
+        Route("/health", lambda request: PlainTextResponse("ok")),
+    ])
+    app.add_middleware(RequestLoggingMiddleware)
+    return TestClient(app)
+
+
+class TestRequestLoggingMiddleware:
+    """Test cases for RequestLoggingMiddleware."""
+
+    def test_logs_one_line_per_request(self):
+        """Test a request produces a single log line and a request ID header."""
+        with capture_logs() as logs:
+            response = _client().get("/ping?token=secret")
+
+        assert response.headers["X-Request-ID"] == response.text
+        assert len(logs) == 1
+        assert logs[0]["event"] == "request"
+        assert logs[0]["status_code"] == 200
+        assert logs[0]["path"] == "/ping"
+        assert "secret" not in str(logs[0])
+
+    def test_sampled_paths(self, monkeypatch):
+        """Test sampled paths are skipped when not drawn."""
+        monkeypatch.setattr(request_logging.settings, "LOG_SAMPLE_RATES", {"/health": 0.0})
+        with capture_logs() as logs:
+            client = _client()
+            client.get("/health")
+            client.get("/ping")
+
+        assert [log["path"] for log in logs] == ["/ping"]
+
+    def test_registered_outside_rate_limiter(self):
+        """Test the app logs responses the rate limiter short-circuits."""
+        from app.main import app
+
+        order = [middleware.cls.__name__ for middleware in app.user_middleware]
+        assert order[:3] == ["CORSMiddleware", "RequestLoggingMiddleware", "RateLimiterMiddleware"]
@@ -0,0 +1,59 @@
+"""Tests for signed download URLs."""
+
+import pytest
+
+from app.services import signed_url_service
+from app.services.signed_url_service import SignedURLService
+
+
+@pytest.fixture
+def local_storage(monkeypatch, tmp_path):
+    monkeypatch.setattr(signed_url_service.settings, "STORAGE_TYPE", "local")
+    monkeypatch.setattr(signed_url_service.settings, "STORAGE_LOCAL_PATH", str(tmp_path))
+    return tmp_path
+
+
+def _token(url: str) -> str:
+    return url.rsplit("/", 1)[-1]
+
+
+class TestSignedURLService:
+    """Test cases for SignedURLService."""
+
+    def test_round_trip(self, local_storage):
+        """Test a signed URL verifies to the file it was issued for."""
+        path = str(local_storage / "documents" / "a.pdf")
+        signed = SignedURLService.sign(path, "a.pdf", "application/pdf", ttl=60)
+
+        assert signed.url.startswith("/api/v1/files/")
+        verified = SignedURLService.verify(_token(signed.url))
+        assert (verified.path, verified.filename, verified.media_type) == (
+            path, "a.pdf", "application/pdf"
+        )
+
+    def test_url_is_stable_within_ttl(self, local_storage):
+        """Test repeated signing yields the same, cacheable URL."""
+        path = str(local_storage / "thumb.webp")
+        assert SignedURLService.sign(path, ttl=3600).url == SignedURLService.sign(path, ttl=3600).url
+
+    def test_rejects_tampering(self, local_storage):
+        """Test a token signed for one file cannot be reused for another."""
+        token = _token(SignedURLService.sign(str(local_storage / "a.pdf")).url)
+        other = _token(SignedURLService.sign(str(local_storage / "b.pdf")).url)
+        forged = f"{other.split('.')[0]}.{token.split('.')[1]}"
+
+        for bad in (forged, "garbage", token + "x"):
+            with pytest.raises(ValueError):
+                SignedURLService.verify(bad)
+
+    def test_rejects_expired_and_outside_paths(self, local_storage, monkeypatch):
+        """Test expired tokens and paths outside storage are rejected."""
+        expired = _token(SignedURLService.sign(str(local_storage / "a.pdf"), ttl=60).url)
+        outside = _token(SignedURLService.sign("/etc/passwd").url)
+
+        with pytest.raises(ValueError):
+            SignedURLService.verify(outside)
+
+        monkeypatch.setattr(signed_url_service.time, "time", lambda: 10**12)
+        with pytest.raises(ValueError):
+            SignedURLService.verify(expired)
@@ -0,0 +1,23 @@
+"""Tests for API cold-start cost."""
+
+import os
+
+from app.utils.import_profile import profile_imports
+
+# Generous enough for slow CI machines; a regression to eager heavy imports
+# costs several seconds. Override with STARTUP_IMPORT_BUDGET.
+IMPORT_BUDGET_SECONDS = float(os.getenv("STARTUP_IMPORT_BUDGET", "3.0"))
+
+
+class TestStartupBudget:
+    """Test cases for the API import budget."""
+
+    def test_no_heavy_imports_at_startup(self):
+        """Test importing the app does not load heavy optional dependencies."""
+        report = profile_imports("app.main")
+        assert report.heavy_modules == []
+
+    def test_import_within_budget(self):
+        """Test importing the app stays within the cold-start budget."""
+        report = profile_imports("app.main")
+        assert report.seconds < IMPORT_BUDGET_SECONDS, report.slowest[:5]
@@ -0,0 +1,206 @@
+"""Tests for storage backends."""
+
+import asyncio
+import io
+
+import boto3
+import pytest
+from botocore.response import StreamingBody
+from botocore.stub import ANY, Stubber
+
+from app.services import storage_backends
+from app.services.storage_backends import CachingBackend, LocalBackend, S3Backend
+from app.services.storage_service import StorageService
+
+
+def _s3_backend():
+    client = boto3.client(
+        "s3",
+        region_name="us-east-1",
+        aws_access_key_id="test",
+        aws_secret_access_key="test",
+    )
+    return S3Backend("bucket", client=client), Stubber(client)
+
+
+class TestStorageBackends:
+    """Test cases for storage backends."""
+
+    @pytest.mark.asyncio
+    async def test_local_round_trip(self, tmp_path):
+        """Test saving, streaming, statting and deleting a local file."""
+        storage = StorageService(LocalBackend(str(tmp_path)))
+        path = await storage.save_file(b"0123456789", "documents/a1", "doc.pdf")
+
+        assert await storage.get_file(path) == b"0123456789"
+        assert b"".join([chunk async for chunk in storage.iter_file(path, 2, 5)]) == b"2345"
+        assert (await storage.stat_file(path)).size == 10
+        assert await storage.delete_file(path)
+        assert await storage.get_file(path) is None
+
+    @pytest.mark.asyncio
+    async def test_s3_streams_ranges(self):
+        """Test S3 reads request the range and stream the body in chunks."""
+        backend, stubber = _s3_backend()
+        data = b"x" * 100
+        stubber.add_response(
+            "get_object",
+            {"Body": StreamingBody(io.BytesIO(data[10:60]), 50), "ContentLength": 50},
+            {"Bucket": "bucket", "Key": "documents/doc.pdf", "Range": "bytes=10-59"},
+        )
+
+        with stubber:
+            chunks = [c async for c in backend.stream("s3://bucket/documents/doc.pdf", 10, 59)]
+        assert b"".join(chunks) == data[10:60]
+        backend.close()
+
+    @pytest.mark.asyncio
+    async def test_s3_multipart_upload(self, monkeypatch):
+        """Test large files are uploaded in parts."""
+        part_size = 5 * 1024 * 1024
+        monkeypatch.setattr(storage_backends.settings, "STORAGE_MULTIPART_THRESHOLD", part_size)
+        monkeypatch.setattr(storage_backends.settings, "STORAGE_MULTIPART_CHUNK_SIZE", part_size)
+        monkeypatch.setattr(storage_backends.settings, "STORAGE_MULTIPART_CONCURRENCY", 1)
+        backend, stubber = _s3_backend()
+        key = {"Bucket": "bucket", "Key": "documents/big.pdf"}
+        stubber.add_response("create_multipart_upload", {"UploadId": "u1"}, key)
+        for part in (1, 2):
+            stubber.add_response(
+                "upload_part",
+                {"ETag": f'"e{part}"'},
+                {**key, "UploadId": "u1", "PartNumber": part, "Body": ANY},
+            )
+        stubber.add_response("complete_multipart_upload", {}, {
+            **key,
+            "UploadId": "u1",
+            "MultipartUpload": {"Parts": [
+                {"ETag": '"e1"', "PartNumber": 1},
+                {"ETag": '"e2"', "PartNumber": 2},
+            ]},
+        })
+
+        with stubber:
+            path = await backend.save(b"x" * (part_size + 1), "documents/big.pdf")
+        assert path == "s3://bucket/documents/big.pdf"
+        stubber.assert_no_pending_responses()
+        backend.close()
+
+
+
+class TestCachingBackend:
+    """Test cases for the local disk cache tier."""
+
+    @staticmethod
+    def _backend(tmp_path, max_bytes=1024 * 1024):
+        remote = LocalBackend(str(tmp_path / "remote"))
+        return remote, CachingBackend(remote, str(tmp_path / "cache"), max_bytes)
+
+    @pytest.mark.asyncio
+    async def test_read_through(self, tmp_path):
+        """Test the first read fills the cache and later reads hit it."""
+        remote, cache = self._backend(tmp_path)
+        path = await remote.save(b"pdf bytes", "documents/doc.pdf")
+        hits, misses = cache.hits.value, cache.misses.value
+
+        assert await cache.read(path) == b"pdf bytes"
+        assert b"".join([c async for c in cache.stream(path, 4, 8)]) == b"bytes"
+        assert (cache.hits.value - hits, cache.misses.value - misses) == (1, 1)
+        assert (await cache.stat(path)).etag == (await remote.stat(path)).etag
+
+    @pytest.mark.asyncio
+    async def test_write_through_and_invalidation(self, tmp_path):
+        """Test saves populate the cache and deletes clear it."""
+        remote, cache = self._backend(tmp_path)
+        path = await cache.save(b"fresh", "documents/new.pdf")
+        hits = cache.hits.value
+
+        assert await cache.read(path) == b"fresh"
+        assert cache.hits.value == hits + 1
+
+        assert await cache.delete(path)
+        assert await cache.read(path) is None
+        assert not list((tmp_path / "cache").glob("*/*.blob"))
+
+    @pytest.mark.asyncio
+    async def test_corrupt_entry_falls_back_to_remote(self, tmp_path):
+        """Test an entry failing its checksum is dropped."""
+        remote, cache = self._backend(tmp_path)
+        path = await cache.save(b"original", "documents/doc.pdf")
+        blob, _ = cache._paths(path)
+        blob.write_bytes(b"tampered")
+
+        assert await cache.read(path) == b"original"
+        assert not blob.exists()
+
+    @pytest.mark.asyncio
+    async def test_size_limit(self, tmp_path):
+        """Test least recently used entries are evicted over the budget."""
+        remote, cache = self._backend(tmp_path, max_bytes=250)
+        paths = [await cache.save(bytes(100), f"documents/{i}.pdf") for i in range(4)]
+
+        cached = list((tmp_path / "cache").glob("*/*.blob"))
+        assert sum(blob.stat().st_size for blob in cached) <= 250
+        assert cache._paths(paths[-1])[0].exists()
+
+    @pytest.mark.asyncio
+    async def test_replacing_entry_is_not_double_counted(self, tmp_path):
+        """Test rewriting a key does not count its old blob towards the budget."""
+        remote, cache = self._backend(tmp_path, max_bytes=2000)
+        other = await cache.save(bytes(400), "documents/other.pdf")
+        for _ in range(5):
+            path = await cache.save(bytes(1500), "documents/doc.pdf")
+
+        assert cache._paths(other)[0].exists()
+        assert cache._paths(path)[0].exists()
+
+    @pytest.mark.asyncio
+    async def test_size_limit_is_shared_between_processes(self, tmp_path):
+        """Test the budget covers entries written by other caches on the same directory."""
+        remote = LocalBackend(str(tmp_path / "remote"))
+        caches = [CachingBackend(remote, str(tmp_path / "cache"), 250) for _ in range(3)]
+        for i in range(9):
+            await caches[i % 3].save(bytes(100), f"documents/{i}.pdf")
+
+        cached = list((tmp_path / "cache").glob("*/*.blob"))
+        assert sum(blob.stat().st_size for blob in cached) <= 250
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_is_revalidated(self, tmp_path):
+        """Test an entry whose remote object changed is dropped, not served."""
+        remote, cache = self._backend(tmp_path)
+        path = await cache.save(b"old", "documents/doc.pdf")
+        await remote.save(b"new version", "documents/doc.pdf")
+        cache._validated.clear()  # As after STORAGE_CACHE_REVALIDATE_TTL
+
+        assert (await cache.stat(path)).size == len(b"new version")
+        assert b"".join([c async for c in cache.stream(path)]) == b"new version"
+        assert await cache.read(path) == b"new version"
+
+    @pytest.mark.asyncio
+    async def test_stream_miss_does_not_wait_for_download(self, tmp_path):
+        """Test misses stream from the remote and fill the cache as they go."""
+        remote, cache = self._backend(tmp_path)
+        ranged = await remote.save(b"0123456789", "documents/ranged.pdf")
+        whole = await remote.save(b"abcdefghij", "documents/whole.pdf")
+
+        assert b"".join([c async for c in cache.stream(ranged, 2, 4)]) == b"234"
+        await asyncio.gather(*cache._fills.values())
+        assert cache._paths(ranged)[0].exists()
+
+        assert b"".join([c async for c in cache.stream(whole)]) == b"abcdefghij"
+        assert cache._paths(whole)[0].exists()
+        assert not list((tmp_path / "cache").glob("*/*.tmp"))
+
+    @pytest.mark.asyncio
+    async def test_abandoned_stream_is_not_cached(self, tmp_path, monkeypatch):
+        """Test a stream the client drops leaves no partial entry."""
+        monkeypatch.setattr(storage_backends.settings, "STORAGE_CHUNK_SIZE", 2)
+        remote, cache = self._backend(tmp_path)
+        path = await remote.save(b"abcdefghij", "documents/doc.pdf")
+
+        stream = cache.stream(path)
+        assert await stream.__anext__() == b"ab"
+        await stream.aclose()
+
+        assert not cache._paths(path)[0].exists()
+        assert not list((tmp_path / "cache").glob("*/*.tmp"))
@@ -0,0 +1,82 @@
+"""Tests for statistic value parsing."""
+
+import pytest
+
+from app.services.generation.statistics_service import StatisticsService
+from app.utils.values import display_value, format_value, parse_value, parse_values
+
+
+class TestParseValue:
+    """Test cases for parse_value."""
+
+    @pytest.mark.parametrize(
+        "text, value, unit, kind",
+        [
+            ("73%", 73.0, "%", "percentage"),
+            ("$4.2B", 4.2e9, "USD", "currency"),
+            ("$4.2 billion", 4.2e9, "USD", "currency"),
+            ("2.5x", 2.5, "x", "multiplier"),
+            ("3-5%", 4.0, "%", "percentage"),
+            ("1.2 million", 1.2e6, "", "number"),
+            ("1,250", 1250.0, "", "number"),
+            ("-12%", -12.0, "%", "percentage"),
+        ],
+    )
+    def test_parses_common_forms(self, text, value, unit, kind):
+        """Test the value forms LLMs commonly produce."""
+        parsed = parse_value(text)
+        assert parsed is not None
+        assert parsed.value == pytest.approx(value)
+        assert parsed.unit == unit
+        assert parsed.kind == kind
+
+    def test_unit_words_are_not_scales(self):
+        """Test that a word starting with a scale letter is not a scale."""
+        parsed = parse_value("5 minutes")
+        assert parsed.value == 5.0
+        assert parsed.scale == 1.0
+
+    def test_no_number(self):
+        """Test that values without a number do not parse."""
+        assert parse_value("significant") is None
+        assert parse_value(None) is None
+
+    def test_batch_matches_single(self):
+        """Test batch parsing returns the same records in order."""
+        values = ["73%", "n/a", "$4.2B", 7]
+        assert parse_values(values) == [parse_value(v) for v in values]
+
+    def test_format_round_trip(self):
+        """Test compact formatting of parsed values."""
+        assert format_value(parse_value("$4.2 billion")) == "$4.2B"
+        assert format_value(parse_value("3-5%")) == "3-5%"
+        assert format_value(parse_value("2.5 times")) == "2.5x"
+
+
+class TestDisplayValue:
+    """Test cases for display_value."""
+
+    @pytest.mark.parametrize(
+        "text, expected",
+        [
+            ("$4.2 billion", "$4.2B"),
+            ("2.5 times", "2.5x"),
+            ("12 months", "12 months"),
+            ("3.5 hours per week", "3.5 hours per week"),
+            ("45% of SMBs", "45% of SMBs"),
+            ("2023", "2023"),
+            ("2023-2024", "2023-2024"),
+            ("n/a", "n/a"),
+        ],
+    )
+    def test_only_whole_values_are_normalized(self, text, expected):
+        """Test that unit words and years are displayed as written."""
+        assert display_value(text) == expected
+
+    @pytest.mark.asyncio
+    async def test_callout_keeps_unit_words(self):
+        """Test that callouts show values with unit words unchanged."""
+        service = StatisticsService(llm=object())
+        for value in ("12 months", "2023-2024"):
+            formatted = await service.format_statistic({"value": value, "context": "x"})
+            assert formatted["display"]["primary"] == value
@@ -2,13 +2,13 @@
 
 import { useEffect, useState } from "react";
 import Link from "next/link";
-import { clientsApi, Client, ClientCreate } from "@/lib/api/clients";
+import { clientsApi, ClientSummary, ClientCreate } from "@/lib/api/clients";
 
 export default function ClientsPage() {
-  const [clients, setClients] = useState<Client[]>([]);
+  const [clients, setClients] = useState<ClientSummary[]>([]);
   const [loading, setLoading] = useState(true);
   const [showModal, setShowModal] = useState(false);
-  const [editingClient, setEditingClient] = useState<Client | null>(null);
+  const [editingClient, setEditingClient] = useState<ClientSummary | null>(null);
   const [formData, setFormData] = useState<ClientCreate>({
     name: "",
     industry: "",
@@ -62,7 +62,7 @@ export default function ClientsPage() {
     }
   };
 
-  const handleEdit = (client: Client) => {
+  const handleEdit = (client: ClientSummary) => {
     setEditingClient(client);
     setFormData({
       name: client.name,
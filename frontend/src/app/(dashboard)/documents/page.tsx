@@ -2,7 +2,7 @@
 
 import { useEffect, useState } from "react";
 import Link from "next/link";
-import { documentsApi, Document } from "@/lib/api/documents";
+import { documentsApi, DocumentSummary } from "@/lib/api/documents";
 
 const statusColors: Record<string, string> = {
   draft: "bg-gray-100 text-gray-800",
@@ -21,7 +21,7 @@ const statusLabels: Record<string, string> = {
 };
 
 export default function DocumentsPage() {
-  const [documents, setDocuments] = useState<Document[]>([]);
+  const [documents, setDocuments] = useState<DocumentSummary[]>([]);
   const [loading, setLoading] = useState(true);
   const [filter, setFilter] = useState<string>("");
 
@@ -40,17 +40,15 @@ export default function DocumentsPage() {
     fetchDocuments();
   }, [filter]);
 
-  const handleDownload = async (doc: Document) => {
+  const handleDownload = async (doc: DocumentSummary) => {
     try {
-      const blob = await documentsApi.download(doc.id);
-      const url = URL.createObjectURL(blob);
+      const { url } = await documentsApi.downloadUrl(doc.id);
       const a = document.createElement("a");
       a.href = url;
       a.download = `${doc.slug}.pdf`;
       document.body.appendChild(a);
       a.click();
       document.body.removeChild(a);
-      URL.revokeObjectURL(url);
     } catch (error) {
       console.error("Failed to download document:", error);
     }
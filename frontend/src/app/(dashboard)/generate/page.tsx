@@ -2,7 +2,7 @@
 
 import { Suspense, useEffect, useState } from "react";
 import { useRouter, useSearchParams } from "next/navigation";
-import { clientsApi, Client } from "@/lib/api/clients";
+import { clientsApi, ClientSummary } from "@/lib/api/clients";
 import { generationApi, GenerationJob } from "@/lib/api/generation";
 
 const stepLabels: Record<string, string> = {
@@ -20,7 +20,7 @@ function GeneratePageContent() {
   const searchParams = useSearchParams();
   const clientParam = searchParams.get("client");
 
-  const [clients, setClients] = useState<Client[]>([]);
+  const [clients, setClients] = useState<ClientSummary[]>([]);
   const [loading, setLoading] = useState(true);
   const [generating, setGenerating] = useState(false);
   const [job, setJob] = useState<GenerationJob | null>(null);
@@ -1,8 +1,8 @@
 "use client";
 
 import { useEffect, useState } from "react";
-import { scheduleApi, ScheduledContent, ScheduleCreate } from "@/lib/api/schedule";
-import { clientsApi, Client } from "@/lib/api/clients";
+import { scheduleApi, ScheduledContentSummary, ScheduleCreate } from "@/lib/api/schedule";
+import { clientsApi, ClientSummary } from "@/lib/api/clients";
 
 const statusColors: Record<string, string> = {
   pending: "bg-yellow-100 text-yellow-800",
@@ -12,8 +12,8 @@ const statusColors: Record<string, string> = {
 };
 
 export default function SchedulePage() {
-  const [schedules, setSchedules] = useState<ScheduledContent[]>([]);
-  const [clients, setClients] = useState<Client[]>([]);
+  const [schedules, setSchedules] = useState<ScheduledContentSummary[]>([]);
+  const [clients, setClients] = useState<ClientSummary[]>([]);
   const [loading, setLoading] = useState(true);
   const [showModal, setShowModal] = useState(false);
   const [formData, setFormData] = useState<ScheduleCreate>({
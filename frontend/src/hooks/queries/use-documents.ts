@@ -57,14 +57,12 @@ export function useDeleteDocument() {
 export function useDownloadDocument() {
   return useMutation({
     mutationFn: async (id: string) => {
-      const blob = await documentsApi.download(id);
-      const url = window.URL.createObjectURL(blob);
+      const { url } = await documentsApi.downloadUrl(id);
       const a = document.createElement("a");
       a.href = url;
       a.download = `document-${id}.pdf`;
       document.body.appendChild(a);
       a.click();
-      window.URL.revokeObjectURL(url);
       document.body.removeChild(a);
     },
     onError: (error: Error) => {
@@ -18,6 +18,12 @@ export interface Client {
   updated_at: string;
 }
 
+// List items omit keyword lists and ownership fields; request more with `fields`
+export type ClientSummary = Omit<
+  Client,
+  "services" | "keywords" | "agency_id" | "updated_at"
+>;
+
 export interface ClientCreate {
   name: string;
   industry?: string;
@@ -43,23 +49,26 @@ export interface ClientUpdate {
 
 export interface PaginatedResponse<T> {
   items: T[];
-  total: number;
+  total: number | null; // null when listed with count=none
   page: number;
   per_page: number;
-  pages: number;
+  pages: number | null;
+  next_cursor: string | null; // pass as `cursor` to fetch the next page
 }
 
 export const clientsApi = {
   list: async (
     page = 1,
     perPage = 20,
-    search?: string
-  ): Promise<PaginatedResponse<Client>> => {
+    search?: string,
+    cursor?: string
+  ): Promise<PaginatedResponse<ClientSummary>> => {
     const params = new URLSearchParams({
       page: page.toString(),
       per_page: perPage.toString(),
     });
     if (search) params.append("search", search);
+    if (cursor) params.append("cursor", cursor);
 
     const response = await apiClient.get(`/clients?${params}`);
     return response.data;
@@ -1,4 +1,4 @@
-import { apiClient } from "./client";
+import { API_URL, apiClient } from "./client";
 import type { PaginatedResponse } from "./clients";
 
 export interface Document {
@@ -22,6 +22,16 @@ export interface Document {
   updated_at: string;
 }
 
+// List items omit ownership fields; request more with `fields`
+export type DocumentSummary = Omit<Document, "agency_id" | "created_by_id" | "expires_at"> & {
+  thumbnail_url: string | null;
+};
+
+export interface SignedUrl {
+  url: string;
+  expires_at: string;
+}
+
 export interface DocumentUpdate {
   title?: string;
   status?: string;
@@ -32,14 +42,16 @@ export const documentsApi = {
     page = 1,
     perPage = 20,
     clientId?: string,
-    status?: string
-  ): Promise<PaginatedResponse<Document>> => {
+    status?: string,
+    cursor?: string
+  ): Promise<PaginatedResponse<DocumentSummary>> => {
     const params = new URLSearchParams({
       page: page.toString(),
       per_page: perPage.toString(),
     });
     if (clientId) params.append("client_id", clientId);
     if (status) params.append("status", status);
+    if (cursor) params.append("cursor", cursor);
 
     const response = await apiClient.get(`/documents?${params}`);
     return response.data;
@@ -59,9 +71,39 @@ export const documentsApi = {
     await apiClient.delete(`/documents/${id}`);
   },
 
-  download: async (id: string): Promise<Blob> => {
-    const response = await apiClient.get(`/documents/${id}/download`, {
-      responseType: "blob",
+  download: async (id: string, maxAttempts = 20): Promise<Blob> => {
+    // PDFs are rendered on first download; the API answers 202 until ready.
+    for (let attempt = 0; attempt < maxAttempts; attempt++) {
+      const response = await apiClient.get(`/documents/${id}/download`, {
+        responseType: "blob",
+      });
+      if (response.status !== 202) {
+        return response.data;
+      }
+      const retryAfter = Number(response.headers["retry-after"] ?? 5);
+      await new Promise((resolve) => setTimeout(resolve, retryAfter * 1000));
+    }
+    throw new Error("PDF rendering is taking longer than expected");
+  },
+
+  // Short-lived direct link to the PDF; bytes do not pass through the API.
+  downloadUrl: async (id: string, maxAttempts = 20): Promise<SignedUrl> => {
+    for (let attempt = 0; attempt < maxAttempts; attempt++) {
+      const response = await apiClient.get(`/documents/${id}/download-url`);
+      if (response.status !== 202) {
+        const signed: SignedUrl = response.data;
+        // Local storage links are relative to the API
+        return signed.url.startsWith("/") ? { ...signed, url: `${API_URL}${signed.url}` } : signed;
+      }
+      const retryAfter = Number(response.headers["retry-after"] ?? 5);
+      await new Promise((resolve) => setTimeout(resolve, retryAfter * 1000));
+    }
+    throw new Error("PDF rendering is taking longer than expected");
+  },
+
+  preview: async (id: string): Promise<string> => {
+    const response = await apiClient.get(`/documents/${id}/preview`, {
+      responseType: "text",
     });
     return response.data;
   },
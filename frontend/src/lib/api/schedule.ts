@@ -16,6 +16,9 @@ export interface ScheduledContent {
   updated_at: string;
 }
 
+// List items omit distribution platforms; request more with `fields`
+export type ScheduledContentSummary = Omit<ScheduledContent, "distribution_platforms">;
+
 export interface ScheduleCreate {
   topic: string;
   scheduled_date: string;
@@ -36,13 +39,15 @@ export const scheduleApi = {
   list: async (
     page = 1,
     perPage = 20,
-    clientId?: string
-  ): Promise<PaginatedResponse<ScheduledContent>> => {
+    clientId?: string,
+    cursor?: string
+  ): Promise<PaginatedResponse<ScheduledContentSummary>> => {
     const params = new URLSearchParams({
       page: page.toString(),
       per_page: perPage.toString(),
     });
     if (clientId) params.append("client_id", clientId);
+    if (cursor) params.append("cursor", cursor);
 
     const response = await apiClient.get(`/schedule?${params}`);
     return response.data;
@@ -10,10 +10,11 @@ export interface ApiError {
 
 export interface PaginatedResponse<T> {
   items: T[];
-  total: number;
+  total: number | null; // null when listed with count=none
   page: number;
   per_page: number;
-  pages: number;
+  pages: number | null;
+  next_cursor: string | null; // pass as `cursor` to fetch the next page
 }
 
 // User types